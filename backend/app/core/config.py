@@ -15,10 +15,69 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_expires_minutes: int = 60 * 24 * 7
 
+    # bcrypt cost factor for new hashes; existing hashes are upgraded on the next login.
+    bcrypt_rounds: int = 12
+    # Dedicated bcrypt pool size and how many more requests may wait for it before 503s.
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 16
+
     database_url: str
+    # Read-only endpoints are spread over these; empty sends every query to database_url.
+    database_replica_urls: list[str] = []
+    # After a write, the client's reads stay on the primary this long (X-Primary-Reads-Until), to cover replica lag.
+    replica_read_your_writes_seconds: int = 5
+
+    # Connection pool, per engine (primary and each replica).
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    # Replace pooled connections after this many seconds; keep below server/proxy idle timeouts.
+    db_pool_recycle_seconds: int = 1800
+    # Seconds a request waits for a free connection before failing.
+    db_pool_timeout_seconds: float = 30
+    # Test every connection with a round trip on checkout; recycling usually makes this unnecessary.
+    db_pool_pre_ping: bool = False
+
+    # Serve the hot read endpoints through an asyncpg-backed AsyncEngine.
+    async_db: bool = False
+    # Defaults to database_url with the driver swapped for asyncpg.
+    async_database_url: str | None = None
 
     auto_create_tables: bool = True
 
+    # Seconds before the in-process city catalog is reloaded; 0 keeps it until invalidated.
+    city_catalog_ttl_seconds: int = 300
+    # Serve /cities/suggest from the in-memory index; false queries Postgres (pg_trgm) instead.
+    city_suggest_in_memory: bool = True
+
+    public_cache_max_entries: int = 1024
+    public_cache_ttl_seconds: int = 60
+
+    # Cached /calendar responses per worker; a user's writes clear their own entries in the
+    # worker that handled them, other workers catch up within the TTL.
+    calendar_cache_max_entries: int = 4096
+    calendar_cache_ttl_seconds: int = 10
+
+    # Other workers see a new or deleted post on the feed's first page within this many seconds.
+    community_feed_snapshot_ttl_seconds: int = 10
+
+    # How often the app recomputes the admin analytics rollups; 0 leaves it to
+    # scripts/rebuild_analytics_rollups.py (e.g. from cron).
+    analytics_refresh_interval_seconds: int = 900
+
+    # Fraction of requests whose SQL is measured and reported in a Server-Timing header (0 disables;
+    # set 1.0 in development to measure every request).
+    sql_instrumentation_sample_rate: float = 0.05
+    # Log a possible N+1 when one statement runs this many times in a measured request (0 disables).
+    sql_n_plus_one_threshold: int = 10
+
+    # Serve Prometheus metrics at /metrics (set PROMETHEUS_MULTIPROC_DIR when running several workers).
+    metrics_enabled: bool = True
+
+    # Authenticated principal cache, per worker. Invalidation only reaches the worker that
+    # handled the change, so other workers may honour a stale admin flag for up to the TTL.
+    principal_cache_max_entries: int = 10000
+    principal_cache_ttl_seconds: int = 60
+
 
 @lru_cache
 def get_settings() -> Settings:
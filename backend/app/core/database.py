@@ -1,13 +1,37 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import get_settings
+from app.core.replicas import RoutingSession
 from app.models.base import Base
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+pool_options = {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_recycle": settings.db_pool_recycle_seconds,
+    "pool_timeout": settings.db_pool_timeout_seconds,
+    "pool_pre_ping": settings.db_pool_pre_ping,
+}
+
+engine = create_engine(settings.database_url, **pool_options)
+replica_engines = [create_engine(url, **pool_options) for url in settings.database_replica_urls]
+_replicas = itertools.cycle(replica_engines)
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.async_db:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_url = settings.async_database_url or make_url(settings.database_url).set(drivername="postgresql+asyncpg")
+    async_engine = create_async_engine(async_url, **pool_options)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
 def get_db():
@@ -16,3 +40,18 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def read_session(primary: bool = False) -> Session:
+    """A session whose reads go to a replica, unless ``primary`` (the client wrote recently)."""
+    db = SessionLocal()
+    if replica_engines and not primary:
+        db.info["replica"] = next(_replicas)
+    return db
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database access requires ASYNC_DB=true")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,28 +1,88 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db, read_session
+from app.core.principal import Principal, cache_principal, get_cached_principal
+from app.core.replicas import reads_pinned_to_primary
 from app.core.security import decode_token
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+def _user_id_from_token(token: str) -> int:
     try:
         payload = decode_token(token)
-        user_id = int(payload.get("sub"))
+        return int(payload.get("sub"))
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication")
 
+
+def _principal_stmt(user_id: int):
+    return select(User.id, User.is_admin).where(User.id == user_id)
+
+
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+    user_id = _user_id_from_token(token)
+
     user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication")
+    db.info["user_id"] = user_id
     return user
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
-    if not getattr(current_user, "is_admin", False):
+def get_current_principal(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    # The JWT is still decoded on every request so expired tokens are rejected
+    # even while their principal is cached.
+    user_id = _user_id_from_token(token)
+    # Lets the session pin this user's reads to the primary after they write.
+    db.info["user_id"] = user_id
+    principal = get_cached_principal(token)
+    if principal is not None and principal.id == user_id:
+        return principal
+
+    row = db.execute(_principal_stmt(user_id)).one_or_none()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication")
+    principal = Principal(id=row.id, is_admin=bool(row.is_admin))
+    cache_principal(token, principal)
+    return principal
+
+
+async def get_current_principal_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    user_id = _user_id_from_token(token)
+    principal = get_cached_principal(token)
+    if principal is not None and principal.id == user_id:
+        return principal
+
+    row = (await db.execute(_principal_stmt(user_id))).one_or_none()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication")
+    principal = Principal(id=row.id, is_admin=bool(row.is_admin))
+    cache_principal(token, principal)
+    return principal
+
+
+def get_read_db(request: Request):
+    """Session for read-only handlers, served by a replica when any are configured.
+
+    A client that sends back an unexpired ``X-Primary-Reads-Until`` (set on the
+    response to its last write) reads from the primary instead.
+    """
+    db = read_session(reads_pinned_to_primary(request.headers))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def require_admin(principal: Principal = Depends(get_current_principal)) -> Principal:
+    if not principal.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
-    return current_user
+    return principal
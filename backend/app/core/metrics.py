@@ -0,0 +1,178 @@
+import os
+import time
+
+from anyio import to_thread
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.password_hasher import PasswordHasher
+from app.utils.cache import LRUCache, observe_caches
+
+# With PROMETHEUS_MULTIPROC_DIR set (one directory shared by all workers, emptied
+# before they start), every worker writes its samples there and /metrics sums
+# them. Gauges use "livesum" so the values of exited workers drop out.
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to finishing its response.",
+    ["method", "route"],
+)
+REQUESTS = Counter("http_requests_total", "Completed HTTP requests.", ["method", "route", "status"])
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled.", multiprocess_mode="livesum")
+
+POOL_SIZE = Gauge("db_pool_size", "Configured size of the connection pool.", ["engine"], multiprocess_mode="livesum")
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out.", ["engine"], multiprocess_mode="livesum"
+)
+POOL_CHECKED_IN = Gauge(
+    "db_pool_checked_in", "Idle connections held by the pool.", ["engine"], multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size.", ["engine"], multiprocess_mode="livesum"
+)
+
+THREADPOOL_BUSY = Gauge("threadpool_busy_threads", "Request threadpool threads in use.", multiprocess_mode="livesum")
+THREADPOOL_SIZE = Gauge("threadpool_max_threads", "Request threadpool capacity.", multiprocess_mode="livesum")
+
+CACHE_EVENTS = Counter("cache_events_total", "In-process cache lookups and writes.", ["cache", "event"])
+CACHE_ENTRIES = Gauge(
+    "cache_entries", "Entries currently held by an in-process cache.", ["cache"], multiprocess_mode="livesum"
+)
+
+PASSWORD_HASH_RUNNING = Gauge(
+    "password_hash_running", "Password hashes currently running.", multiprocess_mode="livesum"
+)
+PASSWORD_HASH_QUEUED = Gauge(
+    "password_hash_queued", "Password hashes waiting for a hashing thread.", multiprocess_mode="livesum"
+)
+PASSWORD_HASH_REJECTED = Counter("password_hash_rejected_total", "Password hashes rejected because the queue was full.")
+PASSWORD_HASH_WAIT = Histogram(
+    "password_hash_wait_seconds",
+    "Time a password hash spent queued before running.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PASSWORD_HASH_RUN = Histogram(
+    "password_hash_run_seconds",
+    "Time spent computing one password hash.",
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5),
+)
+
+# Requests that matched no route share one label instead of one per URL.
+_UNMATCHED_ROUTE = "<unmatched>"
+
+
+def metrics_response() -> tuple[bytes, str]:
+    """The current metrics in Prometheus text format, and their content type."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_exited() -> None:
+    """Drop this worker's live gauges from the shared directory (call on shutdown)."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def _cache_observer(cache: LRUCache):
+    counters = {e: CACHE_EVENTS.labels(cache.name, e) for e in ("hit", "miss", "set", "eviction", "remove")}
+    entries = CACHE_ENTRIES.labels(cache.name)
+
+    def observe(event_name: str, size: int) -> None:
+        counters[event_name].inc()
+        entries.set(size)
+
+    return observe
+
+
+def instrument_caches() -> None:
+    observe_caches(_cache_observer)
+
+
+def instrument_password_hasher(hasher: PasswordHasher) -> None:
+    def observe(event_name: str, pending: int, wait_seconds: float = 0.0, run_seconds: float = 0.0) -> None:
+        if event_name == "reject":
+            PASSWORD_HASH_REJECTED.inc()
+        elif event_name == "complete":
+            PASSWORD_HASH_WAIT.observe(wait_seconds)
+            PASSWORD_HASH_RUN.observe(run_seconds)
+        PASSWORD_HASH_RUNNING.set(min(pending, hasher.workers))
+        PASSWORD_HASH_QUEUED.set(max(0, pending - hasher.workers))
+
+    hasher.observer = observe
+    observe("release", 0)
+
+
+def instrument_pool(engine: Engine, label: str) -> None:
+    """Keep the pool gauges current from pool events, so every worker reports its own pool."""
+    if getattr(engine, "_metrics_pool_listener", None) is not None:
+        return
+    gauges = [g.labels(label) for g in (POOL_SIZE, POOL_CHECKED_OUT, POOL_CHECKED_IN, POOL_OVERFLOW)]
+
+    def update(*_) -> None:
+        # Read engine.pool each time: engine.dispose() swaps in a new pool.
+        pool = engine.pool
+        if not hasattr(pool, "checkedout"):
+            return  # e.g. NullPool, which keeps no counts
+        for gauge, value in zip(gauges, (pool.size(), pool.checkedout(), pool.checkedin(), max(0, pool.overflow()))):
+            gauge.set(value)
+
+    for name in ("connect", "checkout", "checkin", "close"):
+        event.listen(engine, name, update)
+    engine._metrics_pool_listener = update
+    update()
+
+
+def _record_threadpool() -> None:
+    limiter = to_thread.current_default_thread_limiter()
+    THREADPOOL_BUSY.set(limiter.borrowed_tokens)
+    THREADPOOL_SIZE.set(limiter.total_tokens)
+
+
+class MetricsMiddleware:
+    """Per-route latency histogram, status counts, in-flight requests and threadpool occupancy."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        _record_threadpool()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.dec()
+            _record_threadpool()
+            # The router has filled in the matched route by now; label by its
+            # template so /trips/1 and /trips/2 share a series.
+            route = getattr(scope.get("route"), "path", None) or _UNMATCHED_ROUTE
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            REQUESTS.labels(method, route, str(status)).inc()
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.core.config import get_settings
+from app.core.security import hash_password, verify_password
+
+# Called with the event ("submit", "reject", "complete" or "release") and the
+# number of jobs running or queued afterwards; "complete" also passes the job's
+# queue wait and run time in seconds. Used to export hashing metrics.
+HasherObserver = Callable[..., None]
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full and the request should be rejected."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated pool instead of the request threadpool.
+
+    At most ``workers`` hashes run at once and at most ``max_queue`` more wait;
+    anything beyond that is rejected immediately so a login storm can't occupy
+    every request thread.
+    """
+
+    def __init__(self, *, workers: int, max_queue: int):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.run_ms_total = 0.0
+        self.run_ms_max = 0.0
+        self.observer: HasherObserver | None = None
+
+    def _notify(self, event: str, pending: int, *timings: float) -> None:
+        observer = self.observer
+        if observer is not None:
+            observer(event, pending, *timings)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            rejected = self._pending >= self.workers + self.max_queue
+            if rejected:
+                self.rejected += 1
+            else:
+                self._pending += 1
+                self.submitted += 1
+            pending = self._pending
+        self._notify("reject" if rejected else "submit", pending)
+        if rejected:
+            raise PasswordHasherBusy()
+
+        enqueued = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                self._record((started - enqueued) * 1000, (finished - started) * 1000)
+
+        try:
+            future = self._executor.submit(job)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is freed when the job itself is done (or dropped from the queue),
+        # not when the awaiter goes away: a cancelled request's hash may still run.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+            pending = self._pending
+        self._notify("release", pending)
+
+    def _record(self, wait_ms: float, run_ms: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            self.run_ms_total += run_ms
+            self.run_ms_max = max(self.run_ms_max, run_ms)
+            pending = self._pending
+        self._notify("complete", pending, wait_ms / 1000, run_ms / 1000)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = self._pending
+            completed = self.completed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": min(pending, self.workers),
+                "queued": max(0, pending - self.workers),
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": completed,
+                "wait_ms_avg": self.wait_ms_total / completed if completed else 0.0,
+                "wait_ms_max": self.wait_ms_max,
+                "run_ms_avg": self.run_ms_total / completed if completed else 0.0,
+                "run_ms_max": self.run_ms_max,
+            }
+
+
+_settings = get_settings()
+password_hasher = PasswordHasher(workers=_settings.password_hash_workers, max_queue=_settings.password_hash_max_queue)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
@@ -0,0 +1,53 @@
+import itertools
+from typing import NamedTuple
+
+from app.core.config import get_settings
+from app.utils.cache import LRUCache
+
+
+class Principal(NamedTuple):
+    """The authenticated caller, without the rest of the ``users`` row."""
+
+    id: int
+    is_admin: bool
+
+
+_settings = get_settings()
+principal_cache = LRUCache(
+    "principals",
+    max_entries=_settings.principal_cache_max_entries,
+    ttl_seconds=_settings.principal_cache_ttl_seconds,
+)
+# Set on invalidation to a never-repeating value; cached entries from another
+# generation are ignored. Entries older than the TTL can't outlive any cached
+# principal, and an evicted one reads as 0, which invalidate_principal never
+# hands out and whose cached principals it has already dropped.
+_generations = LRUCache(
+    "principal_generations",
+    max_entries=_settings.principal_cache_max_entries,
+    ttl_seconds=_settings.principal_cache_ttl_seconds,
+)
+_next_generation = itertools.count(1)
+
+
+def _generation(user_id: int) -> int:
+    return _generations.get(user_id) or 0
+
+
+def get_cached_principal(token: str) -> Principal | None:
+    entry = principal_cache.get(token, is_valid=lambda e: _generation(e[1].id) == e[0])
+    return entry[1] if entry else None
+
+
+def cache_principal(token: str, principal: Principal) -> None:
+    principal_cache.set(token, (_generation(principal.id), principal))
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Forget every cached token for a user, e.g. after a profile or admin flag change.
+
+    Only this worker's cache is cleared; other workers keep serving the old
+    principal for up to ``principal_cache_ttl_seconds``.
+    """
+    _generations.set(user_id, next(_next_generation))
+    principal_cache.pop_matching(lambda e: e[1].id == user_id)
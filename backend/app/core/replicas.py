@@ -0,0 +1,133 @@
+import contextvars
+import time
+from typing import Callable, Mapping
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+_settings = get_settings()
+
+# Read-your-writes pin, carried by the client so it holds whichever worker or
+# instance serves the next request: a response to a request that committed a
+# write says until when (Unix time) its reads should see the primary, and the
+# client sends the value back on later requests.
+PRIMARY_READS_HEADER = "X-Primary-Reads-Until"
+
+
+class _RequestWrites:
+    __slots__ = ("wrote",)
+
+    def __init__(self):
+        self.wrote = False
+
+
+# Threadpool work inherits the request's context, so a sync handler's commit
+# marks the same object the middleware later reads.
+_request_writes: contextvars.ContextVar[_RequestWrites | None] = contextvars.ContextVar(
+    "request_writes", default=None
+)
+
+
+def reads_pinned_to_primary(headers: Mapping[str, str]) -> bool:
+    """Whether the request carries a read-your-writes pin that hasn't expired."""
+    try:
+        until = float(headers.get(PRIMARY_READS_HEADER) or 0)
+    except ValueError:
+        return False
+    now = time.time()
+    # Values beyond one window were not issued by us and are ignored.
+    return now < until <= now + _settings.replica_read_your_writes_seconds
+
+
+class ReadYourWritesMiddleware:
+    """Sets ``X-Primary-Reads-Until`` on responses to requests that committed a write."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes = _RequestWrites()
+        token = _request_writes.set(writes)
+
+        async def send_with_pin(message: Message) -> None:
+            if message["type"] == "http.response.start" and writes.wrote:
+                until = time.time() + _settings.replica_read_your_writes_seconds
+                headers = list(message.get("headers", []))
+                headers.append((PRIMARY_READS_HEADER.lower().encode(), f"{until:.3f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _request_writes.reset(token)
+
+
+_user_write_hooks: list[Callable[[int], None]] = []
+
+
+def on_user_write(hook: Callable[[int], None]) -> Callable[[int], None]:
+    """Call ``hook(user_id)`` whenever a session that wrote on behalf of that user commits."""
+    _user_write_hooks.append(hook)
+    return hook
+
+
+class RoutingSession(Session):
+    """Session that sends its reads to ``info["replica"]`` when one is set.
+
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary, and
+    once the session has written, so does everything after it.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if (
+            replica is not None
+            and not self._flushing
+            and not self.info.get("wrote")
+            and not getattr(clause, "is_dml", False)
+        ):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+def use_primary(db: Session) -> None:
+    """Send the rest of this session's reads to the primary."""
+    db.info.pop("replica", None)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _flushed(session: Session, _flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _executed(state) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _committed(session: Session) -> None:
+    if session.info.pop("wrote", False):
+        use_primary(session)
+        writes = _request_writes.get()
+        if writes is not None:
+            writes.wrote = True
+        # Set by the auth dependencies, which share the request's session.
+        user_id = session.info.get("user_id")
+        if user_id is not None:
+            for hook in _user_write_hooks:
+                hook(user_id)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _rolled_back(session: Session) -> None:
+    session.info.pop("wrote", None)
@@ -0,0 +1,147 @@
+import contextvars
+import logging
+import random
+import time
+from collections import Counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class RequestSqlStats:
+    """Database work done on behalf of one request."""
+
+    __slots__ = ("statements", "db_seconds", "checkout_seconds", "shapes")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.checkout_seconds = 0.0
+        # Keyed by SQL text, which is identical for every execution of the same
+        # statement shape since parameters are sent separately.
+        self.shapes: Counter[str] = Counter()
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(sql, n) for sql, n in self.shapes.most_common() if n >= threshold]
+
+
+# Set only for sampled requests; threadpool work inherits the request's context,
+# so sync handlers and dependencies record into the same object.
+_current: contextvars.ContextVar[RequestSqlStats | None] = contextvars.ContextVar("request_sql_stats", default=None)
+
+
+def current_sql_stats() -> RequestSqlStats | None:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.statements += 1
+    stats.shapes[statement] += 1
+    if context is not None:
+        context._sql_timing_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_sql_timing_started", None)
+    if stats is not None and started is not None:
+        stats.db_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record statements, DB time and pool checkout wait for sampled requests.
+
+    Safe to call more than once for the same engine. Outside a sampled request
+    the hooks only do a context variable lookup.
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    # The pool has no event for "checkout started", so time the call every new
+    # Connection makes to get its DBAPI connection. Wrapping the engine (not
+    # the pool) survives engine.dispose() replacing the pool.
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection():
+        stats = _current.get()
+        if stats is None:
+            return raw_connection()
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            stats.checkout_seconds += time.perf_counter() - started
+
+    engine.raw_connection = timed_raw_connection
+
+
+def server_timing(stats: RequestSqlStats) -> str:
+    return (
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} queries", '
+        f"db-checkout;dur={stats.checkout_seconds * 1000:.2f}"
+    )
+
+
+class SqlInstrumentationMiddleware:
+    """Adds a ``Server-Timing`` header with the request's SQL stats and warns about likely N+1s.
+
+    A fraction (``sql_instrumentation_sample_rate``) of requests is measured;
+    the rest pass straight through. A statement that runs at least
+    ``sql_n_plus_one_threshold`` times in one request is logged with its route.
+    The header reflects work done before the response started; the N+1 check
+    also covers anything a streaming body does afterwards.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        settings = get_settings()
+        self.sample_rate = settings.sql_instrumentation_sample_rate
+        self.threshold = settings.sql_n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSqlStats()
+        token = _current.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((SERVER_TIMING_HEADER.lower().encode(), server_timing(stats).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if self.threshold > 0:
+                self._warn_repeated(scope, stats)
+
+    def _warn_repeated(self, scope: Scope, stats: RequestSqlStats) -> None:
+        repeated = stats.repeated(self.threshold)
+        if not repeated:
+            return
+        route = getattr(scope.get("route"), "path", None) or scope.get("path")
+        for sql, count in repeated:
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times in one request: %s",
+                scope.get("method"),
+                route,
+                count,
+                " ".join(sql.split())[:300],
+            )
@@ -1,8 +1,21 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
-from app.core.database import Base, engine
+from app.core.database import Base, SessionLocal, async_engine, engine, replica_engines
+from app.core.metrics import (
+    MetricsMiddleware,
+    instrument_caches,
+    instrument_password_hasher,
+    instrument_pool,
+    mark_worker_exited,
+)
+from app.core.password_hasher import password_hasher
+from app.core.replicas import PRIMARY_READS_HEADER, ReadYourWritesMiddleware
+from app.core.sql_instrumentation import SERVER_TIMING_HEADER, SqlInstrumentationMiddleware, instrument_engine
 import app.models  # noqa: F401
 from app.routers import (
     activities,
@@ -10,20 +23,52 @@ from app.routers import (
     attractions,
     auth,
     budget,
+    calendar,
     cities,
     community,
     expenses,
+    metrics,
     public,
     stops,
     trips,
     users,
 )
+from app.services.analytics_service import run_analytics_refresher
+from app.services.city_catalog import load_city_catalog
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.serialization import FastJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Warm the city catalog so the first requests don't pay for loading it.
+    db = SessionLocal()
+    try:
+        load_city_catalog(db)
+    finally:
+        db.close()
+
+    settings = get_settings()
+    refresher = None
+    if settings.analytics_refresh_interval_seconds > 0:
+        refresher = asyncio.create_task(run_analytics_refresher(settings.analytics_refresh_interval_seconds))
+    yield
+    if refresher is not None:
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica in replica_engines:
+        replica.dispose()
+    if settings.metrics_enabled:
+        mark_worker_exited()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
 
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=FastJSONResponse)
 
     app.add_middleware(
         CORSMiddleware,
@@ -31,11 +76,38 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"] ,
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, SERVER_TIMING_HEADER, PRIMARY_READS_HEADER],
     )
+    if replica_engines:
+        app.add_middleware(ReadYourWritesMiddleware)
+
+    instrument_engine(engine)
+    for replica in replica_engines:
+        instrument_engine(replica)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+    app.add_middleware(SqlInstrumentationMiddleware)
+
+    if settings.metrics_enabled:
+        instrument_pool(engine, "sync")
+        for i, replica in enumerate(replica_engines):
+            instrument_pool(replica, f"replica{i}")
+        if async_engine is not None:
+            instrument_pool(async_engine.sync_engine, "async")
+        instrument_caches()
+        instrument_password_hasher(password_hasher)
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router)
 
     if settings.auto_create_tables:
         Base.metadata.create_all(bind=engine)
 
+    if settings.async_db:
+        # Registered first so these async handlers take precedence over the
+        # sync versions of the same read endpoints.
+        for module in (trips, cities, stops, activities, public):
+            app.include_router(module.async_router, prefix="/api")
+
     app.include_router(auth.router, prefix="/api")
     app.include_router(users.router, prefix="/api")
     app.include_router(trips.router, prefix="/api")
@@ -44,6 +116,7 @@ def create_app() -> FastAPI:
     app.include_router(activities.router, prefix="/api")
     app.include_router(attractions.router, prefix="/api")
     app.include_router(budget.router, prefix="/api")
+    app.include_router(calendar.router, prefix="/api")
     app.include_router(expenses.router, prefix="/api")
     app.include_router(community.router, prefix="/api")
     app.include_router(admin.router, prefix="/api")
@@ -1,4 +1,5 @@
 from app.models.activity import Activity
+from app.models.analytics_rollup import ActivityTypeRollup, AnalyticsRefresh, CityVisitRollup, TripMonthRollup
 from app.models.attraction import Attraction
 from app.models.city import City
 from app.models.expense import Expense
@@ -6,16 +7,22 @@ from app.models.community_post import CommunityPost
 from app.models.shared_trip import SharedTrip
 from app.models.stop import Stop
 from app.models.trip import Trip
+from app.models.trip_budget_rollup import TripBudgetRollup
 from app.models.user import User
 
 __all__ = [
     "Activity",
+    "ActivityTypeRollup",
+    "AnalyticsRefresh",
     "Attraction",
     "City",
+    "CityVisitRollup",
     "CommunityPost",
     "Expense",
     "SharedTrip",
     "Stop",
     "Trip",
+    "TripBudgetRollup",
+    "TripMonthRollup",
     "User",
 ]
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -10,7 +10,7 @@ class Activity(Base):
     __tablename__ = "activities"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    stop_id: Mapped[int] = mapped_column(ForeignKey("stops.id", ondelete="CASCADE"), index=True)
+    stop_id: Mapped[int] = mapped_column(ForeignKey("stops.id", ondelete="CASCADE"))
 
     name: Mapped[str] = mapped_column(String)
     type: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -20,3 +20,8 @@ class Activity(Base):
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     stop: Mapped["Stop"] = relationship(back_populates="activities")
+
+
+# A stop's activities in time order, and the per-stop date-window scans behind
+# /calendar; also covers lookups by stop_id alone.
+Index("ix_activities_stop_start", Activity.stop_id, Activity.start_time)
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class CityVisitRollup(Base):
+    __tablename__ = "analytics_city_visits"
+
+    city_id: Mapped[int] = mapped_column(ForeignKey("cities.id", ondelete="CASCADE"), primary_key=True)
+    stop_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class ActivityTypeRollup(Base):
+    __tablename__ = "analytics_activity_types"
+
+    # Activities without a type are counted under "".
+    type: Mapped[str] = mapped_column(String, primary_key=True)
+    activity_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class TripMonthRollup(Base):
+    __tablename__ = "analytics_trips_per_month"
+
+    # Month of the trip's start_date.
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    month: Mapped[int] = mapped_column(Integer, primary_key=True)
+    trip_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class AnalyticsRefresh(Base):
+    __tablename__ = "analytics_refreshes"
+
+    rollup: Mapped[str] = mapped_column(String, primary_key=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    duration_ms: Mapped[int] = mapped_column(Integer, default=0)
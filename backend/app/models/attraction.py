@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, ForeignKey, Numeric
+from sqlalchemy import DDL, ForeignKey, Index, Numeric, String, event, func, literal_column
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -14,3 +14,25 @@ class Attraction(Base):
     cost: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
     rating: Mapped[float | None] = mapped_column(Numeric(3, 2), nullable=True)
     image_url: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+# Unrated attractions sort after every rated one. The -1 is inlined rather than
+# bound so queries match the expression index below.
+attraction_rating_key = func.coalesce(Attraction.rating, literal_column("-1"))
+
+# Keyset pages of one city's attractions, in the two sort orders the search offers.
+# Both lead with city_id, so they also serve the foreign key.
+Index("ix_attractions_city_rating", Attraction.city_id, attraction_rating_key.desc(), Attraction.id.desc())
+Index("ix_attractions_city_cost", Attraction.city_id, Attraction.cost, Attraction.id)
+Index(
+    "ix_attractions_name_trgm",
+    Attraction.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+)
+
+event.listen(
+    Attraction.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
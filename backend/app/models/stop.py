@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import Date, ForeignKey, Integer, Numeric
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -24,3 +24,7 @@ class Stop(Base):
     trip: Mapped["Trip"] = relationship(back_populates="stops")
     city: Mapped["City"] = relationship()
     activities: Mapped[list["Activity"]] = relationship(back_populates="stop", cascade="all, delete-orphan")
+
+
+# Ordered listing of a trip's stops and the max(order_index) lookup for appends.
+Index("ix_stops_trip_order", Stop.trip_id, Stop.order_index)
@@ -23,7 +23,9 @@ class Trip(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     user: Mapped["User"] = relationship(back_populates="trips")
-    stops: Mapped[list["Stop"]] = relationship(back_populates="trip", cascade="all, delete-orphan", order_by="Stop.order_index")
+    stops: Mapped[list["Stop"]] = relationship(
+        back_populates="trip", cascade="all, delete-orphan", order_by="[Stop.order_index, Stop.start_date, Stop.id]"
+    )
     shared: Mapped[Optional["SharedTrip"]] = relationship(
         back_populates="trip",
         cascade="all, delete-orphan",
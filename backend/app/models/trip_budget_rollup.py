@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Numeric, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class TripBudgetRollup(Base):
+    __tablename__ = "trip_budget_rollups"
+
+    trip_id: Mapped[int] = mapped_column(ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True)
+
+    transport: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+    stay: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+    meals: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+    activities: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+    other: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
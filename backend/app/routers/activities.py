@@ -1,20 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.database import get_async_db, get_db
+from app.core.dependencies import get_current_principal, get_current_principal_async
+from app.core.principal import Principal
 from app.models.activity import Activity
 from app.models.stop import Stop
-from app.models.user import User
+from app.models.trip import Trip
 from app.schemas.activity import ActivityCreate, ActivityResponse, ActivitySuggestion, ActivityUpdate
+from app.services.budget_service import adjust_budget_rollup, cost_delta
 from app.services.trip_service import get_trip_for_user
-from app.utils.response_utils import to_float
+from app.utils.response_utils import activity_fields
+from app.utils.serialization import json_response
 
 router = APIRouter(tags=["activities"])
+async_router = APIRouter(tags=["activities"])
 
 
 @router.get("/stops/{stop_id}/activities", response_model=list[ActivityResponse])
-def list_activities(stop_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_activities(stop_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     stop = db.get(Stop, stop_id)
     if not stop:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stop not found")
@@ -24,19 +30,7 @@ def list_activities(stop_id: int, db: Session = Depends(get_db), current_user: U
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stop not found")
 
     rows = db.query(Activity).filter(Activity.stop_id == stop.id).order_by(Activity.start_time.asc().nullslast(), Activity.id.asc()).all()
-    return [
-        ActivityResponse(
-            id=a.id,
-            stop_id=a.stop_id,
-            name=a.name,
-            type=a.type,
-            start_time=a.start_time,
-            duration_minutes=a.duration_minutes,
-            cost=to_float(a.cost),
-            notes=a.notes,
-        )
-        for a in rows
-    ]
+    return json_response([activity_fields(a) for a in rows])
 
 
 @router.post("/stops/{stop_id}/activities", response_model=ActivityResponse)
@@ -44,7 +38,7 @@ def create_activity(
     stop_id: int,
     payload: ActivityCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     stop = db.get(Stop, stop_id)
     if not stop:
@@ -56,19 +50,11 @@ def create_activity(
 
     activity = Activity(stop_id=stop.id, **payload.model_dump())
     db.add(activity)
+    adjust_budget_rollup(db, trip.id, activities=activity.cost)
     db.commit()
     db.refresh(activity)
 
-    return ActivityResponse(
-        id=activity.id,
-        stop_id=activity.stop_id,
-        name=activity.name,
-        type=activity.type,
-        start_time=activity.start_time,
-        duration_minutes=activity.duration_minutes,
-        cost=to_float(activity.cost),
-        notes=activity.notes,
-    )
+    return ActivityResponse(**activity_fields(activity))
 
 
 @router.patch("/activities/{activity_id}", response_model=ActivityResponse)
@@ -76,7 +62,7 @@ def update_activity(
     activity_id: int,
     payload: ActivityUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     activity = db.get(Activity, activity_id)
     if not activity:
@@ -90,27 +76,20 @@ def update_activity(
     if not trip:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Activity not found")
 
+    old_cost = activity.cost
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(activity, field, value)
 
     db.add(activity)
+    adjust_budget_rollup(db, trip.id, activities=cost_delta(old_cost, activity.cost))
     db.commit()
     db.refresh(activity)
 
-    return ActivityResponse(
-        id=activity.id,
-        stop_id=activity.stop_id,
-        name=activity.name,
-        type=activity.type,
-        start_time=activity.start_time,
-        duration_minutes=activity.duration_minutes,
-        cost=to_float(activity.cost),
-        notes=activity.notes,
-    )
+    return ActivityResponse(**activity_fields(activity))
 
 
 @router.delete("/activities/{activity_id}")
-def delete_activity(activity_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def delete_activity(activity_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     activity = db.get(Activity, activity_id)
     if not activity:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Activity not found")
@@ -124,6 +103,7 @@ def delete_activity(activity_id: int, db: Session = Depends(get_db), current_use
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Activity not found")
 
     db.delete(activity)
+    adjust_budget_rollup(db, trip.id, activities=cost_delta(activity.cost, 0))
     db.commit()
     return {"deleted": True}
 
@@ -145,3 +125,21 @@ def suggest_activities(query: str | None = None, type: str | None = None):
         return True
 
     return [ActivitySuggestion(**i) for i in catalog if matches(i)]
+
+
+@async_router.get("/stops/{stop_id}/activities", response_model=list[ActivityResponse])
+async def list_activities_async(
+    stop_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    owned = await db.execute(
+        select(Stop.id).join(Trip, Trip.id == Stop.trip_id).where(Stop.id == stop_id, Trip.user_id == current_user.id)
+    )
+    if owned.scalar_one_or_none() is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stop not found")
+
+    rows = await db.execute(
+        select(Activity).where(Activity.stop_id == stop_id).order_by(Activity.start_time.asc().nullslast(), Activity.id.asc())
+    )
+    return json_response([activity_fields(a) for a in rows.scalars()])
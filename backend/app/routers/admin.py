@@ -1,22 +1,24 @@
-from datetime import date
+from email.utils import format_datetime
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.dependencies import require_admin
-from app.models.activity import Activity
-from app.models.city import City
-from app.models.stop import Stop
-from app.models.trip import Trip
+from app.core.dependencies import get_read_db, require_admin
+from app.core.password_hasher import password_hasher
+from app.core.principal import Principal
+from app.models.analytics_rollup import ActivityTypeRollup, CityVisitRollup, TripMonthRollup
 from app.models.user import User
+from app.services.analytics_service import analytics_freshness, rollup_refreshed_at
+from app.services.city_catalog import city_label
+from app.utils.cache import registered_caches
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 @router.get("/users")
-def list_users(db: Session = Depends(get_db), _: User = Depends(require_admin)):
+def list_users(db: Session = Depends(get_db), _: Principal = Depends(require_admin)):
     rows = db.query(User).order_by(User.created_at.desc()).limit(200).all()
     return [
         {
@@ -32,47 +34,63 @@ def list_users(db: Session = Depends(get_db), _: User = Depends(require_admin)):
     ]
 
 
+def _last_modified(response: Response, db: Session, rollup: str) -> None:
+    refreshed_at = rollup_refreshed_at(db, rollup)
+    if refreshed_at:
+        response.headers["Last-Modified"] = format_datetime(refreshed_at, usegmt=True)
+
+
+# The analytics endpoints read only the precomputed rollups; see analytics_service.
+
+
 @router.get("/analytics/popular-cities")
-def popular_cities(db: Session = Depends(get_db), _: User = Depends(require_admin)):
-    rows = (
-        db.query(City.name, City.country, func.count(Stop.id).label("count"))
-        .join(Stop, Stop.city_id == City.id)
-        .group_by(City.id)
-        .order_by(func.count(Stop.id).desc())
+def popular_cities(response: Response, db: Session = Depends(get_read_db), _: Principal = Depends(require_admin)):
+    rows = db.execute(
+        select(CityVisitRollup.city_id, CityVisitRollup.stop_count)
+        .order_by(CityVisitRollup.stop_count.desc(), CityVisitRollup.city_id)
         .limit(10)
-        .all()
-    )
-    return [{"name": n, "country": c, "count": int(cnt)} for (n, c, cnt) in rows]
+    ).all()
+    _last_modified(response, db, "city_visits")
+    result = []
+    for city_id, cnt in rows:
+        name, country = city_label(city_id)
+        result.append({"name": name, "country": country, "count": int(cnt)})
+    return result
 
 
 @router.get("/analytics/popular-activities")
-def popular_activities(db: Session = Depends(get_db), _: User = Depends(require_admin)):
-    rows = (
-        db.query(Activity.type, func.count(Activity.id).label("count"))
-        .group_by(Activity.type)
-        .order_by(func.count(Activity.id).desc())
+def popular_activities(response: Response, db: Session = Depends(get_read_db), _: Principal = Depends(require_admin)):
+    rows = db.execute(
+        select(ActivityTypeRollup.type, ActivityTypeRollup.activity_count)
+        .order_by(ActivityTypeRollup.activity_count.desc(), ActivityTypeRollup.type)
         .limit(10)
-        .all()
-    )
+    ).all()
+    _last_modified(response, db, "activity_types")
     return [{"type": t or "-", "count": int(cnt)} for (t, cnt) in rows]
 
 
 @router.get("/analytics/trips-per-month")
-def trips_per_month(db: Session = Depends(get_db), _: User = Depends(require_admin)):
+def trips_per_month(response: Response, db: Session = Depends(get_read_db), _: Principal = Depends(require_admin)):
     # month based on trip.start_date
-    rows = (
-        db.query(func.date_trunc("month", Trip.start_date).label("month"), func.count(Trip.id).label("count"))
-        .group_by(func.date_trunc("month", Trip.start_date))
-        .order_by(func.date_trunc("month", Trip.start_date).asc())
+    rows = db.execute(
+        select(TripMonthRollup.year, TripMonthRollup.month, TripMonthRollup.trip_count)
+        .order_by(TripMonthRollup.year.asc(), TripMonthRollup.month.asc())
         .limit(24)
-        .all()
-    )
+    ).all()
+    _last_modified(response, db, "trips_per_month")
+    return [{"month": f"{year:04d}-{month:02d}", "count": int(cnt)} for (year, month, cnt) in rows]
 
-    result = []
-    for (month_dt, cnt) in rows:
-        if isinstance(month_dt, date):
-            key = month_dt.isoformat()[:7]
-        else:
-            key = str(month_dt)[:7]
-        result.append({"month": key, "count": int(cnt)})
-    return result
+
+@router.get("/analytics/freshness")
+def analytics_freshness_report(db: Session = Depends(get_read_db), _: Principal = Depends(require_admin)):
+    return analytics_freshness(db)
+
+
+@router.get("/cache-stats")
+def cache_stats(_: Principal = Depends(require_admin)):
+    return [cache.stats() for cache in registered_caches()]
+
+
+@router.get("/password-hashing")
+def password_hashing_stats(_: Principal = Depends(require_admin)):
+    return password_hasher.stats()
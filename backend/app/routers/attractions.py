@@ -1,52 +1,81 @@
+from typing import Literal
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.models.attraction import Attraction
-from app.utils.response_utils import to_float
+from app.core.dependencies import get_read_db
+from app.models.attraction import Attraction, attraction_rating_key
+from app.utils.pagination import NEXT_CURSOR_HEADER, cursor_decimal, decode_cursor, encode_cursor
+from app.utils.response_utils import attraction_fields
+from app.utils.serialization import json_response
 
 router = APIRouter(prefix="/attractions", tags=["attractions"])
 
+MAX_PAGE_SIZE = 100
+
+
 @router.get("")
 def search_attractions(
     city_id: int | None = None,
     query: str | None = None,
+    type: str | None = None,
+    min_cost: float | None = None,
+    max_cost: float | None = None,
+    min_rating: float | None = None,
+    sort: Literal["rating", "cost"] = "rating",
     limit: int = 50,
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    db: Session = Depends(get_read_db),
 ):
-    q = db.query(Attraction)
+    """Attractions, best rated (or cheapest) first, one keyset page at a time.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` for the next
+    page; it is absent on the last one.
+    """
+    limit = max(1, min(MAX_PAGE_SIZE, limit))
+    stmt = select(Attraction)
     if city_id:
-        q = q.filter(Attraction.city_id == city_id)
+        stmt = stmt.where(Attraction.city_id == city_id)
     if query:
-        q = q.filter(Attraction.name.ilike(f"%{query}%"))
-        
-    rows = q.limit(limit).all()
-    return [
-        {
-            "id": a.id,
-            "city_id": a.city_id,
-            "name": a.name,
-            "type": a.type,
-            "description": a.description,
-            "cost": to_float(a.cost),
-            "rating": to_float(a.rating),
-            "image_url": a.image_url,
-        }
-        for a in rows
-    ]
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        stmt = stmt.where(Attraction.name.ilike(f"%{escaped}%", escape="\\"))
+    if type:
+        stmt = stmt.where(Attraction.type == type)
+    if min_cost is not None:
+        stmt = stmt.where(Attraction.cost >= min_cost)
+    if max_cost is not None:
+        stmt = stmt.where(Attraction.cost <= max_cost)
+    if min_rating is not None:
+        stmt = stmt.where(Attraction.rating >= min_rating)
+
+    if sort == "rating":
+        key = attraction_rating_key
+        stmt = stmt.order_by(key.desc(), Attraction.id.desc())
+    else:
+        key = Attraction.cost
+        stmt = stmt.order_by(key.asc(), Attraction.id.asc())
+
+    if cursor:
+        last_key, last_id = decode_cursor(cursor, 2)
+        if not isinstance(last_id, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        after = tuple_(key, Attraction.id)
+        bound = tuple_(cursor_decimal(last_key), last_id)
+        stmt = stmt.where(after < bound if sort == "rating" else after > bound)
+
+    # One extra row tells us whether there is a next page without a count query.
+    rows = db.execute(stmt.add_columns(key).limit(limit + 1)).all()
+    headers = {}
+    if len(rows) > limit:
+        last, last_key = rows[limit - 1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last_key, last.id)
+    return json_response([attraction_fields(a) for a, _ in rows[:limit]], headers=headers)
+
 
 @router.get("/{attraction_id}")
-def get_attraction(attraction_id: int, db: Session = Depends(get_db)):
+def get_attraction(attraction_id: int, db: Session = Depends(get_read_db)):
     attraction = db.get(Attraction, attraction_id)
     if not attraction:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attraction not found")
-    return {
-        "id": attraction.id,
-        "city_id": attraction.city_id,
-        "name": attraction.name,
-        "type": attraction.type,
-        "description": attraction.description,
-        "cost": to_float(attraction.cost),
-        "rating": to_float(attraction.rating),
-        "image_url": attraction.image_url,
-    }
+    return json_response(attraction_fields(attraction))
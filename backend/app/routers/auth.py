@@ -1,19 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.password_hasher import PasswordHasherBusy, hash_password_async, verify_password_async
+from app.core.security import create_access_token, password_needs_rehash
 from app.models.user import User
 from app.schemas.auth import LoginRequest, SignupRequest, TokenResponse
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# signup and login are async so that waiting on the bcrypt pool doesn't hold a
+# request thread; their database work is pushed to the threadpool explicitly.
 
-@router.post("/signup", response_model=TokenResponse)
-def signup(payload: SignupRequest, db: Session = Depends(get_db)):
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _find_user(db: Session, email: str) -> User | None:
     try:
-        existing = db.query(User).filter(User.email == payload.email).first()
+        return db.query(User).filter(User.email == email).first()
     except ProgrammingError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -22,9 +34,9 @@ def signup(payload: SignupRequest, db: Session = Depends(get_db)):
                 "or apply database/migrate_2026_01_profile_expenses_community.sql to your existing DB."
             ),
         ) from e
-    if existing:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
+
+def _create_user(db: Session, payload: SignupRequest, password_hash: str) -> User:
     user = User(
         email=payload.email,
         name=payload.name,
@@ -35,11 +47,32 @@ def signup(payload: SignupRequest, db: Session = Depends(get_db)):
         city=payload.city,
         country=payload.country,
         additional_info=payload.additional_info,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
     )
     db.add(user)
     db.commit()
     db.refresh(user)
+    return user
+
+
+def _update_password_hash(db: Session, user: User, password_hash: str) -> None:
+    user.password_hash = password_hash
+    db.add(user)
+    db.commit()
+
+
+@router.post("/signup", response_model=TokenResponse)
+async def signup(payload: SignupRequest, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(_find_user, db, payload.email)
+    if existing:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+
+    try:
+        password_hash = await hash_password_async(payload.password)
+    except PasswordHasherBusy:
+        raise _busy()
+
+    user = await run_in_threadpool(_create_user, db, payload, password_hash)
 
     token = create_access_token(subject=str(user.id))
     return TokenResponse(access_token=token)
@@ -47,19 +80,26 @@ def signup(payload: SignupRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
+async def login(payload: LoginRequest, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_find_user, db, payload.email)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
     try:
-        user = db.query(User).filter(User.email == payload.email).first()
-    except ProgrammingError as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=(
-                "Database schema is out of date. Run database/schema.sql on a fresh DB "
-                "or apply database/migrate_2026_01_profile_expenses_community.sql to your existing DB."
-            ),
-        ) from e
-    if not user or not verify_password(payload.password, user.password_hash):
+        valid = await verify_password_async(payload.password, user.password_hash)
+    except PasswordHasherBusy:
+        raise _busy()
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    if password_needs_rehash(user.password_hash):
+        # Best effort: a saturated pool shouldn't turn a good login into a 503.
+        try:
+            new_hash = await hash_password_async(payload.password)
+        except PasswordHasherBusy:
+            new_hash = None
+        if new_hash:
+            await run_in_threadpool(_update_password_hash, db, user, new_hash)
+
     token = create_access_token(subject=str(user.id))
     return TokenResponse(access_token=token)
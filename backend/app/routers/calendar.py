@@ -0,0 +1,40 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_current_principal, get_read_db
+from app.core.principal import Principal
+from app.schemas.calendar import CalendarResponse
+from app.services.timeline_service import MAX_CALENDAR_DAYS, get_calendar
+from app.utils.response_utils import etag_matches
+
+router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+
+@router.get("", response_model=CalendarResponse)
+def get_user_calendar(
+    start: date,
+    end: date,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Every day from ``start`` to ``end`` (inclusive) that has something on it, across all the user's trips.
+
+    Each day lists the trips and stops that cover it, the activities starting
+    on it and the spend dated to it (activity costs plus expenses).
+    """
+    if end < start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must not be before start")
+    if (end - start).days + 1 > MAX_CALENDAR_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A calendar window can span at most {MAX_CALENDAR_DAYS} days",
+        )
+
+    entry = get_calendar(db, current_user.id, start, end)
+    headers = {"ETag": entry.etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -1,32 +1,62 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.models.city import City
+from app.core.config import get_settings
+from app.core.database import get_async_db
+from app.core.dependencies import get_read_db
+from app.services.city_catalog import CityCatalog, CityEntry, get_city_catalog, get_city_catalog_async
+from app.services.city_search import suggest_cities_stmt
+from app.utils.serialization import json_response
 
 router = APIRouter(prefix="/cities", tags=["cities"])
+async_router = APIRouter(prefix="/cities", tags=["cities"])
 
 
-@router.get("/top")
-def top_cities(limit: int = 8, region: str | None = None, db: Session = Depends(get_db)):
+def _matches(value: str | None, expected: str) -> bool:
+    return value is not None and value.casefold() == expected.casefold()
+
+
+def _top(catalog: CityCatalog, limit: int, region: str | None) -> list[dict]:
     limit = max(1, min(24, limit))
-    q = db.query(City)
-    if region:
-        q = q.filter(City.region.ilike(region))
-    rows = q.order_by(City.popularity.desc().nullslast(), City.name.asc()).limit(limit).all()
-    return [
-        {
-            "id": c.id,
-            "name": c.name,
-            "country": c.country,
-            "region": c.region,
-            "cost_index": c.cost_index,
-            "popularity": c.popularity,
-            "image_url": c.image_url,
-        }
-        for c in rows
-    ]
+    rows: list[CityEntry] = []
+    for c in catalog.ranked:
+        if region and not _matches(c.region, region):
+            continue
+        rows.append(c)
+        if len(rows) >= limit:
+            break
+    return [c._asdict() for c in rows]
+
+
+def _search(catalog: CityCatalog, query: str | None, country: str | None, region: str | None) -> list[dict]:
+    needle = query.casefold() if query else None
+    rows: list[CityEntry] = []
+    for c in catalog.ranked:
+        if needle and needle not in c.name.casefold() and needle not in c.country.casefold():
+            continue
+        if country and not _matches(c.country, country):
+            continue
+        if region and not _matches(c.region, region):
+            continue
+        rows.append(c)
+        if len(rows) >= 50:
+            break
+    return [c._asdict() for c in rows]
+
+
+@router.get("/top")
+def top_cities(limit: int = 8, region: str | None = None):
+    return json_response(_top(get_city_catalog(), limit, region))
+
+
+@router.get("/suggest")
+def suggest_cities(q: str = "", limit: int = 10, db: Session = Depends(get_read_db)):
+    if not get_settings().city_suggest_in_memory:
+        if not q.strip():
+            return []
+        return json_response([dict(row._mapping) for row in db.execute(suggest_cities_stmt(q, limit))])
+    return json_response([c._asdict() for c in get_city_catalog().suggest_index.suggest(q, limit)])
 
 
 @router.get("")
@@ -34,27 +64,28 @@ def search_cities(
     query: str | None = None,
     country: str | None = None,
     region: str | None = None,
-    db: Session = Depends(get_db),
 ):
-    q = db.query(City)
-    if query:
-        like = f"%{query}%"
-        q = q.filter(or_(City.name.ilike(like), City.country.ilike(like)))
-    if country:
-        q = q.filter(City.country.ilike(country))
-    if region:
-        q = q.filter(City.region.ilike(region))
-
-    rows = q.order_by(City.popularity.desc().nullslast(), City.name.asc()).limit(50).all()
-    return [
-        {
-            "id": c.id,
-            "name": c.name,
-            "country": c.country,
-            "region": c.region,
-            "cost_index": c.cost_index,
-            "popularity": c.popularity,
-            "image_url": c.image_url,
-        }
-        for c in rows
-    ]
+    return json_response(_search(get_city_catalog(), query, country, region))
+
+
+@async_router.get("/top")
+async def top_cities_async(limit: int = 8, region: str | None = None):
+    return json_response(_top(await get_city_catalog_async(), limit, region))
+
+
+@async_router.get("/suggest")
+async def suggest_cities_async(q: str = "", limit: int = 10, db: AsyncSession = Depends(get_async_db)):
+    if not get_settings().city_suggest_in_memory:
+        if not q.strip():
+            return []
+        return json_response([dict(row._mapping) for row in await db.execute(suggest_cities_stmt(q, limit))])
+    return json_response([c._asdict() for c in (await get_city_catalog_async()).suggest_index.suggest(q, limit)])
+
+
+@async_router.get("")
+async def search_cities_async(
+    query: str | None = None,
+    country: str | None = None,
+    region: str | None = None,
+):
+    return json_response(_search(await get_city_catalog_async(), query, country, region))
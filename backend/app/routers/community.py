@@ -1,33 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_principal, get_read_db
+from app.core.principal import Principal
 from app.models.community_post import CommunityPost
-from app.models.user import User
 from app.schemas.community import CommunityPostCreate, CommunityPostResponse
+from app.services.community_feed import get_feed_post, list_feed, refresh_feed_snapshot
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.serialization import json_response
 
 router = APIRouter(prefix="/community", tags=["community"])
 
 
 @router.get("/posts", response_model=list[CommunityPostResponse])
-def list_posts(limit: int = 50, db: Session = Depends(get_db)):
-    limit = max(1, min(100, limit))
-    rows = (
-        db.query(CommunityPost)
-        .options(joinedload(CommunityPost.user))
-        .order_by(CommunityPost.created_at.desc())
-        .limit(limit)
-        .all()
-    )
-    return rows
+def list_posts(
+    limit: int = 50,
+    cursor: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    posts, next_cursor = list_feed(db, limit, cursor)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(posts, headers=headers)
 
 
 @router.post("/posts", response_model=CommunityPostResponse)
 def create_post(
     payload: CommunityPostCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     content = (payload.content or "").strip()
     if not content:
@@ -35,23 +36,19 @@ def create_post(
 
     post = CommunityPost(user_id=current_user.id, content=content)
     db.add(post)
+    db.flush()
+    post_id = post.id
     db.commit()
-    db.refresh(post)
+    refresh_feed_snapshot(db)
 
-    post = (
-        db.query(CommunityPost)
-        .options(joinedload(CommunityPost.user))
-        .filter(CommunityPost.id == post.id)
-        .one()
-    )
-    return post
+    return get_feed_post(db, post_id)
 
 
 @router.delete("/posts/{post_id}")
 def delete_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     post = db.get(CommunityPost, post_id)
     if not post:
@@ -62,4 +59,5 @@ def delete_post(
 
     db.delete(post)
     db.commit()
+    refresh_feed_snapshot(db)
     return {"deleted": True}
@@ -1,18 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+from typing import Literal
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_principal
+from app.core.principal import Principal
+from app.core.replicas import reads_pinned_to_primary
 from app.models.expense import Expense
-from app.models.user import User
-from app.schemas.expense import ExpenseCreate, ExpenseResponse, ExpenseUpdate
-from app.services.trip_service import get_trip_for_user
+from app.schemas.expense import (
+    ExpenseCreate,
+    ExpenseImportResponse,
+    ExpenseResponse,
+    ExpenseSummaryResponse,
+    ExpenseUpdate,
+)
+from app.services.budget_service import adjust_budget_rollup, cost_delta
+from app.services.expense_import import import_expenses
+from app.services.expense_summary import expense_summary_for_trips, trip_expense_summary
+from app.services.export_service import MEDIA_TYPES, export_expenses
+from app.services.trip_service import get_trip_for_user, get_trips_for_user
+from app.utils.response_utils import expense_fields
+from app.utils.serialization import json_response
 
 router = APIRouter(prefix="/expenses", tags=["expenses"])
 
 
 @router.get("/trips/{trip_id}", response_model=list[ExpenseResponse])
-def list_expenses(trip_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_expenses(trip_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     trip = get_trip_for_user(db, current_user.id, trip_id)
     if not trip:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
@@ -23,7 +41,50 @@ def list_expenses(trip_id: int, db: Session = Depends(get_db), current_user: Use
         .order_by(Expense.expense_date.asc().nullslast(), Expense.id.asc())
         .all()
     )
-    return rows
+    return json_response([expense_fields(e) for e in rows])
+
+
+@router.get("/summary", response_model=ExpenseSummaryResponse)
+def summarize_expenses(
+    trip_id: list[int] | None = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Expense totals across the user's trips (``?trip_id=1&trip_id=2`` to restrict) against their combined budget."""
+    trips = get_trips_for_user(db, current_user.id, trip_id)
+    return json_response(expense_summary_for_trips(db, trips))
+
+
+@router.get("/trips/{trip_id}/summary", response_model=ExpenseSummaryResponse)
+def summarize_trip_expenses(
+    trip_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)
+):
+    """Totals by category, by day and by category x day, with a daily burn-down against the trip budget."""
+    trip = get_trip_for_user(db, current_user.id, trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+
+    return json_response(trip_expense_summary(db, trip))
+
+
+@router.get("/trips/{trip_id}/export")
+def export_trip_expenses(
+    trip_id: int,
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """All of the trip's expenses as CSV or NDJSON, streamed in batches."""
+    trip = get_trip_for_user(db, current_user.id, trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+
+    return StreamingResponse(
+        export_expenses(trip_id, format, primary=reads_pinned_to_primary(request.headers)),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="trip-{trip_id}-expenses.{format}"'},
+    )
 
 
 @router.post("/trips/{trip_id}", response_model=ExpenseResponse)
@@ -31,7 +92,7 @@ def create_expense(
     trip_id: int,
     payload: ExpenseCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     trip = get_trip_for_user(db, current_user.id, trip_id)
     if not trip:
@@ -39,17 +100,56 @@ def create_expense(
 
     exp = Expense(trip_id=trip_id, **payload.model_dump())
     db.add(exp)
+    adjust_budget_rollup(db, trip.id, other=exp.amount)
     db.commit()
     db.refresh(exp)
     return exp
 
 
+@router.post("/trips/{trip_id}/import", response_model=ExpenseImportResponse)
+def import_trip_expenses(
+    trip_id: int,
+    file: UploadFile = File(...),
+    atomic: bool = False,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Add expenses from a CSV file (``expense_date``, ``category``, ``amount``, ``notes`` columns).
+
+    Invalid rows are skipped and reported by line; with ``atomic=true`` any
+    invalid row rejects the whole file with a 422 and nothing is saved. A file
+    that can't be parsed as CSV is rejected with a 400 naming the line.
+    """
+    trip = get_trip_for_user(db, current_user.id, trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+
+    # utf-8-sig drops the byte order mark spreadsheet apps put in front of the header.
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        result = import_expenses(db, trip.id, text, atomic=atomic)
+    except UnicodeDecodeError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV file must be UTF-8 encoded") from e
+    except (ValueError, csv.Error) as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    finally:
+        text.detach()
+
+    if atomic and result["failed"]:
+        db.rollback()
+        return json_response(result, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    db.commit()
+    return json_response(result)
+
+
 @router.patch("/{expense_id}", response_model=ExpenseResponse)
 def update_expense(
     expense_id: int,
     payload: ExpenseUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     exp = db.get(Expense, expense_id)
     if not exp:
@@ -59,10 +159,12 @@ def update_expense(
     if not trip:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Expense not found")
 
+    old_amount = exp.amount
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(exp, field, value)
 
     db.add(exp)
+    adjust_budget_rollup(db, trip.id, other=cost_delta(old_amount, exp.amount))
     db.commit()
     db.refresh(exp)
     return exp
@@ -72,7 +174,7 @@ def update_expense(
 def delete_expense(
     expense_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     exp = db.get(Expense, expense_id)
     if not exp:
@@ -83,5 +185,6 @@ def delete_expense(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Expense not found")
 
     db.delete(exp)
+    adjust_budget_rollup(db, trip.id, other=cost_delta(exp.amount, 0))
     db.commit()
     return {"deleted": True}
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import metrics_response
+
+router = APIRouter(tags=["metrics"])
+
+
+# Unauthenticated like most scrape targets: keep /metrics off the public
+# ingress, or set METRICS_ENABLED=false.
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = metrics_response()
+    return Response(content=body, media_type=content_type)
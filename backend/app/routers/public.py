@@ -1,22 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.city import City
-from app.models.user import User
+from app.core.database import get_async_db, get_db
+from app.core.dependencies import get_current_principal
+from app.core.principal import Principal
+from app.models.trip import Trip
 from app.schemas.shared import CopyTripResponse, PublicTripResponse, ShareResponse
 from app.schemas.stop import StopResponse
 from app.schemas.trip import TripResponse
-from app.services.share_service import get_or_create_share, get_public_trip_by_share_id
+from app.services.city_catalog import CityCatalog, get_city_catalog_async
+from app.services.share_service import (
+    CachedPublicTrip,
+    cache_public_trip,
+    get_cached_public_trip,
+    get_or_create_share,
+    get_public_trip_by_share_id,
+    get_public_trip_by_share_id_async,
+)
 from app.services.trip_service import copy_trip, get_trip_for_user
-from app.utils.response_utils import to_float
+from app.utils.response_utils import etag_matches, stop_fields
 
 router = APIRouter(tags=["public"])
+async_router = APIRouter(tags=["public"])
 
 
 @router.post("/share/trips/{trip_id}", response_model=ShareResponse)
-def share_trip(trip_id: int, request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def share_trip(trip_id: int, request: Request, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     trip = get_trip_for_user(db, current_user.id, trip_id)
     if not trip:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
@@ -27,38 +37,52 @@ def share_trip(trip_id: int, request: Request, db: Session = Depends(get_db), cu
     return ShareResponse(share_id=share.share_id, public_url=public_url)
 
 
+def _public_response(entry: CachedPublicTrip, request: Request) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "public, max-age=0, must-revalidate"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _public_body(trip: Trip, catalog: CityCatalog | None = None) -> bytes:
+    trip_response = TripResponse.model_validate(trip)
+
+    stops = [StopResponse(**stop_fields(s, catalog)) for s in trip.stops]
+
+    return PublicTripResponse(trip=trip_response, stops=stops).model_dump_json().encode("utf-8")
+
+
 @router.get("/public/{share_id}", response_model=PublicTripResponse)
-def get_public(share_id: str, db: Session = Depends(get_db)):
+def get_public(share_id: str, request: Request, db: Session = Depends(get_db)):
+    cached = get_cached_public_trip(share_id)
+    if cached:
+        return _public_response(cached, request)
+
+    # Misses read the primary, not a replica: the result is cached for every
+    # reader, and a lagging replica could put a just-invalidated version back.
     trip = get_public_trip_by_share_id(db, share_id)
     if not trip:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
-    trip_response = TripResponse.model_validate(trip)
+    return _public_response(cache_public_trip(share_id, trip.id, _public_body(trip)), request)
+
+
+@async_router.get("/public/{share_id}", response_model=PublicTripResponse)
+async def get_public_async(share_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached = get_cached_public_trip(share_id)
+    if cached:
+        return _public_response(cached, request)
+
+    trip = await get_public_trip_by_share_id_async(db, share_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
-    stops: list[StopResponse] = []
-    for s in trip.stops:
-        city = db.get(City, s.city_id)
-        stops.append(
-            StopResponse(
-                id=s.id,
-                trip_id=s.trip_id,
-                city_id=s.city_id,
-                start_date=s.start_date,
-                end_date=s.end_date,
-                order_index=s.order_index,
-                stay_cost=to_float(s.stay_cost),
-                transport_cost=to_float(s.transport_cost),
-                meals_cost=to_float(s.meals_cost),
-                city_name=city.name if city else None,
-                city_country=city.country if city else None,
-            )
-        )
-
-    return PublicTripResponse(trip=trip_response, stops=stops)
+    body = _public_body(trip, await get_city_catalog_async())
+    return _public_response(cache_public_trip(share_id, trip.id, body), request)
 
 
 @router.post("/public/{share_id}/copy", response_model=CopyTripResponse)
-def copy_public_trip(share_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def copy_public_trip(share_id: str, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     trip = get_public_trip_by_share_id(db, share_id)
     if not trip:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
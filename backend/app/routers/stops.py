@@ -1,47 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.city import City
+from app.core.database import get_async_db, get_db
+from app.core.dependencies import get_current_principal, get_current_principal_async
+from app.core.principal import Principal
+from app.models.activity import Activity
 from app.models.stop import Stop
-from app.models.user import User
-from app.schemas.stop import StopCreate, StopResponse, StopUpdate
-from app.services.trip_service import get_trip_for_user
-from app.utils.response_utils import to_float
+from app.schemas.batch import TripBatchRequest, TripBatchResponse
+from app.schemas.stop import StopCreate, StopMove, StopResponse, StopUpdate
+from app.services.batch_service import apply_trip_batch
+from app.services.budget_service import adjust_budget_rollup, stop_costs
+from app.services.city_catalog import get_city_catalog_async
+from app.services.share_service import invalidate_public_trip
+from app.services.stop_order import (
+    lock_trip_stops,
+    move_stop,
+    next_order_key,
+    rebalance_stop_order_in_background,
+    stop_order_by,
+)
+from app.services.trip_service import get_trip_for_user, get_trip_for_user_async
+from app.utils.response_utils import stop_fields
+from app.utils.serialization import json_response
 
 router = APIRouter(tags=["stops"])
+async_router = APIRouter(tags=["stops"])
 
 
 @router.get("/trips/{trip_id}/stops", response_model=list[StopResponse])
-def list_stops(trip_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_stops(trip_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     trip = get_trip_for_user(db, current_user.id, trip_id)
     if not trip:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
 
     stops = (
-        db.query(Stop).filter(Stop.trip_id == trip.id).order_by(Stop.order_index.asc(), Stop.start_date.asc()).all()
+        db.query(Stop).filter(Stop.trip_id == trip.id).order_by(*stop_order_by()).all()
     )
 
-    result: list[StopResponse] = []
-    for s in stops:
-        city = db.get(City, s.city_id)
-        result.append(
-            StopResponse(
-                id=s.id,
-                trip_id=s.trip_id,
-                city_id=s.city_id,
-                start_date=s.start_date,
-                end_date=s.end_date,
-                order_index=s.order_index,
-                stay_cost=to_float(s.stay_cost),
-                transport_cost=to_float(s.transport_cost),
-                meals_cost=to_float(s.meals_cost),
-                city_name=city.name if city else None,
-                city_country=city.country if city else None,
-            )
-        )
-    return result
+    return json_response([stop_fields(s) for s in stops])
 
 
 @router.post("/trips/{trip_id}/stops", response_model=StopResponse)
@@ -49,7 +47,7 @@ def create_stop(
     trip_id: int,
     payload: StopCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     trip = get_trip_for_user(db, current_user.id, trip_id)
     if not trip:
@@ -57,9 +55,8 @@ def create_stop(
 
     order_index = payload.order_index
     if order_index is None:
-        order_index = (
-            db.query(Stop).filter(Stop.trip_id == trip.id).count()
-        )
+        lock_trip_stops(db, trip.id)
+        order_index = next_order_key(db, trip.id)
 
     stop = Stop(
         trip_id=trip.id,
@@ -72,23 +69,12 @@ def create_stop(
         meals_cost=payload.meals_cost,
     )
     db.add(stop)
+    adjust_budget_rollup(db, trip.id, **stop_costs(stop))
     db.commit()
     db.refresh(stop)
+    invalidate_public_trip(stop.trip_id)
 
-    city = db.get(City, stop.city_id)
-    return StopResponse(
-        id=stop.id,
-        trip_id=stop.trip_id,
-        city_id=stop.city_id,
-        start_date=stop.start_date,
-        end_date=stop.end_date,
-        order_index=stop.order_index,
-        stay_cost=to_float(stop.stay_cost),
-        transport_cost=to_float(stop.transport_cost),
-        meals_cost=to_float(stop.meals_cost),
-        city_name=city.name if city else None,
-        city_country=city.country if city else None,
-    )
+    return StopResponse(**stop_fields(stop))
 
 
 @router.patch("/stops/{stop_id}", response_model=StopResponse)
@@ -96,7 +82,7 @@ def update_stop(
     stop_id: int,
     payload: StopUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     stop = db.get(Stop, stop_id)
     if not stop:
@@ -106,31 +92,53 @@ def update_stop(
     if not trip:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stop not found")
 
+    before = stop_costs(stop)
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(stop, field, value)
+    after = stop_costs(stop)
 
     db.add(stop)
+    adjust_budget_rollup(db, trip.id, **{k: after[k] - before[k] for k in after})
     db.commit()
     db.refresh(stop)
+    invalidate_public_trip(stop.trip_id)
 
-    city = db.get(City, stop.city_id)
-    return StopResponse(
-        id=stop.id,
-        trip_id=stop.trip_id,
-        city_id=stop.city_id,
-        start_date=stop.start_date,
-        end_date=stop.end_date,
-        order_index=stop.order_index,
-        stay_cost=to_float(stop.stay_cost),
-        transport_cost=to_float(stop.transport_cost),
-        meals_cost=to_float(stop.meals_cost),
-        city_name=city.name if city else None,
-        city_country=city.country if city else None,
-    )
+    return StopResponse(**stop_fields(stop))
+
+
+@router.post("/stops/{stop_id}/move", response_model=StopResponse)
+def move_stop_endpoint(
+    stop_id: int,
+    payload: StopMove,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    stop = db.get(Stop, stop_id)
+    if not stop:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stop not found")
+
+    trip = get_trip_for_user(db, current_user.id, stop.trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stop not found")
+
+    try:
+        needs_rebalance = move_stop(db, stop, payload.after_id)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    db.commit()
+    db.refresh(stop)
+    invalidate_public_trip(trip.id)
+    if needs_rebalance:
+        background_tasks.add_task(rebalance_stop_order_in_background, trip.id)
+
+    return StopResponse(**stop_fields(stop))
 
 
 @router.delete("/stops/{stop_id}")
-def delete_stop(stop_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def delete_stop(stop_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     stop = db.get(Stop, stop_id)
     if not stop:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stop not found")
@@ -139,6 +147,52 @@ def delete_stop(stop_id: int, db: Session = Depends(get_db), current_user: User
     if not trip:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stop not found")
 
+    activities_total = db.execute(
+        select(func.coalesce(func.sum(Activity.cost), 0)).where(Activity.stop_id == stop.id)
+    ).scalar_one()
     db.delete(stop)
+    adjust_budget_rollup(
+        db,
+        trip.id,
+        **{k: -v for k, v in stop_costs(stop).items()},
+        activities=-activities_total,
+    )
     db.commit()
+    invalidate_public_trip(trip.id)
     return {"deleted": True}
+
+
+@router.post("/trips/{trip_id}/batch", response_model=TripBatchResponse)
+def batch_write(
+    trip_id: int,
+    payload: TripBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    trip = get_trip_for_user(db, current_user.id, trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+
+    try:
+        return apply_trip_batch(db, trip.id, payload)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+@async_router.get("/trips/{trip_id}/stops", response_model=list[StopResponse])
+async def list_stops_async(
+    trip_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    trip = await get_trip_for_user_async(db, current_user.id, trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+
+    stops = await db.execute(
+        select(Stop).where(Stop.trip_id == trip.id).order_by(*stop_order_by())
+    )
+    catalog = await get_city_catalog_async()
+    return json_response([stop_fields(s, catalog) for s in stops.scalars()])
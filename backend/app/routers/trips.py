@@ -1,57 +1,142 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.database import get_async_db, get_db
+from app.core.dependencies import get_current_principal, get_current_principal_async
+from app.core.principal import Principal
+from app.core.replicas import reads_pinned_to_primary
+from app.models.expense import Expense
 from app.models.trip import Trip
-from app.models.user import User
-from app.schemas.trip import TripCreate, TripListItem, TripResponse, TripUpdate
-from app.services.trip_service import delete_trip_for_user, get_trip_for_user, list_trips_for_user
+from app.schemas.trip import TripCreate, TripFullResponse, TripListItem, TripResponse, TripUpdate
+from app.services.budget_service import (
+    compute_budget_summaries,
+    compute_budget_summaries_async,
+    compute_budget_summary,
+    compute_budget_summary_async,
+    ensure_budget_rollup,
+)
+from app.services.city_catalog import CityCatalog, get_city_catalog_async
+from app.services.export_service import MEDIA_TYPES, ExportFormat, export_trip
+from app.services.share_service import invalidate_public_trip
+from app.services.trip_service import (
+    delete_trip_for_user,
+    get_full_trip_for_user,
+    get_full_trip_for_user_async,
+    get_trip_for_user,
+    get_trip_for_user_async,
+    list_trips_for_user,
+    list_trips_for_user_async,
+)
+from app.utils.response_utils import activity_fields, expense_fields, stop_fields, to_float_or_none, trip_fields
+from app.utils.serialization import json_response
 
 router = APIRouter(prefix="/trips", tags=["trips"])
+async_router = APIRouter(prefix="/trips", tags=["trips"])
+
+
+# Both builders produce exactly the fields of TripListItem / TripFullResponse
+# and are returned through json_response, skipping response_model validation.
+
+
+def _trip_list_items(rows: list[tuple[Trip, int]], summaries: list[dict]) -> list[dict]:
+    by_trip = {s["trip_id"]: s for s in summaries}
+    return [
+        {
+            "id": trip.id,
+            "name": trip.name,
+            "start_date": trip.start_date,
+            "end_date": trip.end_date,
+            "destination_count": int(count or 0),
+            "budget": to_float_or_none(trip.budget),
+            "budget_summary": by_trip.get(trip.id),
+        }
+        for trip, count in rows
+    ]
+
+
+def _trip_full_response(
+    trip: Trip, expenses: list[Expense], budget: dict, catalog: CityCatalog | None = None
+) -> dict:
+    stops: list[dict] = []
+    for s in sorted(trip.stops, key=lambda s: (s.order_index, s.start_date, s.id)):
+        activities = sorted(s.activities, key=lambda a: (a.start_time is None, a.start_time, a.id))
+        stops.append({**stop_fields(s, catalog), "activities": [activity_fields(a) for a in activities]})
+
+    return {
+        "trip": trip_fields(trip),
+        "stops": stops,
+        "expenses": [expense_fields(e) for e in expenses],
+        "budget": budget,
+    }
 
 
 @router.get("", response_model=list[TripListItem])
-def list_trips(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_trips(
+    include_budget: bool = False,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
     rows = list_trips_for_user(db, current_user.id)
-    result: list[TripListItem] = []
-    for trip, count in rows:
-        result.append(
-            TripListItem(
-                id=trip.id,
-                name=trip.name,
-                start_date=trip.start_date,
-                end_date=trip.end_date,
-                destination_count=int(count or 0),
-                budget=float(trip.budget) if trip.budget is not None else None,
-            )
-        )
-    return result
+    summaries = compute_budget_summaries(db, [trip for trip, _ in rows]) if include_budget else []
+    return json_response(_trip_list_items(rows, summaries))
 
 
 @router.post("", response_model=TripResponse)
-def create_trip(payload: TripCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_trip(payload: TripCreate, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     trip = Trip(user_id=current_user.id, **payload.model_dump())
     db.add(trip)
+    db.flush()
+    ensure_budget_rollup(db, trip.id)
     db.commit()
     db.refresh(trip)
     return trip
 
 
 @router.get("/{trip_id}", response_model=TripResponse)
-def get_trip(trip_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_trip(trip_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     trip = get_trip_for_user(db, current_user.id, trip_id)
     if not trip:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
     return trip
 
 
+@router.get("/{trip_id}/full", response_model=TripFullResponse)
+def get_trip_full(trip_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
+    loaded = get_full_trip_for_user(db, current_user.id, trip_id)
+    if not loaded:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+    trip, expenses = loaded
+    return json_response(_trip_full_response(trip, expenses, compute_budget_summary(db, trip)))
+
+
+@router.get("/{trip_id}/export")
+def export_trip_file(
+    trip_id: int,
+    request: Request,
+    format: ExportFormat = "csv",
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Stops and activities as CSV, NDJSON or iCalendar, streamed in batches."""
+    trip = get_trip_for_user(db, current_user.id, trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+
+    return StreamingResponse(
+        export_trip(trip, format, primary=reads_pinned_to_primary(request.headers)),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="trip-{trip_id}.{format}"'},
+    )
+
+
 @router.patch("/{trip_id}", response_model=TripResponse)
 def update_trip(
     trip_id: int,
     payload: TripUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     trip = get_trip_for_user(db, current_user.id, trip_id)
     if not trip:
@@ -63,12 +148,51 @@ def update_trip(
     db.add(trip)
     db.commit()
     db.refresh(trip)
+    invalidate_public_trip(trip.id)
     return trip
 
 
 @router.delete("/{trip_id}")
-def delete_trip(trip_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def delete_trip(trip_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     ok = delete_trip_for_user(db, current_user.id, trip_id)
     if not ok:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+    invalidate_public_trip(trip_id)
     return {"deleted": True}
+
+
+@async_router.get("", response_model=list[TripListItem])
+async def list_trips_async(
+    include_budget: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    rows = await list_trips_for_user_async(db, current_user.id)
+    summaries = await compute_budget_summaries_async(db, [trip for trip, _ in rows]) if include_budget else []
+    return json_response(_trip_list_items(rows, summaries))
+
+
+@async_router.get("/{trip_id}", response_model=TripResponse)
+async def get_trip_async(
+    trip_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    trip = await get_trip_for_user_async(db, current_user.id, trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+    return trip
+
+
+@async_router.get("/{trip_id}/full", response_model=TripFullResponse)
+async def get_trip_full_async(
+    trip_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    loaded = await get_full_trip_for_user_async(db, current_user.id, trip_id)
+    if not loaded:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+    trip, expenses = loaded
+    budget = await compute_budget_summary_async(db, trip)
+    return json_response(_trip_full_response(trip, expenses, budget, await get_city_catalog_async()))
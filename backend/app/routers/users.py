@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.principal import invalidate_principal
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
 
@@ -26,4 +27,5 @@ def update_me(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    invalidate_principal(current_user.id)
     return current_user
@@ -0,0 +1,56 @@
+from pydantic import BaseModel, Field, model_validator
+
+from app.schemas.activity import ActivityCreate, ActivityResponse, ActivityUpdate
+from app.schemas.stop import StopCreate, StopResponse, StopUpdate
+
+# Upper bound on the rows a single batch may touch per list.
+MAX_BATCH_ITEMS = 1000
+
+
+class StopBatchCreate(StopCreate):
+    # Client-chosen label so activities in the same batch can target this stop.
+    ref: str | None = None
+
+
+class StopBatchUpdate(StopUpdate):
+    id: int
+
+
+class ActivityBatchCreate(ActivityCreate):
+    stop_id: int | None = None
+    stop_ref: str | None = None
+
+    @model_validator(mode="after")
+    def _one_target(self):
+        if (self.stop_id is None) == (self.stop_ref is None):
+            raise ValueError("Exactly one of stop_id and stop_ref is required")
+        return self
+
+
+class ActivityBatchUpdate(ActivityUpdate):
+    id: int
+
+
+class StopBatch(BaseModel):
+    create: list[StopBatchCreate] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    update: list[StopBatchUpdate] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    delete: list[int] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+
+
+class ActivityBatch(BaseModel):
+    create: list[ActivityBatchCreate] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    update: list[ActivityBatchUpdate] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    delete: list[int] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+
+
+class TripBatchRequest(BaseModel):
+    stops: StopBatch = StopBatch()
+    activities: ActivityBatch = ActivityBatch()
+
+
+class TripBatchResponse(BaseModel):
+    # Rows created or updated by the batch, in request order (creates first).
+    stops: list[StopResponse]
+    activities: list[ActivityResponse]
+    deleted_stop_ids: list[int]
+    deleted_activity_ids: list[int]
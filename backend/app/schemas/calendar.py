@@ -0,0 +1,53 @@
+from datetime import date, datetime
+
+from pydantic import BaseModel
+
+
+class CalendarTrip(BaseModel):
+    trip_id: int
+    name: str
+    start_date: date
+    end_date: date
+
+
+class CalendarStop(BaseModel):
+    stop_id: int
+    trip_id: int
+    trip_name: str
+    city_id: int
+    city_name: str | None = None
+    city_country: str | None = None
+    start_date: date
+    end_date: date
+
+
+class CalendarActivity(BaseModel):
+    id: int
+    stop_id: int
+    trip_id: int
+    trip_name: str
+    name: str
+    type: str | None = None
+    start_time: datetime
+    duration_minutes: int | None = None
+    cost: float
+
+
+class CalendarSpend(BaseModel):
+    activities: float
+    expenses: float
+    total: float
+
+
+class CalendarDay(BaseModel):
+    date: date
+    trips: list[CalendarTrip]
+    stops: list[CalendarStop]
+    activities: list[CalendarActivity]
+    spend: CalendarSpend
+
+
+class CalendarResponse(BaseModel):
+    start: date
+    end: date
+    days: list[CalendarDay]
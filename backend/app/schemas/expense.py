@@ -1,6 +1,12 @@
 from datetime import date
+from typing import Annotated
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# Largest magnitude expenses.amount (NUMERIC(12, 2)) can hold; anything beyond,
+# or inf/nan, is a validation error rather than a database overflow.
+MAX_AMOUNT = 9_999_999_999.99
+Amount = Annotated[float, Field(allow_inf_nan=False, ge=-MAX_AMOUNT, le=MAX_AMOUNT)]
 
 
 class ExpenseResponse(BaseModel):
@@ -17,12 +23,65 @@ class ExpenseResponse(BaseModel):
 class ExpenseCreate(BaseModel):
     expense_date: date | None = None
     category: str
-    amount: float = 0
+    amount: Amount = 0
     notes: str | None = None
 
 
 class ExpenseUpdate(BaseModel):
     expense_date: date | None = None
     category: str | None = None
-    amount: float | None = None
+    amount: Amount | None = None
     notes: str | None = None
+
+
+class ExpenseImportError(BaseModel):
+    line: int
+    errors: list[str]
+
+
+class ExpenseImportResponse(BaseModel):
+    imported: int
+    failed: int
+    total_amount: float
+    # At most the first 100 invalid rows; ``failed`` counts all of them.
+    errors: list[ExpenseImportError]
+
+
+class ExpenseCategoryTotal(BaseModel):
+    category: str
+    total: float
+    count: int
+
+
+class ExpenseDayTotal(BaseModel):
+    date: date
+    total: float
+    count: int
+    cumulative: float
+    remaining: float | None = None
+
+
+class ExpenseCategoryDayTotal(BaseModel):
+    date: date
+    category: str
+    total: float
+    count: int
+
+
+class ExpenseUndatedTotal(BaseModel):
+    total: float
+    count: int
+
+
+class ExpenseSummaryResponse(BaseModel):
+    trip_ids: list[int]
+    budget: float | None = None
+    total: float
+    count: int
+    by_category: list[ExpenseCategoryTotal]
+    # Dated expenses only, oldest first; ``remaining`` is the budget minus ``cumulative``.
+    by_day: list[ExpenseDayTotal]
+    by_category_day: list[ExpenseCategoryDayTotal]
+    undated: ExpenseUndatedTotal
+    # First day the cumulative expenses exceed the budget.
+    over_budget_on: date | None = None
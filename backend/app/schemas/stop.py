@@ -24,6 +24,11 @@ class StopUpdate(BaseModel):
     meals_cost: float | None = None
 
 
+class StopMove(BaseModel):
+    # Stop to place this one directly after; null moves it to the start.
+    after_id: int | None = None
+
+
 class StopResponse(BaseModel):
     model_config = {"from_attributes": True}
 
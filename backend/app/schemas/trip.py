@@ -2,6 +2,11 @@ from datetime import date
 
 from pydantic import BaseModel, Field
 
+from app.schemas.activity import ActivityResponse
+from app.schemas.budget import BudgetSummaryResponse
+from app.schemas.expense import ExpenseResponse
+from app.schemas.stop import StopResponse
+
 
 class TripCreate(BaseModel):
     name: str = Field(min_length=1)
@@ -30,6 +35,7 @@ class TripListItem(BaseModel):
     end_date: date
     destination_count: int = 0
     budget: float | None = None
+    budget_summary: BudgetSummaryResponse | None = None
 
 
 class TripResponse(BaseModel):
@@ -42,3 +48,14 @@ class TripResponse(BaseModel):
     description: str | None = None
     cover_photo_url: str | None = None
     budget: float | None = None
+
+
+class TripFullStop(StopResponse):
+    activities: list[ActivityResponse] = []
+
+
+class TripFullResponse(BaseModel):
+    trip: TripResponse
+    stops: list[TripFullStop]
+    expenses: list[ExpenseResponse]
+    budget: BudgetSummaryResponse
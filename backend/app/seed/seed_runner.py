@@ -1,50 +1,164 @@
+import argparse
+import csv
+import io
 import json
 import pathlib
-from sqlalchemy import select, text
+import time
+from itertools import islice
+from typing import Iterable, Iterator
 
-from app.core.database import Base, SessionLocal, engine
-from app.models.city import City
-from app.models.attraction import Attraction
+from sqlalchemy import text
 
+from app.core.database import Base, engine
+from app.services.city_catalog import invalidate_city_catalog
 
-def run_seed() -> None:
+SEED_DIR = pathlib.Path(__file__).parent
+# Rows buffered per COPY; bounds memory regardless of the catalog size.
+DEFAULT_CHUNK_ROWS = 50_000
+
+CITY_COLUMNS = ("id", "name", "country", "region", "cost_index", "popularity", "image_url")
+ATTRACTION_COLUMNS = ("id", "city_id", "name", "type", "description", "cost", "rating", "image_url")
+
+
+SEED_FORMATS = ("ndjson", "csv", "json")
+
+
+def find_seed_file(seed_dir: pathlib.Path, stem: str, fmt: str | None = None) -> pathlib.Path | None:
+    """The ``stem`` seed file in ``fmt``, or the first of SEED_FORMATS present.
+
+    NDJSON and CSV are streamed; .json is the older one-document format. When
+    several formats exist and none was asked for, the others are reported as
+    ignored, since a stale file would otherwise win silently.
+    """
+    if fmt is not None:
+        path = seed_dir / f"{stem}.{fmt}"
+        return path if path.exists() else None
+
+    found = [path for f in SEED_FORMATS if (path := seed_dir / f"{stem}.{f}").exists()]
+    if len(found) > 1:
+        ignored = ", ".join(p.name for p in found[1:])
+        print(f"Using {found[0].name}; ignoring {ignored} (pass --format to choose)")
+    return found[0] if found else None
+
+
+def iter_seed_records(path: pathlib.Path) -> Iterator[dict]:
+    if path.suffix == ".ndjson":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif path.suffix == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from json.load(f)
+
+
+def _chunks(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    records = iter(records)
+    while chunk := list(islice(records, size)):
+        yield chunk
+
+
+def _secondary_indexes(conn, table: str) -> list[tuple[str, str]]:
+    """(name, CREATE INDEX statement) for indexes that don't back a constraint."""
+    rows = conn.execute(
+        text(
+            "SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid) "
+            "FROM pg_index i "
+            "WHERE i.indrelid = CAST(:table AS regclass) "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)"
+        ),
+        {"table": table},
+    )
+    return [(name, definition) for name, definition in rows]
+
+
+def _copy_records(cursor, table: str, columns: tuple[str, ...], records: Iterable[dict], chunk_rows: int) -> int:
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    started = time.perf_counter()
+    loaded = 0
+    for chunk in _chunks(records, chunk_rows):
+        # Missing values become unquoted empty fields, which COPY reads as NULL.
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in chunk:
+            writer.writerow([record.get(c) for c in columns])
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+        loaded += len(chunk)
+        elapsed = time.perf_counter() - started
+        print(f"  {table}: {loaded:,} rows ({loaded / elapsed:,.0f} rows/s)", flush=True)
+    return loaded
+
+
+def run_seed(
+    seed_dir: pathlib.Path = SEED_DIR, chunk_rows: int = DEFAULT_CHUNK_ROWS, fmt: str | None = None
+) -> None:
+    """Replace the cities and attractions catalog with the seed files, via COPY.
+
+    Everything runs in one transaction: secondary indexes are dropped before the
+    load and rebuilt afterwards, so a failed load leaves the old catalog intact.
+    Raises FileNotFoundError without seed files, and re-raises load errors.
+    """
     Base.metadata.create_all(bind=engine)
-    
-    seed_dir = pathlib.Path(__file__).parent
-    cities_path = seed_dir / "cities.json"
-    attractions_path = seed_dir / "attractions.json"
-    
-    if not cities_path.exists() or not attractions_path.exists():
-        print("Seed files not found. Please run scripts/generate_seed_data.py first.")
-        return
-
-    with open(cities_path, "r") as f:
-        cities_data = json.load(f)
-        
-    with open(attractions_path, "r") as f:
-        attractions_data = json.load(f)
-
-    db = SessionLocal()
+
+    cities_path = find_seed_file(seed_dir, "cities", fmt)
+    attractions_path = find_seed_file(seed_dir, "attractions", fmt)
+    if not cities_path or not attractions_path:
+        raise FileNotFoundError(f"Seed files not found in {seed_dir}. Please run scripts/generate_seed_data.py first.")
+
+    started = time.perf_counter()
     try:
-        print("Truncating cities and attractions tables...")
-        db.execute(text("TRUNCATE TABLE attractions, cities RESTART IDENTITY CASCADE"))
-        db.commit()
-        
-        print(f"Seeding {len(cities_data)} cities...")
-        db.bulk_insert_mappings(City, cities_data)
-        db.commit()
-        
-        print(f"Seeding {len(attractions_data)} attractions...")
-        db.bulk_insert_mappings(Attraction, attractions_data)
-        db.commit()
-        
-    except Exception as e:
-        print(f"Error seeding data: {e}")
-        db.rollback()
+        with engine.begin() as conn:
+            print("Truncating cities and attractions tables...")
+            conn.execute(text("TRUNCATE TABLE attractions, cities RESTART IDENTITY CASCADE"))
+
+            indexes = _secondary_indexes(conn, "cities") + _secondary_indexes(conn, "attractions")
+            for name, _ in indexes:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+            cursor = conn.connection.dbapi_connection.cursor()
+            print(f"Seeding cities from {cities_path.name}...")
+            cities = _copy_records(cursor, "cities", CITY_COLUMNS, iter_seed_records(cities_path), chunk_rows)
+            print(f"Seeding attractions from {attractions_path.name}...")
+            attractions = _copy_records(
+                cursor, "attractions", ATTRACTION_COLUMNS, iter_seed_records(attractions_path), chunk_rows
+            )
+
+            print(f"Rebuilding {len(indexes)} indexes...")
+            index_started = time.perf_counter()
+            for _, definition in indexes:
+                conn.execute(text(definition))
+            print(f"  done in {time.perf_counter() - index_started:.1f}s")
+
+            # Seed rows carry explicit ids, so move the sequences past them.
+            for table in ("cities", "attractions"):
+                conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+                    )
+                )
+            conn.execute(text("ANALYZE cities"))
+            conn.execute(text("ANALYZE attractions"))
     finally:
-        db.close()
+        invalidate_city_catalog()
+
+    elapsed = time.perf_counter() - started
+    total = cities + attractions
+    print(f"Seeded {cities:,} cities and {attractions:,} attractions in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
 
 
 if __name__ == "__main__":
-    run_seed()
+    parser = argparse.ArgumentParser(description="Load the city and attraction catalog with PostgreSQL COPY.")
+    parser.add_argument("--dir", type=pathlib.Path, default=SEED_DIR, help="directory holding cities.* and attractions.*")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--format", choices=SEED_FORMATS, help="seed file format (default: first found, in this order)")
+    args = parser.parse_args()
+    try:
+        run_seed(args.dir, args.chunk_rows, args.format)
+    except Exception as e:
+        raise SystemExit(f"Seed failed: {e}") from e
     print("Seed completed")
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Integer, cast, delete, extract, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.activity import Activity
+from app.models.analytics_rollup import ActivityTypeRollup, AnalyticsRefresh, CityVisitRollup, TripMonthRollup
+from app.models.stop import Stop
+from app.models.trip import Trip
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for the Postgres advisory lock that serialises refreshes across workers and cron.
+_REFRESH_LOCK_KEY = 0x47544131
+
+
+def _rebuild_city_visits(db: Session) -> None:
+    db.execute(delete(CityVisitRollup))
+    db.execute(
+        insert(CityVisitRollup).from_select(
+            ["city_id", "stop_count"],
+            select(Stop.city_id, func.count(Stop.id)).group_by(Stop.city_id),
+        )
+    )
+
+
+def _rebuild_activity_types(db: Session) -> None:
+    activity_type = func.coalesce(Activity.type, "")
+    db.execute(delete(ActivityTypeRollup))
+    db.execute(
+        insert(ActivityTypeRollup).from_select(
+            ["type", "activity_count"],
+            select(activity_type, func.count(Activity.id)).group_by(activity_type),
+        )
+    )
+
+
+def _rebuild_trips_per_month(db: Session) -> None:
+    year = cast(extract("year", Trip.start_date), Integer)
+    month = cast(extract("month", Trip.start_date), Integer)
+    db.execute(delete(TripMonthRollup))
+    db.execute(
+        insert(TripMonthRollup).from_select(
+            ["year", "month", "trip_count"],
+            select(year, month, func.count(Trip.id)).where(Trip.start_date.is_not(None)).group_by(year, month),
+        )
+    )
+
+
+ROLLUPS = {
+    "city_visits": _rebuild_city_visits,
+    "activity_types": _rebuild_activity_types,
+    "trips_per_month": _rebuild_trips_per_month,
+}
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def refresh_analytics_rollups(
+    db: Session,
+    *,
+    wait: bool = True,
+    min_interval_seconds: float | None = None,
+) -> dict[str, int] | None:
+    """Recompute every analytics rollup from the source tables in one transaction.
+
+    Readers keep seeing the previous numbers until the commit. Returns the
+    milliseconds spent per rollup, or None when the refresh was skipped: with
+    ``wait=False`` because another refresh holds the lock, or because every
+    rollup is younger than ``min_interval_seconds``.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        if wait:
+            db.execute(select(func.pg_advisory_xact_lock(_REFRESH_LOCK_KEY)))
+        elif not db.execute(select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_KEY))).scalar():
+            db.rollback()
+            return None
+
+    if min_interval_seconds is not None:
+        refreshed = db.execute(select(AnalyticsRefresh.refreshed_at)).scalars().all()
+        now = datetime.now(timezone.utc)
+        if len(refreshed) == len(ROLLUPS) and all(
+            (now - _as_utc(at)).total_seconds() < min_interval_seconds for at in refreshed
+        ):
+            db.rollback()
+            return None
+
+    timings: dict[str, int] = {}
+    for name, rebuild in ROLLUPS.items():
+        started = time.perf_counter()
+        rebuild(db)
+        timings[name] = int((time.perf_counter() - started) * 1000)
+        db.merge(AnalyticsRefresh(rollup=name, refreshed_at=datetime.now(timezone.utc), duration_ms=timings[name]))
+    db.commit()
+    return timings
+
+
+def rollup_refreshed_at(db: Session, rollup: str) -> datetime | None:
+    refreshed_at = db.execute(select(AnalyticsRefresh.refreshed_at).where(AnalyticsRefresh.rollup == rollup)).scalar()
+    return _as_utc(refreshed_at) if refreshed_at else None
+
+
+def analytics_freshness(db: Session) -> list[dict]:
+    refreshes = {r.rollup: r for r in db.execute(select(AnalyticsRefresh)).scalars()}
+    now = datetime.now(timezone.utc)
+    result = []
+    for name in ROLLUPS:
+        refresh = refreshes.get(name)
+        refreshed_at = _as_utc(refresh.refreshed_at) if refresh else None
+        result.append(
+            {
+                "rollup": name,
+                "refreshed_at": refreshed_at,
+                "age_seconds": int((now - refreshed_at).total_seconds()) if refreshed_at else None,
+                "duration_ms": refresh.duration_ms if refresh else None,
+            }
+        )
+    return result
+
+
+def _scheduled_refresh(interval_seconds: int) -> None:
+    # Imported lazily so that importing this module never creates the engine.
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        # Every worker runs this loop; the lock and the age check keep it to
+        # roughly one refresh per interval across all of them.
+        refresh_analytics_rollups(db, wait=False, min_interval_seconds=interval_seconds * 0.9)
+    finally:
+        db.close()
+
+
+async def run_analytics_refresher(interval_seconds: int) -> None:
+    while True:
+        try:
+            await run_in_threadpool(_scheduled_refresh, interval_seconds)
+        except Exception:
+            logger.exception("Analytics rollup refresh failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,115 @@
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.activity import Activity
+from app.models.stop import Stop
+from app.schemas.batch import TripBatchRequest
+from app.services.budget_service import rebuild_budget_rollup
+from app.services.share_service import invalidate_public_trip
+from app.services.stop_order import ORDER_GAP, lock_trip_stops, next_order_key
+from app.utils.response_utils import activity_fields, stop_fields
+
+
+def _check_ids(found: set[int], wanted: set[int], kind: str) -> None:
+    missing = sorted(wanted - found)
+    if missing:
+        raise LookupError(f"{kind} not found: {', '.join(map(str, missing))}")
+
+
+def apply_trip_batch(db: Session, trip_id: int, batch: TripBatchRequest) -> dict:
+    """Apply a batch of stop and activity writes to one trip in a single transaction.
+
+    The caller has already checked that the trip belongs to the user; every
+    stop and activity id in the batch is checked against the trip here, with
+    one query per kind. Raises LookupError for ids outside the trip and
+    ValueError for an inconsistent batch, before anything is written.
+    """
+    stops, activities = batch.stops, batch.activities
+
+    refs = [s.ref for s in stops.create if s.ref is not None]
+    if len(refs) != len(set(refs)):
+        raise ValueError("Stop refs must be unique within a batch")
+    unknown_refs = {a.stop_ref for a in activities.create if a.stop_ref is not None} - set(refs)
+    if unknown_refs:
+        raise ValueError(f"Unknown stop_ref: {', '.join(sorted(unknown_refs))}")
+
+    deleted_stops = set(stops.delete)
+    if deleted_stops & {s.id for s in stops.update}:
+        raise ValueError("A stop can't be updated and deleted in the same batch")
+    if deleted_stops & {a.stop_id for a in activities.create}:
+        raise ValueError("Can't add activities to a stop deleted in the same batch")
+    if set(activities.delete) & {a.id for a in activities.update}:
+        raise ValueError("An activity can't be updated and deleted in the same batch")
+
+    stop_ids = deleted_stops | {s.id for s in stops.update} | {a.stop_id for a in activities.create if a.stop_id}
+    if stop_ids:
+        found = db.execute(select(Stop.id).where(Stop.id.in_(stop_ids), Stop.trip_id == trip_id)).scalars()
+        _check_ids(set(found), stop_ids, "Stop")
+
+    activity_ids = set(activities.delete) | {a.id for a in activities.update}
+    if activity_ids:
+        rows = db.execute(
+            select(Activity.id, Activity.stop_id)
+            .join(Stop, Stop.id == Activity.stop_id)
+            .where(Activity.id.in_(activity_ids), Stop.trip_id == trip_id)
+        ).all()
+        _check_ids({r.id for r in rows}, activity_ids, "Activity")
+        if deleted_stops & {r.stop_id for r in rows if r.id not in set(activities.delete)}:
+            raise ValueError("Can't update an activity on a stop deleted in the same batch")
+
+    if activities.delete:
+        db.execute(delete(Activity).where(Activity.id.in_(activities.delete)))
+    if deleted_stops:
+        # Explicit so it doesn't depend on the database enforcing ON DELETE CASCADE.
+        db.execute(delete(Activity).where(Activity.stop_id.in_(deleted_stops)))
+        db.execute(delete(Stop).where(Stop.id.in_(deleted_stops)))
+
+    # Bulk UPDATEs by primary key; rows setting the same columns share one executemany.
+    if stops.update:
+        db.execute(update(Stop), [s.model_dump(exclude_unset=True) | {"id": s.id} for s in stops.update])
+    if activities.update:
+        db.execute(update(Activity), [a.model_dump(exclude_unset=True) | {"id": a.id} for a in activities.update])
+
+    created_stop_ids: list[int] = []
+    if stops.create:
+        lock_trip_stops(db, trip_id)
+        next_index = next_order_key(db, trip_id)
+        rows = []
+        for s in stops.create:
+            row = s.model_dump(exclude={"ref"}) | {"trip_id": trip_id}
+            if row["order_index"] is None:
+                row["order_index"] = next_index
+                next_index += ORDER_GAP
+            rows.append(row)
+        created_stop_ids = list(db.execute(insert(Stop).returning(Stop.id, sort_by_parameter_order=True), rows).scalars())
+
+    created_activity_ids: list[int] = []
+    if activities.create:
+        stop_by_ref = {s.ref: stop_id for s, stop_id in zip(stops.create, created_stop_ids) if s.ref is not None}
+        rows = [
+            a.model_dump(exclude={"stop_id", "stop_ref"}) | {"stop_id": a.stop_id or stop_by_ref[a.stop_ref]}
+            for a in activities.create
+        ]
+        created_activity_ids = list(
+            db.execute(insert(Activity).returning(Activity.id, sort_by_parameter_order=True), rows).scalars()
+        )
+
+    rebuild_budget_rollup(db, trip_id)
+    db.commit()
+    if stops.create or stops.update or stops.delete:
+        invalidate_public_trip(trip_id)
+
+    stop_order = created_stop_ids + [s.id for s in stops.update]
+    activity_order = created_activity_ids + [a.id for a in activities.update]
+    stop_rows = {s.id: s for s in db.execute(select(Stop).where(Stop.id.in_(stop_order))).scalars()} if stop_order else {}
+    activity_rows = (
+        {a.id: a for a in db.execute(select(Activity).where(Activity.id.in_(activity_order))).scalars()}
+        if activity_order
+        else {}
+    )
+    return {
+        "stops": [stop_fields(stop_rows[i]) for i in stop_order],
+        "activities": [activity_fields(activity_rows[i]) for i in activity_order],
+        "deleted_stop_ids": sorted(deleted_stops),
+        "deleted_activity_ids": sorted(set(activities.delete)),
+    }
@@ -1,36 +1,153 @@
-from sqlalchemy import func, select
+from decimal import Decimal
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.activity import Activity
 from app.models.expense import Expense
 from app.models.stop import Stop
 from app.models.trip import Trip
+from app.models.trip_budget_rollup import TripBudgetRollup
 from app.utils.date_utils import days_inclusive
 from app.utils.response_utils import to_float
 
+ROLLUP_FIELDS = ("transport", "stay", "meals", "activities", "other")
 
-def compute_budget_summary(db: Session, trip: Trip, *, budget_limit: float | None = None) -> dict:
-    limit = budget_limit if budget_limit is not None else (float(trip.budget) if trip.budget is not None else None)
 
-    stop_totals = db.execute(
+def _dec(value) -> Decimal:
+    return Decimal(str(value)) if value is not None else Decimal("0")
+
+
+def _source_totals_stmt():
+    stop_sums = (
+        select(
+            Stop.trip_id.label("trip_id"),
+            func.sum(Stop.transport_cost).label("transport"),
+            func.sum(Stop.stay_cost).label("stay"),
+            func.sum(Stop.meals_cost).label("meals"),
+        )
+        .group_by(Stop.trip_id)
+        .subquery()
+    )
+    activity_sums = (
+        select(Stop.trip_id.label("trip_id"), func.sum(Activity.cost).label("activities"))
+        .join(Stop, Stop.id == Activity.stop_id)
+        .group_by(Stop.trip_id)
+        .subquery()
+    )
+    expense_sums = (
+        select(Expense.trip_id.label("trip_id"), func.sum(Expense.amount).label("other"))
+        .group_by(Expense.trip_id)
+        .subquery()
+    )
+    return (
         select(
-            func.coalesce(func.sum(Stop.transport_cost), 0),
-            func.coalesce(func.sum(Stop.stay_cost), 0),
-            func.coalesce(func.sum(Stop.meals_cost), 0),
-        ).where(Stop.trip_id == trip.id)
-    ).one()
-
-    activities_total = db.execute(
-        select(func.coalesce(func.sum(Activity.cost), 0)).join(Stop, Stop.id == Activity.stop_id).where(Stop.trip_id == trip.id)
-    ).scalar_one()
-
-    other_total = db.execute(
-        select(func.coalesce(func.sum(Expense.amount), 0)).where(Expense.trip_id == trip.id)
-    ).scalar_one()
-
-    transport, stay, meals = [to_float(x) for x in stop_totals]
-    activities = to_float(activities_total)
-    other = to_float(other_total)
+            Trip.id,
+            func.coalesce(stop_sums.c.transport, 0),
+            func.coalesce(stop_sums.c.stay, 0),
+            func.coalesce(stop_sums.c.meals, 0),
+            func.coalesce(activity_sums.c.activities, 0),
+            func.coalesce(expense_sums.c.other, 0),
+        )
+        .outerjoin(stop_sums, stop_sums.c.trip_id == Trip.id)
+        .outerjoin(activity_sums, activity_sums.c.trip_id == Trip.id)
+        .outerjoin(expense_sums, expense_sums.c.trip_id == Trip.id)
+    )
+
+
+def ensure_budget_rollup(db: Session, trip_id: int) -> None:
+    """Add an empty rollup row for a trip that was just created (caller commits)."""
+    db.add(TripBudgetRollup(trip_id=trip_id, **{f: 0 for f in ROLLUP_FIELDS}))
+
+
+def rebuild_budget_rollup(db: Session, trip_id: int) -> TripBudgetRollup:
+    """Recompute a trip's rollup from its stops, activities and expenses (caller commits)."""
+    db.flush()
+    row = db.execute(_source_totals_stmt().where(Trip.id == trip_id)).one()
+    values = dict(zip(ROLLUP_FIELDS, row[1:]))
+
+    rollup = db.get(TripBudgetRollup, trip_id)
+    if rollup is None:
+        rollup = TripBudgetRollup(trip_id=trip_id)
+        db.add(rollup)
+    for field, value in values.items():
+        setattr(rollup, field, value)
+    db.flush()
+    return rollup
+
+
+def adjust_budget_rollup(db: Session, trip_id: int, **deltas) -> None:
+    """Apply cost deltas to a trip's rollup in the caller's transaction.
+
+    Uses ``col = col + delta`` so concurrent writers to the same trip don't lose
+    updates. Trips without a rollup yet (created before rollups existed) are
+    rebuilt from source rows instead, so call this after the change itself has
+    been added to (or deleted from) the session.
+    """
+    values = {f: getattr(TripBudgetRollup, f) + _dec(d) for f, d in deltas.items() if d}
+    if not values:
+        return
+
+    result = db.execute(
+        update(TripBudgetRollup)
+        .where(TripBudgetRollup.trip_id == trip_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        rebuild_budget_rollup(db, trip_id)
+
+
+def cost_delta(old, new) -> Decimal:
+    return _dec(new) - _dec(old)
+
+
+def stop_costs(stop: Stop) -> dict[str, Decimal]:
+    return {
+        "transport": _dec(stop.transport_cost),
+        "stay": _dec(stop.stay_cost),
+        "meals": _dec(stop.meals_cost),
+    }
+
+
+def check_budget_rollups(db: Session, *, fix: bool = False) -> list[dict]:
+    """Compare every trip's rollup with totals recomputed from source rows.
+
+    Returns one entry per trip whose rollup is missing or has drifted; with
+    ``fix`` the rollups are overwritten with the recomputed totals.
+    """
+    source = _source_totals_stmt().subquery()
+    stmt = select(source, *(getattr(TripBudgetRollup, f) for f in ROLLUP_FIELDS)).outerjoin(
+        TripBudgetRollup, TripBudgetRollup.trip_id == source.c.id
+    )
+
+    drift: list[dict] = []
+    for row in db.execute(stmt):
+        trip_id = row[0]
+        actual = dict(zip(ROLLUP_FIELDS, (_dec(v) for v in row[1:6])))
+        stored = row[6:]
+        missing = stored[0] is None
+        diffs = {
+            f: {"stored": None if s is None else to_float(s), "actual": float(actual[f])}
+            for f, s in zip(ROLLUP_FIELDS, stored)
+            if missing or _dec(s) != actual[f]
+        }
+        if diffs:
+            drift.append({"trip_id": trip_id, "missing": missing, "fields": diffs})
+            if fix:
+                rollup = db.get(TripBudgetRollup, trip_id) or TripBudgetRollup(trip_id=trip_id)
+                for field, value in actual.items():
+                    setattr(rollup, field, value)
+                db.add(rollup)
+
+    if fix:
+        db.commit()
+    return drift
+
+
+def _summary(trip: Trip, totals: dict, limit: float | None) -> dict:
+    transport, stay, meals, activities, other = [to_float(totals[f]) for f in ROLLUP_FIELDS]
     total = transport + stay + meals + activities + other
 
     day_count = max(1, days_inclusive(trip.start_date, trip.end_date))
@@ -50,3 +167,64 @@ def compute_budget_summary(db: Session, trip: Trip, *, budget_limit: float | Non
         "over_budget": over_budget,
         "budget_limit": limit,
     }
+
+
+def _trip_limit(trip: Trip) -> float | None:
+    return float(trip.budget) if trip.budget is not None else None
+
+
+def compute_budget_summary(db: Session, trip: Trip, *, budget_limit: float | None = None) -> dict:
+    # Read-only, so concurrent first reads can't race to insert the same rollup:
+    # a trip without one is aggregated on the fly, and its next write or
+    # check_budget_rollups(fix=True) backfills it.
+    limit = budget_limit if budget_limit is not None else _trip_limit(trip)
+    summary = compute_budget_summaries(db, [trip])[0]
+    return {**summary, "budget_limit": limit, "over_budget": limit is not None and summary["total"] > limit}
+
+
+def _rollups_stmt(trip_ids: list[int]):
+    return select(TripBudgetRollup.trip_id, *(getattr(TripBudgetRollup, f) for f in ROLLUP_FIELDS)).where(
+        TripBudgetRollup.trip_id.in_(trip_ids)
+    )
+
+
+def compute_budget_summaries(db: Session, trips: list[Trip]) -> list[dict]:
+    """Budget summaries for many trips with a fixed number of queries.
+
+    Rollups are read in one statement; trips that have none yet are
+    aggregated together with a single ``GROUP BY trip_id`` query.
+    """
+    if not trips:
+        return []
+
+    trip_ids = [t.id for t in trips]
+    totals = {row[0]: dict(zip(ROLLUP_FIELDS, row[1:])) for row in db.execute(_rollups_stmt(trip_ids))}
+
+    missing = [tid for tid in trip_ids if tid not in totals]
+    if missing:
+        for row in db.execute(_source_totals_stmt().where(Trip.id.in_(missing))):
+            totals[row[0]] = dict(zip(ROLLUP_FIELDS, row[1:]))
+
+    return [_summary(t, totals[t.id], _trip_limit(t)) for t in trips]
+
+
+async def compute_budget_summaries_async(db: AsyncSession, trips: list[Trip]) -> list[dict]:
+    if not trips:
+        return []
+
+    trip_ids = [t.id for t in trips]
+    totals = {row[0]: dict(zip(ROLLUP_FIELDS, row[1:])) for row in await db.execute(_rollups_stmt(trip_ids))}
+
+    missing = [tid for tid in trip_ids if tid not in totals]
+    if missing:
+        for row in await db.execute(_source_totals_stmt().where(Trip.id.in_(missing))):
+            totals[row[0]] = dict(zip(ROLLUP_FIELDS, row[1:]))
+
+    return [_summary(t, totals[t.id], _trip_limit(t)) for t in trips]
+
+
+async def compute_budget_summary_async(db: AsyncSession, trip: Trip, *, budget_limit: float | None = None) -> dict:
+    # Read-only like the sync path: a trip without a rollup is aggregated on the fly.
+    limit = budget_limit if budget_limit is not None else _trip_limit(trip)
+    summary = (await compute_budget_summaries_async(db, [trip]))[0]
+    return {**summary, "budget_limit": limit, "over_budget": limit is not None and summary["total"] > limit}
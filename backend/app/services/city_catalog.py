@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+from typing import NamedTuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.city import City
+from app.services.city_search import CitySuggestIndex
+
+logger = logging.getLogger(__name__)
+
+
+class CityEntry(NamedTuple):
+    id: int
+    name: str
+    country: str
+    region: str | None
+    cost_index: int | None
+    popularity: int | None
+    image_url: str | None
+
+
+class CityCatalog:
+    """Immutable snapshot of the ``cities`` table.
+
+    Entries are indexed by id and also kept in the order used by the city
+    listing endpoints (popularity desc, nulls last, then name), so reads never
+    need to sort or touch the database.
+    """
+
+    def __init__(self, entries: list[CityEntry], previous: "CityCatalog | None" = None):
+        self.version = 0  # set when the catalog is installed
+        self.loaded_at = time.monotonic()
+        self.by_id: dict[int, CityEntry] = {c.id: c for c in entries}
+        self.ranked: tuple[CityEntry, ...] = tuple(
+            sorted(entries, key=lambda c: (c.popularity is None, -(c.popularity or 0), c.name))
+        )
+        # Built here, off the request path, and only when the rows actually changed.
+        self._suggest_index: CitySuggestIndex | None = None
+        if previous is not None and previous._suggest_index is not None and previous.ranked == self.ranked:
+            self._suggest_index = previous._suggest_index
+        elif get_settings().city_suggest_in_memory:
+            self._suggest_index = CitySuggestIndex(self.ranked)
+
+    @property
+    def suggest_index(self) -> CitySuggestIndex:
+        if self._suggest_index is None:
+            # Only when CITY_SUGGEST_IN_MEMORY was off at load time; a concurrent
+            # first call may build it twice, which is harmless.
+            self._suggest_index = CitySuggestIndex(self.ranked)
+        return self._suggest_index
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get(self, city_id: int) -> CityEntry | None:
+        return self.by_id.get(city_id)
+
+
+_lock = threading.Lock()
+# Held by the one thread reloading the catalog, so an expiry costs a single query.
+_reload_lock = threading.Lock()
+_catalog: CityCatalog | None = None
+_version = 0
+
+
+def _load(db: Session, since_version: int | None = None) -> CityCatalog | None:
+    global _catalog, _version
+
+    rows = db.execute(
+        select(City.id, City.name, City.country, City.region, City.cost_index, City.popularity, City.image_url)
+    ).all()
+    # The previous catalog (and its index) keeps serving until this one is complete.
+    catalog = CityCatalog([CityEntry(*row) for row in rows], _catalog)
+    with _lock:
+        if since_version is not None and _version != since_version:
+            # Invalidated while loading: these rows may predate the write.
+            return None
+        _version += 1
+        catalog.version = _version
+        _catalog = catalog
+        return catalog
+
+
+def load_city_catalog(db: Session) -> CityCatalog:
+    return _load(db)
+
+
+def invalidate_city_catalog() -> None:
+    """Drop the cached catalog; the next read reloads it from the database.
+
+    Call this after anything that writes to ``cities`` (seeding, admin edits).
+    """
+    global _catalog, _version
+
+    with _lock:
+        _catalog = None
+        _version += 1
+
+
+def current_city_catalog() -> CityCatalog | None:
+    """The loaded catalog if it is still fresh, without ever touching the database."""
+    catalog = _catalog
+    ttl = get_settings().city_catalog_ttl_seconds
+    if catalog is not None and (ttl <= 0 or time.monotonic() - catalog.loaded_at < ttl):
+        return catalog
+    return None
+
+
+def _reload(since_version: int | None = None) -> CityCatalog | None:
+    # Imported lazily so that importing this module never creates the engine.
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return _load(db, since_version)
+    finally:
+        db.close()
+
+
+def _refresh(since_version: int) -> None:
+    try:
+        _reload(since_version)
+    except Exception:
+        logger.exception("City catalog refresh failed; keeping the expired catalog")
+    finally:
+        _reload_lock.release()
+
+
+def get_city_catalog() -> CityCatalog:
+    """The catalog, loading it from the database when there is none yet.
+
+    An expired catalog is still returned while a single background thread
+    reloads it. Without one (first use, or after invalidation) callers wait
+    for one thread's load instead of each querying the table.
+    """
+    catalog = current_city_catalog()
+    if catalog is not None:
+        return catalog
+
+    with _lock:
+        stale, version = _catalog, _version
+    if stale is not None:
+        if _reload_lock.acquire(blocking=False):
+            threading.Thread(target=_refresh, args=(version,), name="city-catalog-refresh", daemon=True).start()
+        return stale
+
+    with _reload_lock:
+        catalog = _catalog
+        if catalog is not None:
+            return catalog
+        return _reload()
+
+
+async def get_city_catalog_async() -> CityCatalog:
+    """``get_city_catalog`` for async handlers: a load is a blocking query, so only that goes to the threadpool."""
+    return current_city_catalog() or await run_in_threadpool(get_city_catalog)
+
+
+def city_label(city_id: int, catalog: CityCatalog | None = None) -> tuple[str | None, str | None]:
+    # Async callers pass the catalog they resolved with get_city_catalog_async.
+    city = (catalog if catalog is not None else get_city_catalog()).get(city_id)
+    if not city:
+        return None, None
+    return city.name, city.country
@@ -0,0 +1,160 @@
+import heapq
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Iterable
+
+from sqlalchemy import case, or_, select
+
+from app.models.city import City
+
+if TYPE_CHECKING:
+    from app.services.city_catalog import CityEntry
+
+# Longest suggestion list the index precomputes answers for.
+MAX_SUGGESTIONS = 20
+# Queries shorter than this are answered from precomputed prefix buckets.
+_SHORT_QUERY = 3
+# Longer prefixes matching more names than this get a precomputed bucket too.
+_HOT_PREFIX = 64
+
+
+def fold_text(value: str) -> str:
+    """Lower-case and strip accents so "São Paulo" matches "sao pa"."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def _trigrams(value: str) -> set[str]:
+    return {value[i : i + 3] for i in range(len(value) - 2)}
+
+
+def _take(positions: Iterable[int], wanted: int, seen: set[int]) -> list[int]:
+    return heapq.nsmallest(wanted, (p for p in positions if p not in seen))
+
+
+class CitySuggestIndex:
+    """Typeahead index over city and country names.
+
+    ``entries`` must already be in popularity order; a city's position in that
+    list is its rank, so "more popular" is simply "smaller position". Results
+    are tiered: city names starting with the query, then any name or country
+    word starting with it, then substring matches anywhere.
+    """
+
+    def __init__(self, entries: tuple["CityEntry", ...]):
+        self.entries = entries
+        self._names: list[tuple[str, int]] = []
+        self._words: list[tuple[str, int]] = []
+        self._haystacks: list[str] = []
+        grams: dict[str, list[int]] = defaultdict(list)
+
+        for pos, city in enumerate(entries):
+            name = fold_text(city.name)
+            country = fold_text(city.country)
+            self._names.append((name, pos))
+            self._words.extend((w, pos) for w in set(name.split()[1:]) | set(country.split()))
+
+            haystack = f"{name}\x00{country}"
+            self._haystacks.append(haystack)
+            for gram in _trigrams(name) | _trigrams(country):
+                grams[gram].append(pos)
+
+        self._names.sort()
+        self._words.sort()
+        # Postings are filled in position order, so they are already sorted by rank.
+        self._grams = dict(grams)
+        self._top = self._precompute_top()
+
+    def _precompute_top(self) -> dict[str, list[int]]:
+        """Answer lists for every short prefix and every prefix matching many cities.
+
+        Those are exactly the queries where ranking all prefix matches at request
+        time would be slow, so their top results are worked out once here.
+        """
+        top: dict[str, list[int]] = {}
+        keyed = [(name, 0, pos) for name, pos in self._names] + [(word, 1, pos) for word, pos in self._words]
+        length = 1
+        while keyed:
+            counts = Counter(key[:length] for key, _, _ in keyed if len(key) >= length)
+            hot = {p for p, n in counts.items() if length < _SHORT_QUERY or n > _HOT_PREFIX}
+            if not hot:
+                break
+            buckets: dict[str, dict[int, int]] = defaultdict(dict)
+            for key, tier, pos in keyed:
+                prefix = key[:length]
+                if len(prefix) == length and prefix in hot:
+                    bucket = buckets[prefix]
+                    bucket[pos] = min(tier, bucket.get(pos, tier))
+            for prefix, bucket in buckets.items():
+                best = heapq.nsmallest(MAX_SUGGESTIONS, ((tier, pos) for pos, tier in bucket.items()))
+                top[prefix] = [pos for _, pos in best]
+            # Only keys under a hot prefix can fall under a hot prefix one character longer.
+            keyed = [k for k in keyed if k[0][:length] in hot]
+            length += 1
+        return top
+
+    def _prefix_range(self, keys: list[tuple[str, int]], prefix: str) -> Iterable[int]:
+        i = bisect_left(keys, (prefix, -1))
+        while i < len(keys) and keys[i][0].startswith(prefix):
+            yield keys[i][1]
+            i += 1
+
+    def _substring_matches(self, needle: str) -> Iterable[int]:
+        # Scan the rarest trigram's postings and verify each candidate directly;
+        # cheaper than intersecting the larger lists.
+        postings = [self._grams.get(g) for g in _trigrams(needle)]
+        if not postings or any(p is None for p in postings):
+            return
+        for pos in min(postings, key=len):
+            if needle in self._haystacks[pos]:
+                yield pos
+
+    def suggest(self, query: str, limit: int = 10) -> list["CityEntry"]:
+        limit = max(1, min(MAX_SUGGESTIONS, limit))
+        needle = " ".join(fold_text(query).split())
+        if not needle:
+            return []
+
+        precomputed = self._top.get(needle)
+        if len(needle) < _SHORT_QUERY or (precomputed is not None and len(precomputed) >= limit):
+            return [self.entries[p] for p in (precomputed or [])[:limit]]
+
+        found: list[int] = []
+        seen: set[int] = set()
+        for candidates in (self._prefix_range(self._names, needle), self._prefix_range(self._words, needle)):
+            for pos in _take(candidates, limit - len(found), seen):
+                found.append(pos)
+                seen.add(pos)
+            if len(found) >= limit:
+                return [self.entries[p] for p in found]
+
+        # Substring matches come out in rank order, so the first hits are the best.
+        for pos in self._substring_matches(needle):
+            if pos not in seen:
+                found.append(pos)
+                seen.add(pos)
+                if len(found) >= limit:
+                    break
+        return [self.entries[p] for p in found]
+
+
+def suggest_cities_stmt(query: str, limit: int):
+    """SQL fallback for suggestions, served by the pg_trgm GIN indexes on name and country.
+
+    Case-insensitive but, unlike the in-memory index, not accent-insensitive.
+    """
+    limit = max(1, min(MAX_SUGGESTIONS, limit))
+    escaped = query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    contains = f"%{escaped}%"
+    starts = f"{escaped}%"
+    return (
+        select(City.id, City.name, City.country, City.region, City.cost_index, City.popularity, City.image_url)
+        .where(or_(City.name.ilike(contains, escape="\\"), City.country.ilike(contains, escape="\\")))
+        .order_by(
+            case((City.name.ilike(starts, escape="\\"), 0), else_=1),
+            City.popularity.desc().nullslast(),
+            City.name.asc(),
+        )
+        .limit(limit)
+    )
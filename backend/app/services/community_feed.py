@@ -0,0 +1,113 @@
+import threading
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.community_post import CommunityPost
+from app.models.user import User
+from app.utils.cache import LRUCache
+from app.utils.pagination import decode_cursor, encode_cursor
+
+MAX_PAGE_SIZE = 100
+
+_settings = get_settings()
+# Holds a single entry: the newest MAX_PAGE_SIZE posts, which every first page is cut from.
+feed_snapshot_cache = LRUCache(
+    "community_feed",
+    max_entries=1,
+    ttl_seconds=_settings.community_feed_snapshot_ttl_seconds,
+)
+_lock = threading.Lock()
+# Bumped on every post write so a snapshot read before the write is never stored after it.
+_generation = 0
+
+
+def _feed_stmt(limit: int, before: tuple[datetime, int] | None = None):
+    # Only the author columns the response needs, not the whole users row.
+    stmt = (
+        select(
+            CommunityPost.id,
+            CommunityPost.content,
+            CommunityPost.created_at,
+            User.id.label("user_id"),
+            User.name,
+            User.photo_url,
+        )
+        .join(User, User.id == CommunityPost.user_id)
+        .order_by(CommunityPost.created_at.desc(), CommunityPost.id.desc())
+        .limit(limit)
+    )
+    if before is not None:
+        created_at, post_id = before
+        # Spelled out rather than as a row comparison so the planner can range-scan
+        # ix_community_posts_created_at on the leading column.
+        stmt = stmt.where(
+            CommunityPost.created_at <= created_at,
+            or_(
+                CommunityPost.created_at < created_at,
+                and_(CommunityPost.created_at == created_at, CommunityPost.id < post_id),
+            ),
+        )
+    return stmt
+
+
+def _post_fields(row) -> dict:
+    return {
+        "id": row.id,
+        "content": row.content,
+        "created_at": row.created_at,
+        "user": {"id": row.user_id, "name": row.name, "photo_url": row.photo_url},
+    }
+
+
+def _page(posts: list[dict], limit: int, has_more: bool) -> tuple[list[dict], str | None]:
+    if len(posts) > limit or (has_more and len(posts) == limit):
+        last = posts[limit - 1]
+        return posts[:limit], encode_cursor(last["created_at"].isoformat(), last["id"])
+    return posts, None
+
+
+def _load_snapshot(db: Session) -> tuple[list[dict], bool]:
+    with _lock:
+        generation = _generation
+    rows = db.execute(_feed_stmt(MAX_PAGE_SIZE + 1)).all()
+    snapshot = ([_post_fields(r) for r in rows[:MAX_PAGE_SIZE]], len(rows) > MAX_PAGE_SIZE)
+    with _lock:
+        if generation == _generation:
+            feed_snapshot_cache.set("first_page", snapshot)
+    return snapshot
+
+
+def refresh_feed_snapshot(db: Session) -> None:
+    """Drop the first-page snapshot after a post is created or deleted and rebuild it."""
+    global _generation
+
+    with _lock:
+        _generation += 1
+        feed_snapshot_cache.clear()
+    _load_snapshot(db)
+
+
+def list_feed(db: Session, limit: int, cursor: str | None) -> tuple[list[dict], str | None]:
+    """One page of the feed, newest first, plus the cursor for the page after it."""
+    limit = max(1, min(MAX_PAGE_SIZE, limit))
+    if cursor is None:
+        snapshot = feed_snapshot_cache.get("first_page") or _load_snapshot(db)
+        posts, has_more = snapshot
+        return _page(posts, limit, has_more)
+
+    created_at, post_id = decode_cursor(cursor, 2)
+    try:
+        before = (datetime.fromisoformat(created_at), int(post_id))
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from e
+    rows = db.execute(_feed_stmt(limit + 1, before)).all()
+    return _page([_post_fields(r) for r in rows], limit, False)
+
+
+def get_feed_post(db: Session, post_id: int) -> dict | None:
+    row = db.execute(_feed_stmt(1).where(CommunityPost.id == post_id)).first()
+    return _post_fields(row) if row else None
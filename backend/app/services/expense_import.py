@@ -0,0 +1,95 @@
+import csv
+from decimal import Decimal
+from itertools import islice
+from typing import IO, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.expense import Expense
+from app.schemas.expense import ExpenseCreate
+from app.services.budget_service import adjust_budget_rollup
+
+# Rows validated and inserted per round trip (one multi-row INSERT each).
+IMPORT_CHUNK_ROWS = 1000
+# Errors beyond this many are counted but not listed.
+MAX_REPORTED_ERRORS = 100
+
+IMPORT_COLUMNS = tuple(ExpenseCreate.model_fields)
+
+
+def _numbered_rows(reader: csv.DictReader) -> Iterator[tuple[int, dict]]:
+    while True:
+        # The failing record starts on the line after the last one read in full.
+        start = reader.line_num + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # The reader can't resynchronise after this, so the file is rejected at that line.
+            raise csv.Error(f"line {start}: {e}") from e
+        yield reader.line_num, row
+
+
+def _row_errors(e: ValidationError) -> list[str]:
+    return [f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in e.errors()]
+
+
+def import_expenses(db: Session, trip_id: int, text: IO[str], *, atomic: bool = False) -> dict:
+    """Load CSV expenses into a trip in the caller's transaction.
+
+    The header must include ``category``; ``expense_date``, ``amount`` and
+    ``notes`` are optional and other columns (e.g. ``id`` from an export) are
+    ignored. Rows are read, validated against ``ExpenseCreate`` and inserted
+    ``IMPORT_CHUNK_ROWS`` at a time, so the file is never held in memory.
+    Invalid rows are reported by line and skipped; with ``atomic`` any invalid
+    row means nothing is inserted. The trip's budget rollup is adjusted by the
+    imported total. Raises ValueError for a file without a usable header and
+    csv.Error, prefixed with the line, for one the csv module can't parse.
+    """
+    reader = csv.DictReader(text)
+    try:
+        fieldnames = reader.fieldnames
+    except csv.Error as e:
+        raise csv.Error(f"line 1: {e}") from e
+    header = [name.strip() for name in fieldnames or []]
+    if "category" not in header:
+        raise ValueError("CSV header must include a category column")
+    reader.fieldnames = header
+
+    imported = failed = 0
+    total = Decimal(0)
+    errors: list[dict] = []
+    rows = _numbered_rows(reader)
+    while chunk := list(islice(rows, IMPORT_CHUNK_ROWS)):
+        valid: list[dict] = []
+        for line, row in chunk:
+            # Empty cells fall back to the schema defaults, like omitted JSON fields.
+            fields = {k: v.strip() for k in IMPORT_COLUMNS if isinstance(v := row.get(k), str) and v.strip()}
+            try:
+                expense = ExpenseCreate.model_validate(fields)
+            except ValidationError as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"line": line, "errors": _row_errors(e)})
+                continue
+            valid.append({"trip_id": trip_id, **expense.model_dump()})
+            total += Decimal(str(expense.amount))
+
+        if valid and not (atomic and failed):
+            db.execute(insert(Expense), valid)
+            imported += len(valid)
+
+    if atomic and failed:
+        imported, total = 0, Decimal(0)
+    elif imported:
+        adjust_budget_rollup(db, trip_id, other=total)
+
+    return {
+        "imported": imported,
+        "failed": failed,
+        "total_amount": float(total),
+        "errors": errors,
+    }
@@ -0,0 +1,152 @@
+from decimal import Decimal
+from itertools import accumulate, groupby
+from operator import itemgetter
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.expense import Expense
+from app.models.trip import Trip
+from app.utils.response_utils import to_float, to_float_or_none
+
+# Burn-down figures compare expenses only with Trip.budget; stop and activity
+# costs are in the budget summary instead.
+
+
+def _grouped_columns():
+    return (
+        Expense.expense_date.label("day"),
+        Expense.category,
+        func.sum(Expense.amount).label("total"),
+        func.count().label("count"),
+    )
+
+
+def _day_order():
+    return Expense.expense_date.asc().nullslast(), Expense.category.asc()
+
+
+def _trip_summary_stmt(trip_id: int):
+    """Category x day totals for one trip, with category, day and running totals as window functions.
+
+    Reads the trip's rows in ``ix_expenses_trip_date`` order. Undated expenses
+    sort last, so the running total over dated days never includes them.
+    """
+    group_total = func.sum(Expense.amount)
+    return (
+        select(
+            *_grouped_columns(),
+            func.sum(group_total).over(partition_by=Expense.category).label("category_total"),
+            func.sum(func.count()).over(partition_by=Expense.category).label("category_count"),
+            func.sum(group_total).over(partition_by=Expense.expense_date).label("day_total"),
+            func.sum(func.count()).over(partition_by=Expense.expense_date).label("day_count"),
+            func.sum(group_total).over(order_by=Expense.expense_date.asc().nullslast()).label("cumulative"),
+        )
+        .where(Expense.trip_id == trip_id)
+        .group_by(Expense.expense_date, Expense.category)
+        .order_by(*_day_order())
+    )
+
+
+def _burn_down_day(day, total, count, cumulative, budget: Decimal | None) -> dict:
+    return {
+        "date": day,
+        "total": to_float(total),
+        "count": int(count),
+        "cumulative": to_float(cumulative),
+        "remaining": to_float(budget - Decimal(str(cumulative))) if budget is not None else None,
+    }
+
+
+def _summary(trip_ids, budget, by_category, by_day, by_category_day, undated) -> dict:
+    by_category.sort(key=lambda c: (-c["total"], c["category"]))
+    over = next((d["date"] for d in by_day if d["remaining"] is not None and d["remaining"] < 0), None)
+    return {
+        "trip_ids": trip_ids,
+        "budget": to_float_or_none(budget),
+        "total": round(sum(c["total"] for c in by_category), 2),
+        "count": sum(c["count"] for c in by_category),
+        "by_category": by_category,
+        "by_day": by_day,
+        "by_category_day": by_category_day,
+        "undated": undated,
+        "over_budget_on": over,
+    }
+
+
+def trip_expense_summary(db: Session, trip: Trip) -> dict:
+    """Expense totals for one trip by category, by day and by category x day, plus a daily burn-down."""
+    budget = Decimal(str(trip.budget)) if trip.budget is not None else None
+    by_category: dict[str, dict] = {}
+    by_day: list[dict] = []
+    by_category_day: list[dict] = []
+    undated = {"total": 0.0, "count": 0}
+
+    for r in db.execute(_trip_summary_stmt(trip.id)):
+        if r.category not in by_category:
+            by_category[r.category] = {
+                "category": r.category,
+                "total": to_float(r.category_total),
+                "count": int(r.category_count),
+            }
+        if r.day is None:
+            undated = {"total": to_float(r.day_total), "count": int(r.day_count)}
+            continue
+        by_category_day.append({"date": r.day, "category": r.category, "total": to_float(r.total), "count": r.count})
+        if not by_day or by_day[-1]["date"] != r.day:
+            by_day.append(_burn_down_day(r.day, r.day_total, r.day_count, r.cumulative, budget))
+
+    return _summary([trip.id], budget, list(by_category.values()), by_day, by_category_day, undated)
+
+
+def expense_summary_for_trips(db: Session, trips: list[Trip]) -> dict:
+    """The same summary over several trips at once, against their combined budget.
+
+    SQL only groups by category x day; the day and category totals and the
+    running total are folded from those rows with groupby/accumulate.
+    """
+    trip_ids = [t.id for t in trips]
+    budgets = [Decimal(str(t.budget)) for t in trips if t.budget is not None]
+    budget = sum(budgets, Decimal(0)) if budgets else None
+    rows = []
+    if trip_ids:
+        stmt = (
+            select(*_grouped_columns())
+            .where(Expense.trip_id.in_(trip_ids))
+            .group_by(Expense.expense_date, Expense.category)
+            .order_by(*_day_order())
+        )
+        rows = [(r.day, r.category, Decimal(str(r.total)), r.count) for r in db.execute(stmt)]
+
+    dated = [r for r in rows if r[0] is not None]
+    undated_rows = [r for r in rows if r[0] is None]
+
+    days = [(day, list(group)) for day, group in groupby(dated, key=itemgetter(0))]
+    day_totals = [sum(map(itemgetter(2), group)) for _, group in days]
+    day_counts = [sum(map(itemgetter(3), group)) for _, group in days]
+    by_day = [
+        _burn_down_day(day, total, count, cumulative, budget)
+        for (day, _), total, count, cumulative in zip(days, day_totals, day_counts, accumulate(day_totals))
+    ]
+
+    categories = groupby(sorted(rows, key=itemgetter(1)), key=itemgetter(1))
+    by_category = []
+    for category, group in categories:
+        group = list(group)
+        by_category.append(
+            {
+                "category": category,
+                "total": to_float(sum(map(itemgetter(2), group))),
+                "count": sum(map(itemgetter(3), group)),
+            }
+        )
+
+    by_category_day = [
+        {"date": day, "category": category, "total": to_float(total), "count": count}
+        for day, category, total, count in dated
+    ]
+    undated = {
+        "total": to_float(sum(map(itemgetter(2), undated_rows))),
+        "count": sum(map(itemgetter(3), undated_rows)),
+    }
+    return _summary(trip_ids, budget, by_category, by_day, by_category_day, undated)
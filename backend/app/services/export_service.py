@@ -0,0 +1,334 @@
+import csv
+import io
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator, Literal, Sequence
+
+from sqlalchemy import Row, Select, select
+
+from app.core.database import read_session
+from app.models.activity import Activity
+from app.models.expense import Expense
+from app.models.stop import Stop
+from app.models.trip import Trip
+from app.services.city_catalog import city_label
+from app.services.stop_order import stop_order_by
+from app.utils.response_utils import to_float, to_float_or_none
+from app.utils.serialization import dumps
+
+ExportFormat = Literal["csv", "ndjson", "ics"]
+
+# Rows per fetch from the server-side cursor, and per chunk written to the client.
+EXPORT_BATCH_ROWS = 1000
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "ics": "text/calendar; charset=utf-8",
+}
+
+TRIP_CSV_COLUMNS = [
+    "stop_id",
+    "city",
+    "country",
+    "stop_start_date",
+    "stop_end_date",
+    "stay_cost",
+    "transport_cost",
+    "meals_cost",
+    "activity_id",
+    "activity_name",
+    "activity_type",
+    "start_time",
+    "duration_minutes",
+    "activity_cost",
+    "activity_notes",
+]
+EXPENSE_CSV_COLUMNS = ["id", "expense_date", "category", "amount", "notes"]
+
+
+def _stream(stmt: Select, primary: bool) -> Iterator[Sequence[Row]]:
+    """Batches of ``stmt``'s rows, read through a server-side cursor.
+
+    The request's own session is closed before a streamed body is sent, so
+    each export opens (and closes) its own.
+    """
+    db = read_session(primary)
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_ROWS))
+        yield from result.partitions()
+    finally:
+        db.close()
+
+
+def _itinerary_stmt(trip_id: int) -> Select:
+    # One row per activity, plus one for each stop without any.
+    return (
+        select(
+            Stop.id.label("stop_id"),
+            Stop.city_id,
+            Stop.start_date,
+            Stop.end_date,
+            Stop.stay_cost,
+            Stop.transport_cost,
+            Stop.meals_cost,
+            Activity.id.label("activity_id"),
+            Activity.name,
+            Activity.type,
+            Activity.start_time,
+            Activity.duration_minutes,
+            Activity.cost,
+            Activity.notes,
+        )
+        .outerjoin(Activity, Activity.stop_id == Stop.id)
+        .where(Stop.trip_id == trip_id)
+        .order_by(*stop_order_by(), Activity.start_time.asc().nullslast(), Activity.id.asc())
+    )
+
+
+def _expenses_stmt(trip_id: int) -> Select:
+    return (
+        select(Expense.id, Expense.expense_date, Expense.category, Expense.amount, Expense.notes)
+        .where(Expense.trip_id == trip_id)
+        .order_by(Expense.expense_date.asc().nullslast(), Expense.id.asc())
+    )
+
+
+# CSV
+
+
+# Text starting with one of these is read as a formula by spreadsheet apps.
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    # Decimals keep their exact text ("12.50"); csv writes them with str().
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(_CSV_FORMULA_PREFIXES):
+        # Only user text is escaped; numbers (including negative ones) and dates are not str.
+        return "'" + value
+    return value
+
+
+def _csv_chunks(header: list[str], batches: Iterable[Iterable[Sequence]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for batch in batches:
+        writer.writerows([_csv_value(v) for v in row] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # An empty export still gets its header row.
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _itinerary_csv_rows(batch: Sequence[Row]) -> Iterator[tuple]:
+    for r in batch:
+        city_name, city_country = city_label(r.city_id)
+        yield (
+            r.stop_id,
+            city_name,
+            city_country,
+            r.start_date,
+            r.end_date,
+            r.stay_cost,
+            r.transport_cost,
+            r.meals_cost,
+            r.activity_id,
+            r.name,
+            r.type,
+            r.start_time,
+            r.duration_minutes,
+            r.cost,
+            r.notes,
+        )
+
+
+# NDJSON
+
+
+def _stop_record(r: Row) -> dict:
+    city_name, city_country = city_label(r.city_id)
+    return {
+        "record": "stop",
+        "id": r.stop_id,
+        "city_id": r.city_id,
+        "city_name": city_name,
+        "city_country": city_country,
+        "start_date": r.start_date,
+        "end_date": r.end_date,
+        "stay_cost": to_float(r.stay_cost),
+        "transport_cost": to_float(r.transport_cost),
+        "meals_cost": to_float(r.meals_cost),
+    }
+
+
+def _activity_record(r: Row) -> dict:
+    return {
+        "record": "activity",
+        "id": r.activity_id,
+        "stop_id": r.stop_id,
+        "name": r.name,
+        "type": r.type,
+        "start_time": r.start_time,
+        "duration_minutes": r.duration_minutes,
+        "cost": to_float(r.cost),
+        "notes": r.notes,
+    }
+
+
+def _itinerary_ndjson(trip: dict, batches: Iterable[Sequence[Row]]) -> Iterator[bytes]:
+    yield dumps({"record": "trip", **trip}) + b"\n"
+    last_stop_id = None
+    for batch in batches:
+        lines = []
+        for r in batch:
+            if r.stop_id != last_stop_id:
+                lines.append(dumps(_stop_record(r)))
+                last_stop_id = r.stop_id
+            if r.activity_id is not None:
+                lines.append(dumps(_activity_record(r)))
+        yield b"\n".join(lines) + b"\n"
+
+
+def _expense_ndjson(batches: Iterable[Sequence[Row]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b"".join(
+            dumps(
+                {
+                    "id": r.id,
+                    "expense_date": r.expense_date,
+                    "category": r.category,
+                    "amount": to_float(r.amount),
+                    "notes": r.notes,
+                }
+            )
+            + b"\n"
+            for r in batch
+        )
+
+
+# iCalendar (RFC 5545)
+
+
+_ICS_ESCAPES = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n", "\r": None})
+
+
+def _ics_text(value: str) -> str:
+    return value.translate(_ICS_ESCAPES)
+
+
+def _ics_line(line: str) -> str:
+    # Content lines are folded at 75 octets; continuation lines start with a space.
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts, current, size, limit = [], "", 0, 75
+    for ch in line:
+        width = len(ch.encode("utf-8"))
+        if size + width > limit:
+            parts.append(current)
+            current, size, limit = "", 0, 74
+        current += ch
+        size += width
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_utc(value: datetime) -> str:
+    # Naive values are taken as UTC, as the database session returns them.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _ics_event(lines: list[str]) -> str:
+    return "".join(_ics_line(line) for line in ["BEGIN:VEVENT", *lines, "END:VEVENT"])
+
+
+def _itinerary_ics(trip: dict, batches: Iterable[Sequence[Row]]) -> Iterator[str]:
+    stamp = _ics_utc(datetime.now(timezone.utc))
+    yield "".join(
+        _ics_line(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//GlobeTrotter//Trip export//EN",
+            "CALSCALE:GREGORIAN",
+            f"X-WR-CALNAME:{_ics_text(trip['name'])}",
+        )
+    )
+    last_stop_id = None
+    for batch in batches:
+        events = []
+        for r in batch:
+            if r.stop_id != last_stop_id:
+                # The stay as an all-day event; DTEND is exclusive.
+                last_stop_id = r.stop_id
+                city_name, city_country = city_label(r.city_id)
+                place = ", ".join(p for p in (city_name, city_country) if p) or f"Stop {r.stop_id}"
+                events.append(
+                    _ics_event(
+                        [
+                            f"UID:stop-{r.stop_id}@globetrotter",
+                            f"DTSTAMP:{stamp}",
+                            f"DTSTART;VALUE=DATE:{r.start_date:%Y%m%d}",
+                            f"DTEND;VALUE=DATE:{r.end_date + timedelta(days=1):%Y%m%d}",
+                            f"SUMMARY:{_ics_text(place)}",
+                            f"LOCATION:{_ics_text(place)}",
+                            "TRANSP:TRANSPARENT",
+                        ]
+                    )
+                )
+            if r.activity_id is None or r.start_time is None:
+                continue
+            lines = [
+                f"UID:activity-{r.activity_id}@globetrotter",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{_ics_utc(r.start_time)}",
+            ]
+            if r.duration_minutes:
+                lines.append(f"DTEND:{_ics_utc(r.start_time + timedelta(minutes=r.duration_minutes))}")
+            lines.append(f"SUMMARY:{_ics_text(r.name)}")
+            if r.type:
+                lines.append(f"CATEGORIES:{_ics_text(r.type)}")
+            if r.notes:
+                lines.append(f"DESCRIPTION:{_ics_text(r.notes)}")
+            events.append(_ics_event(lines))
+        yield "".join(events)
+    yield _ics_line("END:VCALENDAR")
+
+
+def export_trip(trip: Trip, fmt: ExportFormat, *, primary: bool = False) -> Iterator[str | bytes]:
+    """The trip's stops and activities as CSV, NDJSON or iCalendar, one chunk per fetched batch.
+
+    ``trip`` must already be checked for ownership; only its plain columns
+    are used, so it can belong to a session that is closed by the time the
+    body streams. ``primary`` keeps the reads off replicas (read-your-writes).
+    """
+    batches = _stream(_itinerary_stmt(trip.id), primary)
+    if fmt == "csv":
+        return _csv_chunks(TRIP_CSV_COLUMNS, (_itinerary_csv_rows(batch) for batch in batches))
+    summary = {
+        "id": trip.id,
+        "name": trip.name,
+        "start_date": trip.start_date,
+        "end_date": trip.end_date,
+        "description": trip.description,
+        "budget": to_float_or_none(trip.budget),
+    }
+    if fmt == "ndjson":
+        return _itinerary_ndjson(summary, batches)
+    return _itinerary_ics(summary, batches)
+
+
+def export_expenses(trip_id: int, fmt: Literal["csv", "ndjson"], *, primary: bool = False) -> Iterator[str | bytes]:
+    """The trip's expenses in date order, as CSV or NDJSON."""
+    batches = _stream(_expenses_stmt(trip_id), primary)
+    if fmt == "csv":
+        return _csv_chunks(EXPENSE_CSV_COLUMNS, batches)
+    return _expense_ndjson(batches)
@@ -1,9 +1,29 @@
+import hashlib
 import secrets
+from typing import NamedTuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
+from app.core.config import get_settings
 from app.models.shared_trip import SharedTrip
 from app.models.trip import Trip
+from app.utils.cache import LRUCache
+
+
+class CachedPublicTrip(NamedTuple):
+    trip_id: int
+    body: bytes
+    etag: str
+
+
+_settings = get_settings()
+public_trip_cache = LRUCache(
+    "public_trips",
+    max_entries=_settings.public_cache_max_entries,
+    ttl_seconds=_settings.public_cache_ttl_seconds,
+)
 
 
 def get_or_create_share(db: Session, trip: Trip) -> SharedTrip:
@@ -14,6 +34,7 @@ def get_or_create_share(db: Session, trip: Trip) -> SharedTrip:
     db.add(share)
     db.commit()
     db.refresh(share)
+    invalidate_public_trip(trip.id)
     return share
 
 
@@ -22,3 +43,31 @@ def get_public_trip_by_share_id(db: Session, share_id: str) -> Trip | None:
     if not share:
         return None
     return db.get(Trip, share.trip_id)
+
+
+async def get_public_trip_by_share_id_async(db: AsyncSession, share_id: str) -> Trip | None:
+    # Lazy loads aren't available on AsyncSession, so stops are loaded up front.
+    stmt = (
+        select(Trip)
+        .join(SharedTrip, SharedTrip.trip_id == Trip.id)
+        .where(SharedTrip.share_id == share_id, SharedTrip.is_public.is_(True))
+        .options(selectinload(Trip.stops))
+    )
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
+def get_cached_public_trip(share_id: str) -> CachedPublicTrip | None:
+    return public_trip_cache.get(share_id)
+
+
+def cache_public_trip(share_id: str, trip_id: int, body: bytes) -> CachedPublicTrip:
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    entry = CachedPublicTrip(trip_id=trip_id, body=body, etag=etag)
+    public_trip_cache.set(share_id, entry)
+    return entry
+
+
+def invalidate_public_trip(trip_id: int) -> None:
+    """Drop the cached public response for a trip after it, its stops or its share change."""
+    # Entries carry their trip id, so no separate (unbounded) trip -> share map is kept.
+    public_trip_cache.pop_matching(lambda entry: entry.trip_id == trip_id)
@@ -0,0 +1,112 @@
+from sqlalchemy import Row, func, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models.stop import Stop
+from app.models.trip import Trip
+from app.services.share_service import invalidate_public_trip
+
+# Stops are ordered by sparse integer keys: appends leave this much room after
+# the last stop, and a move takes the midpoint of its new neighbours' keys, so
+# it only ever rewrites the moved row.
+ORDER_GAP = 1024
+# Once a move leaves less room than this next to the stop, the trip is
+# renumbered in the background before the gap runs out completely.
+MIN_GAP = 8
+
+
+def stop_order_by():
+    """ORDER BY for a trip's stops, shared by listings and moves.
+
+    Clients may still set ``order_index`` themselves, so keys can tie; ties
+    fall back to start date and then id.
+    """
+    return Stop.order_index.asc(), Stop.start_date.asc(), Stop.id.asc()
+
+
+def lock_trip_stops(db: Session, trip_id: int) -> None:
+    """Serialise stop ordering changes for one trip until the caller commits.
+
+    Takes a row lock on the trip, so two concurrent appends can't both read the
+    same max key. (A no-op on SQLite, which locks the whole database anyway.)
+    """
+    db.execute(select(Trip.id).where(Trip.id == trip_id).with_for_update())
+
+
+def next_order_key(db: Session, trip_id: int) -> int:
+    """Key for a stop appended to the end of the trip; call after lock_trip_stops."""
+    last = db.execute(select(func.max(Stop.order_index)).where(Stop.trip_id == trip_id)).scalar()
+    return ORDER_GAP if last is None else last + ORDER_GAP
+
+
+def _next_key(db: Session, stop: Stop, after: Row | None) -> int | None:
+    # Key of the stop right after the insertion point in stop_order_by() order,
+    # ignoring the stop being moved. It can equal ``after``'s key when keys tie.
+    stmt = select(Stop.order_index).where(Stop.trip_id == stop.trip_id, Stop.id != stop.id)
+    if after is not None:
+        stmt = stmt.where(
+            tuple_(Stop.order_index, Stop.start_date, Stop.id) > tuple_(after.order_index, after.start_date, after.id)
+        )
+    return db.execute(stmt.order_by(*stop_order_by()).limit(1)).scalar()
+
+
+def rebalance_stop_order(db: Session, trip_id: int) -> None:
+    """Renumber a trip's stops ORDER_GAP apart, keeping their current order (caller commits)."""
+    ids = db.execute(select(Stop.id).where(Stop.trip_id == trip_id).order_by(*stop_order_by())).scalars().all()
+    if ids:
+        db.execute(update(Stop), [{"id": stop_id, "order_index": (i + 1) * ORDER_GAP} for i, stop_id in enumerate(ids)])
+
+
+def rebalance_stop_order_in_background(trip_id: int) -> None:
+    # Imported lazily so that importing this module never creates the engine.
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        lock_trip_stops(db, trip_id)
+        rebalance_stop_order(db, trip_id)
+        db.commit()
+    finally:
+        db.close()
+    # Public views render stops with their order keys, so drop them once the new keys are committed.
+    invalidate_public_trip(trip_id)
+
+
+def move_stop(db: Session, stop: Stop, after_id: int | None) -> bool:
+    """Place ``stop`` right after stop ``after_id`` (or first when None), updating only its key.
+
+    Returns True when the gaps around the new position are running low and the
+    caller should schedule ``rebalance_stop_order_in_background``. Raises
+    LookupError if ``after_id`` isn't a stop of the same trip.
+    """
+    if after_id == stop.id:
+        raise ValueError("A stop can't be moved after itself")
+    lock_trip_stops(db, stop.trip_id)
+
+    for attempt in range(2):
+        after = after_key = None
+        if after_id is not None:
+            after = db.execute(
+                select(Stop.id, Stop.order_index, Stop.start_date).where(
+                    Stop.id == after_id, Stop.trip_id == stop.trip_id
+                )
+            ).first()
+            if after is None:
+                raise LookupError("Stop not found")
+            after_key = after.order_index
+        before_key = _next_key(db, stop, after)
+
+        if after_key is None and before_key is None:
+            return False
+        if after_key is None:
+            stop.order_index = before_key - ORDER_GAP
+            return False
+        if before_key is None:
+            stop.order_index = after_key + ORDER_GAP
+            return False
+        if before_key - after_key >= 2:
+            stop.order_index = (after_key + before_key) // 2
+            return min(stop.order_index - after_key, before_key - stop.order_index) < MIN_GAP
+        # No room left between the neighbours (or their keys tie): renumber now and try again.
+        rebalance_stop_order(db, stop.trip_id)
+        db.refresh(stop)
+    raise RuntimeError("Stop order keys exhausted after rebalancing")
@@ -1,13 +1,269 @@
-from collections import defaultdict
-from datetime import date
+import hashlib
+import itertools
+from datetime import date, datetime, time, timedelta, timezone
+from typing import NamedTuple
 
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Integer,
+    Numeric,
+    String,
+    and_,
+    cast,
+    func,
+    literal,
+    null,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.replicas import on_user_write
+from app.models.activity import Activity
+from app.models.expense import Expense
+from app.models.stop import Stop
 from app.models.trip import Trip
+from app.services.city_catalog import city_label
+from app.utils.cache import LRUCache
+from app.utils.response_utils import to_float
+from app.utils.serialization import dumps
+
+MAX_CALENDAR_DAYS = 366
+
+
+class CachedCalendar(NamedTuple):
+    body: bytes
+    etag: str
+
+
+_settings = get_settings()
+calendar_cache = LRUCache(
+    "calendar",
+    max_entries=_settings.calendar_cache_max_entries,
+    ttl_seconds=_settings.calendar_cache_ttl_seconds,
+)
+# Replaced on every committed write by the user; part of the cache key, so old
+# windows simply stop being looked up and age out. Values come from one counter
+# and never repeat, so a generation that expires or is evicted is replaced by a
+# fresh one rather than reset to a value an old cache key may still carry.
+_generations = LRUCache(
+    "calendar_generations",
+    max_entries=_settings.calendar_cache_max_entries,
+    ttl_seconds=_settings.calendar_cache_ttl_seconds,
+)
+_next_generation = itertools.count(1)
+
+
+def _generation(user_id: int) -> int:
+    generation = _generations.get(user_id)
+    if generation is None:
+        generation = next(_next_generation)
+        _generations.set(user_id, generation)
+    return generation
+
+
+@on_user_write
+def invalidate_calendar(user_id: int) -> None:
+    _generations.set(user_id, next(_next_generation))
+
+
+def _typed_null(type_):
+    # Postgres resolves UNION column types pairwise, so bare NULLs in the
+    # first branches would be taken as text.
+    return cast(null(), type_)
+
+
+def calendar_stmt(user_id: int, start: date, end: date):
+    """One UNION ALL over the user's trips, bucketed by day between ``start`` and ``end``.
+
+    Rows are ``kind`` "trip" / "stop" (one per day the trip or stop covers,
+    via a range join on the window's days), "activity" (by the date of
+    ``start_time`` in UTC) and "spend" (expenses summed per trip and ``expense_date``).
+    """
+    starts_at = datetime.combine(start, time.min)
+    # One row per day of the window (capped at MAX_CALENDAR_DAYS). Timestamp
+    # bounds pick the timestamp (not timestamptz) overload, so the cast back to
+    # date doesn't depend on the session time zone.
+    series = (
+        func.generate_series(starts_at, datetime.combine(end, time.min), text("interval '1 day'"))
+        .table_valued("day")
+        .render_derived()
+    )
+    days = select(cast(series.c.day, Date).label("day")).cte("calendar_days")
+
+    trips = (
+        select(
+            days.c.day,
+            literal("trip", String).label("kind"),
+            Trip.id.label("trip_id"),
+            Trip.name.label("trip_name"),
+            _typed_null(Integer).label("stop_id"),
+            _typed_null(Integer).label("city_id"),
+            _typed_null(String).label("name"),
+            _typed_null(String).label("type"),
+            _typed_null(DateTime(timezone=True)).label("start_time"),
+            _typed_null(Integer).label("duration_minutes"),
+            _typed_null(Numeric(14, 2)).label("amount"),
+            Trip.start_date,
+            Trip.end_date,
+            Trip.id.label("item_id"),
+        )
+        .select_from(days)
+        .join(Trip, and_(Trip.start_date <= days.c.day, Trip.end_date >= days.c.day))
+        .where(Trip.user_id == user_id, Trip.start_date <= end, Trip.end_date >= start)
+    )
+    stops = (
+        select(
+            days.c.day,
+            literal("stop", String),
+            Trip.id,
+            Trip.name,
+            Stop.id,
+            Stop.city_id,
+            _typed_null(String),
+            _typed_null(String),
+            _typed_null(DateTime(timezone=True)),
+            _typed_null(Integer),
+            _typed_null(Numeric(14, 2)),
+            Stop.start_date,
+            Stop.end_date,
+            Stop.id,
+        )
+        .select_from(days)
+        .join(Stop, and_(Stop.start_date <= days.c.day, Stop.end_date >= days.c.day))
+        .join(Trip, Trip.id == Stop.trip_id)
+        .where(Trip.user_id == user_id, Stop.start_date <= end, Stop.end_date >= start)
+    )
+    # Served by ix_activities_stop_start: a range scan per stop of the user's trips.
+    # Days are UTC days, spelled out so neither the bounds nor the bucketing depend
+    # on the session time zone.
+    activities = (
+        select(
+            func.date(func.timezone("UTC", Activity.start_time), type_=Date),
+            literal("activity", String),
+            Trip.id,
+            Trip.name,
+            Stop.id,
+            Stop.city_id,
+            Activity.name,
+            Activity.type,
+            Activity.start_time,
+            Activity.duration_minutes,
+            Activity.cost,
+            _typed_null(Date),
+            _typed_null(Date),
+            Activity.id,
+        )
+        .join(Stop, Stop.id == Activity.stop_id)
+        .join(Trip, Trip.id == Stop.trip_id)
+        .where(
+            Trip.user_id == user_id,
+            Activity.start_time >= datetime.combine(start, time.min, timezone.utc),
+            Activity.start_time < datetime.combine(end + timedelta(days=1), time.min, timezone.utc),
+        )
+    )
+    spend = (
+        select(
+            Expense.expense_date,
+            literal("spend", String),
+            Trip.id,
+            Trip.name,
+            _typed_null(Integer),
+            _typed_null(Integer),
+            _typed_null(String),
+            _typed_null(String),
+            _typed_null(DateTime(timezone=True)),
+            _typed_null(Integer),
+            func.sum(Expense.amount),
+            _typed_null(Date),
+            _typed_null(Date),
+            Trip.id,
+        )
+        .join(Trip, Trip.id == Expense.trip_id)
+        .where(Trip.user_id == user_id, Expense.expense_date >= start, Expense.expense_date <= end)
+        .group_by(Expense.expense_date, Trip.id, Trip.name)
+    )
+
+    rows = union_all(trips, stops, activities, spend).subquery("calendar_rows")
+    return select(rows).order_by(rows.c.day, rows.c.kind, rows.c.start_time, rows.c.item_id)
+
+
+def _empty_day(day: date) -> dict:
+    return {
+        "date": day,
+        "trips": [],
+        "stops": [],
+        "activities": [],
+        "spend": {"activities": 0.0, "expenses": 0.0, "total": 0.0},
+    }
+
+
+def build_calendar(db: Session, user_id: int, start: date, end: date) -> dict:
+    """Per-day trips, stop occupancy, activities and spend; days with nothing on them are left out."""
+    by_day: dict[date, dict] = {}
+    for row in db.execute(calendar_stmt(user_id, start, end)):
+        day = by_day.get(row.day)
+        if day is None:
+            day = by_day[row.day] = _empty_day(row.day)
+
+        if row.kind == "trip":
+            day["trips"].append(
+                {"trip_id": row.trip_id, "name": row.trip_name, "start_date": row.start_date, "end_date": row.end_date}
+            )
+        elif row.kind == "stop":
+            city_name, city_country = city_label(row.city_id)
+            day["stops"].append(
+                {
+                    "stop_id": row.stop_id,
+                    "trip_id": row.trip_id,
+                    "trip_name": row.trip_name,
+                    "city_id": row.city_id,
+                    "city_name": city_name,
+                    "city_country": city_country,
+                    "start_date": row.start_date,
+                    "end_date": row.end_date,
+                }
+            )
+        elif row.kind == "activity":
+            cost = to_float(row.amount)
+            day["activities"].append(
+                {
+                    "id": row.item_id,
+                    "stop_id": row.stop_id,
+                    "trip_id": row.trip_id,
+                    "trip_name": row.trip_name,
+                    "name": row.name,
+                    "type": row.type,
+                    "start_time": row.start_time,
+                    "duration_minutes": row.duration_minutes,
+                    "cost": cost,
+                }
+            )
+            day["spend"]["activities"] += cost
+        else:
+            day["spend"]["expenses"] += to_float(row.amount)
+
+    for day in by_day.values():
+        spend = day["spend"]
+        spend["activities"] = round(spend["activities"], 2)
+        spend["expenses"] = round(spend["expenses"], 2)
+        spend["total"] = round(spend["activities"] + spend["expenses"], 2)
+
+    return {"start": start, "end": end, "days": list(by_day.values())}
+
 
+def get_calendar(db: Session, user_id: int, start: date, end: date) -> CachedCalendar:
+    """The encoded calendar for one user and window, from the per-worker cache when possible."""
+    key = (user_id, start, end, _generation(user_id))
+    cached = calendar_cache.get(key)
+    if cached is not None:
+        return cached
 
-def group_activities_by_day(trip: Trip) -> dict[date, list]:
-    by_day: dict[date, list] = defaultdict(list)
-    for stop in trip.stops:
-        for act in stop.activities:
-            if act.start_time:
-                by_day[act.start_time.date()].append(act)
-    return dict(by_day)
+    body = dumps(build_calendar(db, user_id, start, end))
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    entry = CachedCalendar(body=body, etag=etag)
+    calendar_cache.set(key, entry)
+    return entry
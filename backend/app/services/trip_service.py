@@ -1,20 +1,64 @@
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.activity import Activity
+from app.models.expense import Expense
 from app.models.stop import Stop
 from app.models.trip import Trip
+from app.services.budget_service import rebuild_budget_rollup
 
 
-def list_trips_for_user(db: Session, user_id: int) -> list[tuple[Trip, int]]:
-    stmt = (
+def _list_trips_stmt(user_id: int):
+    return (
         select(Trip, func.count(Stop.id).label("destination_count"))
         .outerjoin(Stop, Stop.trip_id == Trip.id)
         .where(Trip.user_id == user_id)
         .group_by(Trip.id)
         .order_by(Trip.created_at.desc())
     )
-    return list(db.execute(stmt).all())
+
+
+def _trips_for_user_stmt(user_id: int, trip_ids: list[int] | None):
+    stmt = select(Trip).where(Trip.user_id == user_id).order_by(Trip.created_at.desc())
+    if trip_ids is not None:
+        stmt = stmt.where(Trip.id.in_(trip_ids))
+    return stmt
+
+
+def _full_trip_stmt(user_id: int, trip_id: int):
+    # Stops and activities are loaded with one statement each, so the number of
+    # queries does not grow with the size of the itinerary. City names come from
+    # the in-process city catalog.
+    return (
+        select(Trip)
+        .where(Trip.id == trip_id, Trip.user_id == user_id)
+        .options(selectinload(Trip.stops).selectinload(Stop.activities))
+    )
+
+
+def _trip_expenses_stmt(trip_id: int):
+    return (
+        select(Expense)
+        .where(Expense.trip_id == trip_id)
+        .order_by(Expense.expense_date.asc().nullslast(), Expense.id.asc())
+    )
+
+
+def list_trips_for_user(db: Session, user_id: int) -> list[tuple[Trip, int]]:
+    return list(db.execute(_list_trips_stmt(user_id)).all())
+
+
+async def list_trips_for_user_async(db: AsyncSession, user_id: int) -> list[tuple[Trip, int]]:
+    return list((await db.execute(_list_trips_stmt(user_id))).all())
+
+
+def get_trips_for_user(db: Session, user_id: int, trip_ids: list[int] | None = None) -> list[Trip]:
+    return list(db.execute(_trips_for_user_stmt(user_id, trip_ids)).scalars())
+
+
+async def get_trips_for_user_async(db: AsyncSession, user_id: int, trip_ids: list[int] | None = None) -> list[Trip]:
+    return list((await db.execute(_trips_for_user_stmt(user_id, trip_ids))).scalars())
 
 
 def get_trip_for_user(db: Session, user_id: int, trip_id: int) -> Trip | None:
@@ -24,6 +68,29 @@ def get_trip_for_user(db: Session, user_id: int, trip_id: int) -> Trip | None:
     return trip
 
 
+async def get_trip_for_user_async(db: AsyncSession, user_id: int, trip_id: int) -> Trip | None:
+    trip = await db.get(Trip, trip_id)
+    if not trip or trip.user_id != user_id:
+        return None
+    return trip
+
+
+def get_full_trip_for_user(db: Session, user_id: int, trip_id: int) -> tuple[Trip, list[Expense]] | None:
+    trip = db.execute(_full_trip_stmt(user_id, trip_id)).scalar_one_or_none()
+    if not trip:
+        return None
+    return trip, list(db.execute(_trip_expenses_stmt(trip.id)).scalars())
+
+
+async def get_full_trip_for_user_async(
+    db: AsyncSession, user_id: int, trip_id: int
+) -> tuple[Trip, list[Expense]] | None:
+    trip = (await db.execute(_full_trip_stmt(user_id, trip_id))).scalar_one_or_none()
+    if not trip:
+        return None
+    return trip, list((await db.execute(_trip_expenses_stmt(trip.id))).scalars())
+
+
 def delete_trip_for_user(db: Session, user_id: int, trip_id: int) -> bool:
     trip = get_trip_for_user(db, user_id, trip_id)
     if not trip:
@@ -34,6 +101,12 @@ def delete_trip_for_user(db: Session, user_id: int, trip_id: int) -> bool:
 
 
 def copy_trip(db: Session, *, source_trip: Trip, new_user_id: int) -> Trip:
+    """Copy a trip with its stops and activities in a fixed number of statements.
+
+    Source stops are read once and inserted as one multi-row ``INSERT ...
+    RETURNING`` whose ids come back in parameter order, which gives an explicit
+    old -> new stop id map; activities are then read and inserted against it.
+    """
     new_trip = Trip(
         user_id=new_user_id,
         name=f"Copy of {source_trip.name}",
@@ -46,33 +119,32 @@ def copy_trip(db: Session, *, source_trip: Trip, new_user_id: int) -> Trip:
     db.add(new_trip)
     db.flush()
 
-    for stop in source_trip.stops:
-        new_stop = Stop(
-            trip_id=new_trip.id,
-            city_id=stop.city_id,
-            start_date=stop.start_date,
-            end_date=stop.end_date,
-            order_index=stop.order_index,
-            stay_cost=stop.stay_cost,
-            transport_cost=stop.transport_cost,
-            meals_cost=stop.meals_cost,
-        )
-        db.add(new_stop)
-        db.flush()
-
-        for act in stop.activities:
-            db.add(
-                Activity(
-                    stop_id=new_stop.id,
-                    name=act.name,
-                    type=act.type,
-                    start_time=act.start_time,
-                    duration_minutes=act.duration_minutes,
-                    cost=act.cost,
-                    notes=act.notes,
-                )
+    stop_columns = ["city_id", "start_date", "end_date", "order_index", "stay_cost", "transport_cost", "meals_cost"]
+    source_stops = db.execute(
+        select(Stop.id, *(getattr(Stop, c) for c in stop_columns))
+        .where(Stop.trip_id == source_trip.id)
+        .order_by(Stop.id)
+    ).all()
+    if source_stops:
+        new_ids = db.scalars(
+            insert(Stop).returning(Stop.id, sort_by_parameter_order=True),
+            [{"trip_id": new_trip.id, **dict(zip(stop_columns, row[1:]))} for row in source_stops],
+        ).all()
+        stop_map = {row.id: new_id for row, new_id in zip(source_stops, new_ids)}
+
+        activity_columns = ["name", "type", "start_time", "duration_minutes", "cost", "notes"]
+        activities = db.execute(
+            select(Activity.stop_id, *(getattr(Activity, c) for c in activity_columns))
+            .where(Activity.stop_id.in_(list(stop_map)))
+            .order_by(Activity.id)
+        ).all()
+        if activities:
+            db.execute(
+                insert(Activity),
+                [{"stop_id": stop_map[row.stop_id], **dict(zip(activity_columns, row[1:]))} for row in activities],
             )
 
+    rebuild_budget_rollup(db, new_trip.id)
     db.commit()
     db.refresh(new_trip)
     return new_trip
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+# Called with the event ("hit", "miss", "set", "eviction" or "remove") and the
+# cache's size afterwards; used to export cache metrics.
+CacheObserver = Callable[[str, int], None]
+
+_caches: list["LRUCache"] = []
+_observer_factory: Callable[["LRUCache"], CacheObserver] | None = None
+
+
+def registered_caches() -> list["LRUCache"]:
+    """Every LRUCache created in this process, in creation order."""
+    return list(_caches)
+
+
+def observe_caches(factory: Callable[["LRUCache"], CacheObserver]) -> None:
+    """Attach ``factory(cache)`` as the observer of every existing and future cache."""
+    global _observer_factory
+
+    _observer_factory = factory
+    for cache in _caches:
+        cache.observer = factory(cache)
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL and hit/miss counters.
+
+    Each worker process has its own instance, so anything cached here may be
+    up to ``ttl_seconds`` stale in other workers after an invalidation.
+    """
+
+    def __init__(self, name: str, *, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.observer: CacheObserver | None = _observer_factory(self) if _observer_factory else None
+        _caches.append(self)
+
+    def _notify(self, event: str, size: int, times: int = 1) -> None:
+        observer = self.observer
+        if observer is not None:
+            for _ in range(times):
+                observer(event, size)
+
+    def get(self, key: Hashable, *, is_valid: Callable[[Any], bool] | None = None) -> Any | None:
+        """Return the cached value, or None if it is missing, expired or rejected by ``is_valid``."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] <= now or (is_valid is not None and not is_valid(item[1])):
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                hit, size = False, len(self._data)
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                hit, size = True, len(self._data)
+        self._notify("hit" if hit else "miss", size)
+        return item[1] if hit else None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        evicted = 0
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+            self.evictions += evicted
+            size = len(self._data)
+        self._notify("set", size)
+        self._notify("eviction", size, evicted)
+
+    def pop(self, key: Hashable) -> Any | None:
+        with self._lock:
+            item = self._data.pop(key, None)
+            size = len(self._data)
+        if item:
+            self._notify("remove", size)
+        return item[1] if item else None
+
+    def pop_matching(self, predicate: Callable[[Any], bool]) -> list[Hashable]:
+        """Remove every entry whose value satisfies ``predicate``; returns their keys. O(size)."""
+        with self._lock:
+            keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+            size = len(self._data)
+        self._notify("remove", size, len(keys))
+        return keys
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+        self._notify("remove", 0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._data)
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
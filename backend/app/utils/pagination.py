@@ -0,0 +1,32 @@
+import base64
+import json
+from decimal import Decimal, InvalidOperation
+
+from fastapi import HTTPException, status
+
+# Response header carrying the cursor for the next page of a keyset-paginated list.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    """Opaque cursor for the sort key of the last row on a page (Decimals are kept exact)."""
+    raw = json.dumps([str(v) if isinstance(v, Decimal) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def cursor_decimal(value) -> Decimal:
+    try:
+        return Decimal(str(value))
+    except InvalidOperation as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from e
@@ -1,5 +1,86 @@
+from app.services.city_catalog import CityCatalog, city_label
+
+
 def to_float(value) -> float:
     try:
         return float(value)
     except Exception:
         return 0.0
+
+
+def to_float_or_none(value) -> float | None:
+    return None if value is None else to_float(value)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return "*" in candidates or any(t.removeprefix("W/") == etag for t in candidates)
+
+
+def trip_fields(trip) -> dict:
+    return {
+        "id": trip.id,
+        "name": trip.name,
+        "start_date": trip.start_date,
+        "end_date": trip.end_date,
+        "description": trip.description,
+        "cover_photo_url": trip.cover_photo_url,
+        "budget": to_float_or_none(trip.budget),
+    }
+
+
+def stop_fields(stop, catalog: CityCatalog | None = None) -> dict:
+    # City name/country come from the in-process catalog, not a per-stop query.
+    city_name, city_country = city_label(stop.city_id, catalog)
+    return {
+        "id": stop.id,
+        "trip_id": stop.trip_id,
+        "city_id": stop.city_id,
+        "start_date": stop.start_date,
+        "end_date": stop.end_date,
+        "order_index": stop.order_index,
+        "stay_cost": to_float(stop.stay_cost),
+        "transport_cost": to_float(stop.transport_cost),
+        "meals_cost": to_float(stop.meals_cost),
+        "city_name": city_name,
+        "city_country": city_country,
+    }
+
+
+def activity_fields(activity) -> dict:
+    return {
+        "id": activity.id,
+        "stop_id": activity.stop_id,
+        "name": activity.name,
+        "type": activity.type,
+        "start_time": activity.start_time,
+        "duration_minutes": activity.duration_minutes,
+        "cost": to_float(activity.cost),
+        "notes": activity.notes,
+    }
+
+
+def expense_fields(expense) -> dict:
+    return {
+        "id": expense.id,
+        "trip_id": expense.trip_id,
+        "expense_date": expense.expense_date,
+        "category": expense.category,
+        "amount": to_float(expense.amount),
+        "notes": expense.notes,
+    }
+
+
+def attraction_fields(attraction) -> dict:
+    return {
+        "id": attraction.id,
+        "city_id": attraction.city_id,
+        "name": attraction.name,
+        "type": attraction.type,
+        "description": attraction.description,
+        "cost": to_float(attraction.cost),
+        "rating": to_float(attraction.rating),
+        "image_url": attraction.image_url,
+    }
@@ -0,0 +1,46 @@
+from decimal import Decimal
+from typing import Any, Mapping
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.utils.response_utils import to_float
+
+# Decimal policy: Numeric columns leave the API as JSON numbers. The field
+# mappers in response_utils convert them with to_float / to_float_or_none; a
+# Decimal that still reaches the encoder is converted the same way, never as a
+# string.
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return to_float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    # OPT_UTC_Z writes UTC datetimes as "...Z", the same as Pydantic does.
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; the app's default response class."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(
+    content: Any, *, headers: Mapping[str, str] | None = None, status_code: int = 200
+) -> FastJSONResponse:
+    """Return already-shaped data as-is.
+
+    FastAPI skips ``response_model`` validation for a returned Response, so
+    list endpoints build plain dicts with the response_utils mappers and hand
+    them straight to the encoder. The ``response_model`` on the route still
+    documents the shape, and the mappers must produce exactly its fields.
+    """
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
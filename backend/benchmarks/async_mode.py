@@ -0,0 +1,136 @@
+"""Compare throughput of the sync and async request paths at high concurrency.
+
+Start the API once per mode against the same database, then point this at it:
+
+    ASYNC_DB=false uvicorn app.main:app --port 8000 --workers 1
+    python -m benchmarks.async_mode --label sync --email me@example.com --password secret --out sync.json
+
+    ASYNC_DB=true uvicorn app.main:app --port 8000 --workers 1
+    python -m benchmarks.async_mode --label async --email me@example.com --password secret --out async.json
+
+    python -m benchmarks.async_mode --compare sync.json async.json
+
+Requires ``httpx`` (``pip install httpx``).
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = ["/api/trips", "/api/trips/{trip_id}/full", "/api/trips/{trip_id}/stops", "/api/cities/top"]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    res = await client.post("/api/auth/login", json={"email": email, "password": password})
+    res.raise_for_status()
+    return res.json()["access_token"]
+
+
+async def _first_trip_id(client: httpx.AsyncClient) -> int:
+    res = await client.get("/api/trips")
+    res.raise_for_status()
+    trips = res.json()
+    if not trips:
+        raise SystemExit("The benchmark user has no trips; create at least one first.")
+    return trips[0]["id"]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        token = await _login(client, args.email, args.password)
+        client.headers["Authorization"] = f"Bearer {token}"
+        trip_id = args.trip_id or await _first_trip_id(client)
+        paths = [p.format(trip_id=trip_id) for p in DEFAULT_PATHS]
+
+        latencies: dict[str, list[float]] = {p: [] for p in paths}
+        errors = 0
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for i in range(args.requests):
+            queue.put_nowait(paths[i % len(paths)])
+
+        async def worker() -> None:
+            nonlocal errors
+            while True:
+                try:
+                    path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    res = await client.get(path)
+                    if res.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies[path].append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [v for values in latencies.values() for v in values]
+    return {
+        "label": args.label,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": args.requests / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(all_latencies, 50),
+        "p95_ms": _percentile(all_latencies, 95),
+        "p99_ms": _percentile(all_latencies, 99),
+        "per_path_p50_ms": {p: statistics.median(v) if v else 0.0 for p, v in latencies.items()},
+    }
+
+
+def compare(paths: list[str]) -> None:
+    results = [json.loads(open(p, encoding="utf-8").read()) for p in paths]
+    print(f"{'label':<12}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for r in results:
+        print(
+            f"{r['label']:<12}{r['throughput_rps']:>10.1f}{r['p50_ms']:>10.1f}"
+            f"{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['errors']:>8}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--trip-id", type=int)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--out")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT_JSON")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.compare)
+        return
+    if not args.email or not args.password:
+        parser.error("--email and --password are required to run the benchmark")
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Build the in-memory city suggestion index over a generated catalog and time lookups.
+
+No database is needed; the catalog is synthetic but deterministic:
+
+    python -m benchmarks.city_suggest --cities 200000 --queries 20000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from app.services.city_catalog import CityCatalog, CityEntry
+
+_SYLLABLES = [
+    "sa", "o", "pau", "lo", "ber", "lin", "ma", "drid", "to", "kyo", "na", "ri", "mün", "chen", "zü", "rich",
+    "kra", "ków", "a", "ce", "ré", "ville", "san", "ta", "fe", "por", "to", "li", "ma", "quí", "to", "gö",
+    "te", "borg", "ham", "burg", "ví", "na", "del", "mar", "new", "port", "ka", "ra", "chi", "hel", "sin", "ki",
+]
+_REGIONS = ["Europe", "Asia", "Africa", "North America", "South America", "Oceania"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def generate_cities(count: int, seed: int = 7) -> list[CityEntry]:
+    rng = random.Random(seed)
+    countries = [_word(rng) for _ in range(200)]
+    cities = []
+    for i in range(count):
+        name = _word(rng) if rng.random() < 0.8 else f"{_word(rng)} {_word(rng)}"
+        popularity = rng.randint(1, 100) if rng.random() < 0.9 else None
+        cities.append(CityEntry(i + 1, name, rng.choice(countries), rng.choice(_REGIONS), None, popularity, None))
+    return cities
+
+
+def generate_queries(cities: list[CityEntry], count: int, seed: int = 11) -> list[str]:
+    """A typeahead mix: short and long name prefixes, mid-word fragments and misses."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        city = rng.choice(cities)
+        kind = rng.random()
+        if kind < 0.5:
+            queries.append(city.name[: rng.randint(1, len(city.name))].lower())
+        elif kind < 0.8:
+            start = rng.randint(0, max(0, len(city.name) - 3))
+            queries.append(city.name[start : start + rng.randint(3, 5)])
+        elif kind < 0.95:
+            queries.append(city.country[: rng.randint(2, 5)])
+        else:
+            queries.append(f"zq{rng.randint(0, 999)}x")
+    return queries
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cities", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    cities = generate_cities(args.cities)
+    queries = generate_queries(cities, args.queries)
+
+    started = time.perf_counter()
+    index = CityCatalog(cities).suggest_index
+    build_s = time.perf_counter() - started
+
+    timings = []
+    empty = 0
+    for q in queries:
+        t0 = time.perf_counter()
+        found = index.suggest(q, args.limit)
+        timings.append((time.perf_counter() - t0) * 1000)
+        empty += not found
+
+    print(f"cities={args.cities} queries={args.queries} build={build_s:.2f}s")
+    print(
+        f"latency ms: mean={statistics.fmean(timings):.3f} p50={_percentile(timings, 50):.3f} "
+        f"p99={_percentile(timings, 99):.3f} max={max(timings):.3f} empty={empty}"
+    )
+
+
+if __name__ == "__main__":
+    main()
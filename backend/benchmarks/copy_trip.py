@@ -0,0 +1,114 @@
+"""Time ``copy_trip`` and count its SQL statements for trips of different sizes.
+
+Runs against the database in ``DATABASE_URL`` and cleans up after itself:
+
+    python -m benchmarks.copy_trip --stops 10 100 1000 --activities-per-stop 10
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import delete, event, insert, select
+
+from app.core.database import SessionLocal, engine
+from app.models.activity import Activity
+from app.models.city import City
+from app.models.stop import Stop
+from app.models.trip import Trip
+from app.models.user import User
+from app.services.budget_service import rebuild_budget_rollup
+from app.services.trip_service import copy_trip
+
+
+def _make_trip(db, user_id: int, city_id: int, stops: int, activities_per_stop: int) -> Trip:
+    start = date(2026, 1, 1)
+    trip = Trip(user_id=user_id, name=f"Benchmark {stops}", start_date=start, end_date=start + timedelta(days=stops))
+    db.add(trip)
+    db.flush()
+    stop_ids = db.execute(
+        insert(Stop).returning(Stop.id, sort_by_parameter_order=True),
+        [
+            {
+                "trip_id": trip.id,
+                "city_id": city_id,
+                "start_date": start + timedelta(days=i),
+                "end_date": start + timedelta(days=i + 1),
+                "order_index": i,
+                "stay_cost": 80,
+                "transport_cost": 20,
+                "meals_cost": 30,
+            }
+            for i in range(stops)
+        ],
+    ).scalars().all()
+    if activities_per_stop:
+        db.execute(
+            insert(Activity),
+            [
+                {"stop_id": stop_id, "name": f"Activity {j}", "type": "Culture", "cost": 15}
+                for stop_id in stop_ids
+                for j in range(activities_per_stop)
+            ],
+        )
+    rebuild_budget_rollup(db, trip.id)
+    db.commit()
+    return trip
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stops", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--activities-per-stop", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    db = SessionLocal()
+    user = User(email=f"copy-bench-{time.time_ns()}@example.com", password_hash="-")
+    db.add(user)
+    city_id = db.execute(select(City.id).limit(1)).scalar()
+    created_city = None
+    if city_id is None:
+        created_city = City(name="Benchmark City", country="Nowhere")
+        db.add(created_city)
+        db.flush()
+        city_id = created_city.id
+    db.commit()
+
+    try:
+        print(f"{'stops':>6} {'activities':>10} {'statements':>10} {'p50 ms':>9} {'max ms':>9}")
+        for stops in args.stops:
+            source = _make_trip(db, user.id, city_id, stops, args.activities_per_stop)
+            timings = []
+            for _ in range(args.repeat):
+                statements = 0
+                event.listen(engine, "before_cursor_execute", count)
+                started = time.perf_counter()
+                try:
+                    copy_trip(db, source_trip=source, new_user_id=user.id)
+                finally:
+                    event.remove(engine, "before_cursor_execute", count)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(
+                f"{stops:>6} {stops * args.activities_per_stop:>10} {statements:>10} "
+                f"{statistics.median(timings):>9.1f} {max(timings):>9.1f}"
+            )
+    finally:
+        db.rollback()
+        db.execute(delete(Trip).where(Trip.user_id == user.id))
+        db.execute(delete(User).where(User.id == user.id))
+        if created_city is not None:
+            db.execute(delete(City).where(City.id == created_city.id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
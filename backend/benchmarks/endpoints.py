@@ -0,0 +1,292 @@
+"""Per-endpoint latency, throughput and SQL statement counts on a synthetic workload.
+
+Builds a reproducible dataset (see ``benchmarks.workload``) in the database from
+``DATABASE_URL``, then drives the real application from ``create_app()``
+in-process, one endpoint at a time, at a fixed concurrency:
+
+    python -m benchmarks.endpoints --seed 42 --users 200 --concurrency 32 --requests 2000 --out before.json
+    python -m benchmarks.endpoints --seed 42 --users 200 --concurrency 32 --requests 2000 --out after.json
+    python -m benchmarks.endpoints --compare before.json after.json
+
+The seeded ``cities`` (and ``attractions``) must already be loaded. Requests go
+through ``httpx.ASGITransport``, so latencies include routing, validation,
+serialization and the database, but no sockets; use ``benchmarks.async_mode``
+against a running server for network-level numbers. Benchmark data is removed
+afterwards unless ``--keep-data`` is given.
+
+Requires ``httpx`` (``pip install httpx``).
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import random
+import subprocess
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import event
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal, async_engine, engine
+from app.core.security import create_access_token
+from app.main import create_app
+from benchmarks.workload import Workload, WorkloadSize, build_workload, drop_workload
+
+# Each request gets a fresh one-element counter; the engine listener bumps
+# whatever counter is current. Threadpool work inherits the request's context,
+# so statements from sync handlers and dependencies are attributed correctly.
+_statements: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar("bench_statements", default=None)
+
+
+def _count_statement(*_) -> None:
+    counter = _statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _calendar_path(rng: random.Random, days: int) -> str:
+    # Workload trips start during 2026.
+    start = date(2026, 1, 1) + timedelta(days=rng.randint(0, 364))
+    return f"/api/calendar?start={start}&end={start + timedelta(days=days - 1)}"
+
+
+def _scenarios(workload: Workload) -> dict:
+    """Endpoint name -> function drawing a request path (and acting user) from ``rng``."""
+
+    def user(rng: random.Random) -> int:
+        return rng.choice(workload.user_ids)
+
+    def trip(rng: random.Random) -> tuple[int, int]:
+        while True:
+            user_id = user(rng)
+            if workload.trips_by_user[user_id]:
+                return user_id, rng.choice(workload.trips_by_user[user_id])
+
+    def stop(rng: random.Random) -> tuple[int, int]:
+        while True:
+            user_id, trip_id = trip(rng)
+            if workload.stops_by_trip.get(trip_id):
+                return user_id, rng.choice(workload.stops_by_trip[trip_id])
+
+    def with_trip(template: str):
+        def draw(rng):
+            user_id, trip_id = trip(rng)
+            return user_id, template.format(trip_id=trip_id)
+
+        return draw
+
+    def with_stop(template: str):
+        def draw(rng):
+            user_id, stop_id = stop(rng)
+            return user_id, template.format(stop_id=stop_id)
+
+        return draw
+
+    def as_user(path: str):
+        return lambda rng: (user(rng), path)
+
+    return {
+        "users.me": as_user("/api/users/me"),
+        "trips.list": as_user("/api/trips"),
+        "trips.get": with_trip("/api/trips/{trip_id}"),
+        "trips.full": with_trip("/api/trips/{trip_id}/full"),
+        "stops.list": with_trip("/api/trips/{trip_id}/stops"),
+        "activities.list": with_stop("/api/stops/{stop_id}/activities"),
+        "expenses.list": with_trip("/api/expenses/trips/{trip_id}"),
+        "expenses.summary": with_trip("/api/expenses/trips/{trip_id}/summary"),
+        "budget.trip": with_trip("/api/budget/trips/{trip_id}"),
+        "budget.trips": as_user("/api/budget/trips"),
+        "cities.top": as_user("/api/cities/top"),
+        "cities.list": as_user("/api/cities"),
+        "cities.suggest": lambda rng: (user(rng), f"/api/cities/suggest?q={rng.choice(workload.city_prefixes)}"),
+        "attractions.search": lambda rng: (user(rng), f"/api/attractions?city_id={rng.choice(workload.city_ids)}"),
+        "community.feed": as_user("/api/community/posts"),
+        "calendar.month": lambda rng: (user(rng), _calendar_path(rng, 42)),
+        "calendar.year": lambda rng: (user(rng), _calendar_path(rng, 366)),
+    }
+
+
+async def _run_endpoint(client: httpx.AsyncClient, requests: list[tuple[int, str]], tokens: dict, concurrency: int):
+    latencies: list[float] = []
+    statements: list[int] = []
+    errors = 0
+    queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+    for item in requests:
+        queue.put_nowait(item)
+
+    async def worker() -> None:
+        nonlocal errors
+        while True:
+            try:
+                user_id, path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            counter = [0]
+            token = _statements.set(counter)
+            started = time.perf_counter()
+            try:
+                res = await client.get(path, headers={"Authorization": f"Bearer {tokens[user_id]}"})
+                if res.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            finally:
+                _statements.reset(token)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statements.append(counter[0])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(requests),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": len(requests) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "sql_statements_mean": sum(statements) / len(statements) if statements else 0.0,
+        "sql_statements_max": max(statements, default=0),
+    }
+
+
+async def run(args: argparse.Namespace, workload: Workload) -> dict:
+    scenarios = _scenarios(workload)
+    selected = args.endpoints or list(scenarios)
+    unknown = sorted(set(selected) - set(scenarios))
+    if unknown:
+        raise SystemExit(f"Unknown endpoints: {', '.join(unknown)} (choose from {', '.join(scenarios)})")
+
+    tokens = {user_id: create_access_token(subject=str(user_id)) for user_id in workload.user_ids}
+    rng = random.Random(args.seed)
+    app = create_app()
+    transport = httpx.ASGITransport(app=app)
+
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    for e in engines:
+        event.listen(e, "before_cursor_execute", _count_statement)
+    results: dict[str, dict] = {}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            for name in selected:
+                draw = scenarios[name]
+                # Warm-up requests load caches (city catalog, principals) and pool
+                # connections; they are drawn from their own stream so the
+                # measured sequence doesn't depend on --warmup.
+                warm_rng = random.Random(f"{args.seed}:{name}:warmup")
+                await _run_endpoint(client, [draw(warm_rng) for _ in range(args.warmup)], tokens, args.concurrency)
+                measured = [draw(rng) for _ in range(args.requests)]
+                results[name] = await _run_endpoint(client, measured, tokens, args.concurrency)
+                r = results[name]
+                print(
+                    f"{name:<20}{r['throughput_rps']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+                    f"{r['p99_ms']:>10.1f}{r['sql_statements_mean']:>8.1f}{r['errors']:>8}"
+                )
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", _count_statement)
+
+    return {
+        "label": args.label,
+        "commit": _git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "seed": args.seed,
+        "async_db": get_settings().async_db,
+        "concurrency": args.concurrency,
+        "requests_per_endpoint": args.requests,
+        "dataset": {**vars(workload.size), **workload.counts()},
+        "endpoints": results,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(paths: list[str]) -> None:
+    results = [json.loads(open(p, encoding="utf-8").read()) for p in paths]
+    labels = [r.get("label") or r.get("commit") or p for r, p in zip(results, paths)]
+    names = list(dict.fromkeys(name for r in results for name in r["endpoints"]))
+
+    print(f"{'endpoint':<20}{'run':<14}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'sql':>8}{'errors':>8}")
+    for name in names:
+        for label, r in zip(labels, results):
+            e = r["endpoints"].get(name)
+            if e is None:
+                continue
+            print(
+                f"{name:<20}{label:<14}{e['throughput_rps']:>10.1f}{e['p50_ms']:>10.1f}{e['p95_ms']:>10.1f}"
+                f"{e['p99_ms']:>10.1f}{e['sql_statements_mean']:>8.1f}{e['errors']:>8}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = WorkloadSize()
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--trips-per-user", type=int, default=defaults.trips_per_user)
+    parser.add_argument("--stops-per-trip", type=int, default=defaults.stops_per_trip)
+    parser.add_argument("--activities-per-stop", type=int, default=defaults.activities_per_stop)
+    parser.add_argument("--expenses-per-trip", type=int, default=defaults.expenses_per_trip)
+    parser.add_argument("--posts-per-user", type=int, default=defaults.posts_per_user)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint")
+    parser.add_argument("--endpoints", nargs="+", metavar="NAME", help="only run these endpoints")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--out")
+    parser.add_argument("--keep-data", action="store_true", help="leave the synthetic dataset in the database")
+    parser.add_argument("--compare", nargs="+", metavar="RESULT_JSON")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.compare)
+        return
+
+    size = WorkloadSize(
+        users=args.users,
+        trips_per_user=args.trips_per_user,
+        stops_per_trip=args.stops_per_trip,
+        activities_per_stop=args.activities_per_stop,
+        expenses_per_trip=args.expenses_per_trip,
+        posts_per_user=args.posts_per_user,
+    )
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        workload = build_workload(db, seed=args.seed, size=size)
+        print(f"dataset {workload.counts()} built in {time.perf_counter() - started:.1f}s")
+        print(f"{'endpoint':<20}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'sql':>8}{'errors':>8}")
+        result = asyncio.run(run(args, workload))
+    finally:
+        if not args.keep_data:
+            db.rollback()
+            drop_workload(db)
+        db.close()
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
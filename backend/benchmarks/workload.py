@@ -0,0 +1,235 @@
+"""Synthetic users, trips, stops, activities and expenses for the endpoint benchmarks.
+
+Everything is drawn from ``random.Random(seed)``, so the same seed and sizes
+always produce the same dataset shape. Stops reference cities that are already
+in the database (run the seed loader first). Benchmark users are recognisable
+by their e-mail domain, which is how ``drop_workload`` finds them again.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.security import hash_password
+from app.models.activity import Activity
+from app.models.city import City
+from app.models.community_post import CommunityPost
+from app.models.expense import Expense
+from app.models.shared_trip import SharedTrip
+from app.models.stop import Stop
+from app.models.trip import Trip
+from app.models.trip_budget_rollup import TripBudgetRollup
+from app.models.user import User
+from app.services.budget_service import ROLLUP_FIELDS
+from app.services.stop_order import ORDER_GAP
+
+EMAIL_DOMAIN = "bench.example.com"
+PASSWORD = "benchmark"
+
+ACTIVITY_TYPES = ["Sightseeing", "Culture", "Food", "Leisure", "Nightlife", "Shopping"]
+EXPENSE_CATEGORIES = ["food", "transport", "lodging", "tickets", "shopping", "other"]
+
+# Rows per INSERT statement; keeps bind-parameter counts well under driver limits.
+_CHUNK = 2000
+
+
+@dataclass
+class WorkloadSize:
+    users: int = 100
+    trips_per_user: int = 10
+    stops_per_trip: int = 6
+    activities_per_stop: int = 3
+    expenses_per_trip: int = 8
+    posts_per_user: int = 2
+
+
+@dataclass
+class Workload:
+    """Ids of the generated rows, for building request paths."""
+
+    seed: int
+    size: WorkloadSize
+    user_ids: list[int] = field(default_factory=list)
+    trips_by_user: dict[int, list[int]] = field(default_factory=dict)
+    stops_by_trip: dict[int, list[int]] = field(default_factory=dict)
+    city_ids: list[int] = field(default_factory=list)
+    city_prefixes: list[str] = field(default_factory=list)
+
+    def counts(self) -> dict:
+        return {
+            "users": len(self.user_ids),
+            "trips": sum(len(t) for t in self.trips_by_user.values()),
+            "stops": sum(len(s) for s in self.stops_by_trip.values()),
+        }
+
+
+def _around(rng: random.Random, mean: int) -> int:
+    """A count spread around ``mean`` (half to one and a half times it)."""
+    if mean <= 0:
+        return 0
+    return rng.randint(max(1, mean // 2), max(1, mean * 3 // 2))
+
+
+def _money(rng: random.Random, low: int, high: int) -> Decimal:
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def _insert_returning_ids(db: Session, model, rows: list[dict]) -> list[int]:
+    ids: list[int] = []
+    for start in range(0, len(rows), _CHUNK):
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        ids.extend(db.execute(stmt, rows[start : start + _CHUNK]).scalars())
+    return ids
+
+
+def _insert(db: Session, model, rows: list[dict]) -> None:
+    for start in range(0, len(rows), _CHUNK):
+        db.execute(insert(model), rows[start : start + _CHUNK])
+
+
+def drop_workload(db: Session) -> int:
+    """Delete every benchmark user and everything they own; returns the number of users removed."""
+    users = select(User.id).where(User.email.like(f"%@{EMAIL_DOMAIN}"))
+    trips = select(Trip.id).where(Trip.user_id.in_(users))
+    stops = select(Stop.id).where(Stop.trip_id.in_(trips))
+    # Children first, so this doesn't depend on ON DELETE CASCADE being enforced.
+    db.execute(delete(Activity).where(Activity.stop_id.in_(stops)))
+    db.execute(delete(Stop).where(Stop.trip_id.in_(trips)))
+    db.execute(delete(Expense).where(Expense.trip_id.in_(trips)))
+    db.execute(delete(TripBudgetRollup).where(TripBudgetRollup.trip_id.in_(trips)))
+    db.execute(delete(SharedTrip).where(SharedTrip.trip_id.in_(trips)))
+    db.execute(delete(Trip).where(Trip.user_id.in_(users)))
+    db.execute(delete(CommunityPost).where(CommunityPost.user_id.in_(users)))
+    removed = db.execute(delete(User).where(User.email.like(f"%@{EMAIL_DOMAIN}"))).rowcount
+    db.commit()
+    return removed
+
+
+def build_workload(db: Session, *, seed: int, size: WorkloadSize) -> Workload:
+    """Insert a fresh synthetic dataset (dropping any previous one) and commit it."""
+    rng = random.Random(seed)
+    drop_workload(db)
+
+    cities = db.execute(select(City.id, City.name).order_by(City.id)).all()
+    if not cities:
+        raise SystemExit("No cities in the database; run `python -m app.seed.seed_runner` first.")
+    workload = Workload(seed=seed, size=size, city_ids=[c.id for c in cities])
+    workload.city_prefixes = sorted({c.name[:3] for c in cities if len(c.name) >= 3})
+
+    # One bcrypt hash shared by every user: hashing is the slow part of signup,
+    # not what these benchmarks measure.
+    password_hash = hash_password(PASSWORD)
+    workload.user_ids = _insert_returning_ids(
+        db,
+        User,
+        [
+            {"email": f"user{i}-{seed}@{EMAIL_DOMAIN}", "name": f"Bench User {i}", "password_hash": password_hash}
+            for i in range(size.users)
+        ],
+    )
+
+    trip_rows: list[dict] = []
+    for user_id in workload.user_ids:
+        for _ in range(_around(rng, size.trips_per_user)):
+            start = date(2026, 1, 1) + timedelta(days=rng.randint(0, 364))
+            trip_rows.append(
+                {
+                    "user_id": user_id,
+                    "name": f"Trip {len(trip_rows) + 1}",
+                    "start_date": start,
+                    "end_date": start,
+                    "budget": _money(rng, 500, 5000),
+                }
+            )
+
+    stop_rows: list[dict] = []
+    for trip in trip_rows:
+        day = trip["start_date"]
+        stops = []
+        for n in range(_around(rng, size.stops_per_trip)):
+            nights = rng.randint(1, 4)
+            stops.append(
+                {
+                    "city_id": rng.choice(workload.city_ids),
+                    "start_date": day,
+                    "end_date": day + timedelta(days=nights),
+                    "order_index": (n + 1) * ORDER_GAP,
+                    "stay_cost": _money(rng, 40, 250) * nights,
+                    "transport_cost": _money(rng, 0, 300),
+                    "meals_cost": _money(rng, 20, 80) * nights,
+                }
+            )
+            day += timedelta(days=nights)
+        trip["end_date"] = day
+        trip["_stops"] = stops
+
+    trip_ids = _insert_returning_ids(db, Trip, [{k: v for k, v in t.items() if k != "_stops"} for t in trip_rows])
+    for user_id in workload.user_ids:
+        workload.trips_by_user[user_id] = []
+    for trip_id, trip in zip(trip_ids, trip_rows):
+        workload.trips_by_user[trip["user_id"]].append(trip_id)
+        for stop in trip["_stops"]:
+            stop["trip_id"] = trip_id
+            stop_rows.append(stop)
+
+    stop_ids = _insert_returning_ids(db, Stop, stop_rows)
+    totals = {trip_id: dict.fromkeys(ROLLUP_FIELDS, Decimal(0)) for trip_id in trip_ids}
+    activity_rows: list[dict] = []
+    for stop_id, stop in zip(stop_ids, stop_rows):
+        workload.stops_by_trip.setdefault(stop["trip_id"], []).append(stop_id)
+        trip_totals = totals[stop["trip_id"]]
+        trip_totals["transport"] += stop["transport_cost"]
+        trip_totals["stay"] += stop["stay_cost"]
+        trip_totals["meals"] += stop["meals_cost"]
+        for _ in range(_around(rng, size.activities_per_stop)):
+            day = stop["start_date"] + timedelta(days=rng.randint(0, (stop["end_date"] - stop["start_date"]).days))
+            cost = _money(rng, 0, 120)
+            trip_totals["activities"] += cost
+            activity_rows.append(
+                {
+                    "stop_id": stop_id,
+                    "name": f"Activity {len(activity_rows) + 1}",
+                    "type": rng.choice(ACTIVITY_TYPES),
+                    "start_time": datetime.combine(day, time(rng.randint(8, 21))),
+                    "duration_minutes": rng.choice([30, 60, 90, 120, 180]),
+                    "cost": cost,
+                }
+            )
+    _insert(db, Activity, activity_rows)
+
+    expense_rows: list[dict] = []
+    for trip_id, trip in zip(trip_ids, trip_rows):
+        span = (trip["end_date"] - trip["start_date"]).days
+        for _ in range(_around(rng, size.expenses_per_trip)):
+            amount = _money(rng, 2, 150)
+            totals[trip_id]["other"] += amount
+            expense_rows.append(
+                {
+                    "trip_id": trip_id,
+                    "expense_date": trip["start_date"] + timedelta(days=rng.randint(0, span)),
+                    "category": rng.choice(EXPENSE_CATEGORIES),
+                    "amount": amount,
+                }
+            )
+    _insert(db, Expense, expense_rows)
+
+    # Totals are known exactly here, so the rollups are written directly
+    # instead of being recomputed trip by trip.
+    _insert(db, TripBudgetRollup, [{"trip_id": trip_id, **values} for trip_id, values in totals.items()])
+
+    _insert(
+        db,
+        CommunityPost,
+        [
+            {"user_id": user_id, "content": f"Notes from trip {n + 1}"}
+            for user_id in workload.user_ids
+            for n in range(size.posts_per_user)
+        ],
+    )
+
+    db.commit()
+    return workload
@@ -1,4 +1,9 @@
 -- Drop tables in reverse dependency order to ensure clean reset
+DROP TABLE IF EXISTS analytics_refreshes CASCADE;
+DROP TABLE IF EXISTS analytics_trips_per_month CASCADE;
+DROP TABLE IF EXISTS analytics_activity_types CASCADE;
+DROP TABLE IF EXISTS analytics_city_visits CASCADE;
+DROP TABLE IF EXISTS trip_budget_rollups CASCADE;
 DROP TABLE IF EXISTS community_posts CASCADE;
 DROP TABLE IF EXISTS shared_trips CASCADE;
 DROP TABLE IF EXISTS expenses CASCADE;
@@ -40,6 +45,10 @@ CREATE TABLE cities (
     image_url VARCHAR
 );
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX ix_cities_name_trgm ON cities USING gin (name gin_trgm_ops);
+CREATE INDEX ix_cities_country_trgm ON cities USING gin (country gin_trgm_ops);
+
 -- 3. Attractions
 CREATE TABLE attractions (
     id SERIAL PRIMARY KEY,
@@ -52,7 +61,9 @@ CREATE TABLE attractions (
     image_url VARCHAR
 );
 
-CREATE INDEX ix_attractions_city_id ON attractions(city_id);
+CREATE INDEX ix_attractions_city_rating ON attractions (city_id, COALESCE(rating, -1) DESC, id DESC);
+CREATE INDEX ix_attractions_city_cost ON attractions (city_id, cost, id);
+CREATE INDEX ix_attractions_name_trgm ON attractions USING gin (name gin_trgm_ops);
 
 -- 4. Trips
 CREATE TABLE trips (
@@ -84,6 +95,7 @@ CREATE TABLE stops (
 
 CREATE INDEX ix_stops_trip_id ON stops(trip_id);
 CREATE INDEX ix_stops_city_id ON stops(city_id);
+CREATE INDEX ix_stops_trip_order ON stops(trip_id, order_index);
 
 -- 6. Activities
 CREATE TABLE activities (
@@ -97,7 +109,7 @@ CREATE TABLE activities (
     notes TEXT
 );
 
-CREATE INDEX ix_activities_stop_id ON activities(stop_id);
+CREATE INDEX ix_activities_stop_start ON activities(stop_id, start_time);
 
 -- 7. Expenses
 CREATE TABLE expenses (
@@ -133,3 +145,39 @@ CREATE TABLE community_posts (
 );
 
 CREATE INDEX ix_community_posts_user_id ON community_posts(user_id);
+CREATE INDEX ix_community_posts_created_at ON community_posts (created_at DESC);
+
+-- 10. Trip Budget Rollups
+CREATE TABLE trip_budget_rollups (
+    trip_id INTEGER PRIMARY KEY REFERENCES trips(id) ON DELETE CASCADE,
+    transport NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    stay NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    meals NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    activities NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    other NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- 11. Admin Analytics Rollups (rebuilt by scripts/rebuild_analytics_rollups.py)
+CREATE TABLE analytics_city_visits (
+    city_id INTEGER PRIMARY KEY REFERENCES cities(id) ON DELETE CASCADE,
+    stop_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE analytics_activity_types (
+    type VARCHAR PRIMARY KEY,
+    activity_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE analytics_trips_per_month (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    trip_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (year, month)
+);
+
+CREATE TABLE analytics_refreshes (
+    rollup VARCHAR PRIMARY KEY,
+    refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    duration_ms INTEGER NOT NULL DEFAULT 0
+);
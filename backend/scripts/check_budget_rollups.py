@@ -0,0 +1,30 @@
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.budget_service import check_budget_rollups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute trip budget rollups from source rows and report drift.")
+    parser.add_argument("--fix", action="store_true", help="overwrite drifted or missing rollups")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drift = check_budget_rollups(db, fix=args.fix)
+    finally:
+        db.close()
+
+    for entry in drift:
+        state = "missing" if entry["missing"] else "drift"
+        fields = ", ".join(f"{f}: {v['stored']} -> {v['actual']}" for f, v in entry["fields"].items())
+        print(f"trip {entry['trip_id']} [{state}] {fields}")
+
+    action = "Fixed" if args.fix else "Found"
+    print(f"{action} {len(drift)} trip(s) with inconsistent budget rollups.")
+    if drift and not args.fix:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
+import argparse
+import csv
 import json
-import random
 import os
+import random
+import time
 
 # Constants
 COUNTRIES = [
@@ -20,81 +23,113 @@ ATTRACTION_TYPES = ["Museum", "Park", "Restaurant", "Landmark", "Shopping", "Nat
 ADJECTIVES = ["Ancient", "Modern", "Beautiful", "Grand", "Hidden", "Famous", "Secret", "Royal", "Golden", "Blue"]
 NOUNS = ["Palace", "Garden", "Tower", "Bridge", "Square", "Market", "Temple", "Cathedral", "Castle", "Forest"]
 
-def generate_cities():
-    cities = []
-    city_id_counter = 1
-    
-    # Real cities
+CITY_FIELDS = ["id", "name", "country", "region", "cost_index", "popularity", "image_url"]
+ATTRACTION_FIELDS = ["id", "city_id", "name", "type", "description", "cost", "rating", "image_url"]
+
+
+def generate_cities(rng, count):
+    """Yield ``count`` cities: the real ones first, then generated ones."""
+    city_id = 0
     for country in COUNTRIES:
         for city_name in country["cities"]:
-            cities.append({
-                "id": city_id_counter,
+            city_id += 1
+            if city_id > count:
+                return
+            yield {
+                "id": city_id,
                 "name": city_name,
                 "country": country["name"],
                 "region": "Region of " + city_name,
-                "cost_index": random.randint(1, 5),
-                "popularity": random.randint(1, 100),
+                "cost_index": rng.randint(1, 5),
+                "popularity": rng.randint(1, 100),
                 "image_url": f"https://placehold.co/600x400?text={city_name}"
-            })
-            city_id_counter += 1
-            
-    # Generated cities to reach 1000
-    remaining = 1000 - len(cities)
-    for i in range(remaining):
-        country = random.choice(COUNTRIES)["name"]
-        name = f"{random.choice(ADJECTIVES)} City {i}"
-        cities.append({
-            "id": city_id_counter,
+            }
+
+    # The running number keeps (name, country) unique at any size.
+    for i in range(count - city_id):
+        city_id += 1
+        name = f"{rng.choice(ADJECTIVES)} City {i}"
+        yield {
+            "id": city_id,
             "name": name,
-            "country": country,
-            "region": f"Region {random.randint(1, 20)}",
-            "cost_index": random.randint(1, 5),
-            "popularity": random.randint(1, 100),
+            "country": rng.choice(COUNTRIES)["name"],
+            "region": f"Region {rng.randint(1, 20)}",
+            "cost_index": rng.randint(1, 5),
+            "popularity": rng.randint(1, 100),
             "image_url": f"https://placehold.co/600x400?text={name.replace(' ', '+')}"
-        })
-        city_id_counter += 1
-        
-    return cities
-
-def generate_attractions(cities):
-    attractions = []
-    attraction_id_counter = 1
-    
-    for city in cities:
-        num_attractions = random.randint(5, 10)
-        for _ in range(num_attractions):
-            name = f"{random.choice(ADJECTIVES)} {random.choice(NOUNS)}"
-            attractions.append({
-                "id": attraction_id_counter,
-                "city_id": city["id"],
-                "name": name,
-                "type": random.choice(ATTRACTION_TYPES),
-                "description": f"A {random.choice(ADJECTIVES).lower()} place to visit in {city['name']}.",
-                "cost": round(random.uniform(0, 100), 2),
-                "rating": round(random.uniform(3.0, 5.0), 1),
-                "image_url": f"https://placehold.co/400x300?text={name.replace(' ', '+')}"
-            })
-            attraction_id_counter += 1
-            
-    return attractions
+        }
+
+
+def generate_attractions(rng, city, first_id, min_per_city, max_per_city):
+    for offset in range(rng.randint(min_per_city, max_per_city)):
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"
+        yield {
+            "id": first_id + offset,
+            "city_id": city["id"],
+            "name": name,
+            "type": rng.choice(ATTRACTION_TYPES),
+            "description": f"A {rng.choice(ADJECTIVES).lower()} place to visit in {city['name']}.",
+            "cost": round(rng.uniform(0, 100), 2),
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "image_url": f"https://placehold.co/400x300?text={name.replace(' ', '+')}"
+        }
+
+
+class _Writer:
+    """Streams records to ``<stem>.ndjson`` or ``<stem>.csv`` one line at a time."""
+
+    def __init__(self, path, fields, fmt):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.fmt = fmt
+        if fmt == "csv":
+            self.csv = csv.DictWriter(self.file, fieldnames=fields)
+            self.csv.writeheader()
+
+    def write(self, record):
+        if self.fmt == "csv":
+            self.csv.writerow(record)
+        else:
+            self.file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def close(self):
+        self.file.close()
+
 
 def main():
-    print("Generating cities...")
-    cities = generate_cities()
-    
-    print("Generating attractions...")
-    attractions = generate_attractions(cities)
-    
-    output_dir = os.path.join(os.path.dirname(__file__), "../app/seed")
-    os.makedirs(output_dir, exist_ok=True)
-    
-    with open(os.path.join(output_dir, "cities.json"), "w") as f:
-        json.dump(cities, f, indent=2)
-        
-    with open(os.path.join(output_dir, "attractions.json"), "w") as f:
-        json.dump(attractions, f, indent=2)
-        
-    print(f"Generated {len(cities)} cities and {len(attractions)} attractions.")
+    parser = argparse.ArgumentParser(description="Generate a deterministic city and attraction catalog for seeding.")
+    parser.add_argument("--cities", type=int, default=1000)
+    parser.add_argument("--min-attractions", type=int, default=5, help="per city")
+    parser.add_argument("--max-attractions", type=int, default=10, help="per city")
+    parser.add_argument("--seed", type=int, default=42, help="same seed and sizes give the same catalog")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(__file__), "../app/seed"))
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    rng = random.Random(args.seed)
+    cities_out = _Writer(os.path.join(args.out, f"cities.{args.format}"), CITY_FIELDS, args.format)
+    attractions_out = _Writer(os.path.join(args.out, f"attractions.{args.format}"), ATTRACTION_FIELDS, args.format)
+
+    started = time.perf_counter()
+    city_count = attraction_count = 0
+    try:
+        for city in generate_cities(rng, args.cities):
+            cities_out.write(city)
+            city_count += 1
+            for attraction in generate_attractions(
+                rng, city, attraction_count + 1, args.min_attractions, args.max_attractions
+            ):
+                attractions_out.write(attraction)
+                attraction_count += 1
+            if city_count % 100_000 == 0:
+                print(f"  {city_count:,} cities, {attraction_count:,} attractions", flush=True)
+    finally:
+        cities_out.close()
+        attractions_out.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Generated {city_count:,} cities and {attraction_count:,} attractions in {elapsed:.1f}s.")
+
 
 if __name__ == "__main__":
     main()
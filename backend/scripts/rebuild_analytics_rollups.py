@@ -0,0 +1,31 @@
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.analytics_service import refresh_analytics_rollups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute the admin analytics rollups from the source tables.")
+    parser.add_argument(
+        "--if-older-than",
+        type=int,
+        metavar="SECONDS",
+        help="skip the rebuild if every rollup was refreshed more recently than this",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        timings = refresh_analytics_rollups(db, min_interval_seconds=args.if_older_than)
+    finally:
+        db.close()
+
+    if timings is None:
+        print("Analytics rollups are fresh; nothing to do.")
+        return
+    for name, ms in timings.items():
+        print(f"{name}: rebuilt in {ms} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+from datetime import date
+
+import pytest
+
+# Settings are read at import time, so the database is chosen before any app
+# import: a throwaway SQLite file, or TEST_DATABASE_URL (a disposable Postgres
+# database; every table is dropped after each test).
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("ANALYTICS_REFRESH_INTERVAL_SECONDS", "0")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables; tables and in-process caches are dropped afterwards."""
+    from app.core.database import Base, SessionLocal, engine
+    from app.services.city_catalog import invalidate_city_catalog
+    from app.utils.cache import registered_caches
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+        invalidate_city_catalog()
+        for cache in registered_caches():
+            cache.clear()
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.main import create_app
+
+    return create_app()
+
+
+@pytest.fixture
+def client(app, db):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def cities(db):
+    from app.models.city import City
+
+    paris = City(name="Paris", country="France", region="Europe", popularity=90)
+    tokyo = City(name="Tokyo", country="Japan", region="Asia", popularity=80)
+    db.add_all([paris, tokyo])
+    db.commit()
+    return paris, tokyo
+
+
+def signup(client, email: str) -> dict:
+    """Sign a new user up; returns the Authorization header for them."""
+    response = client.post("/api/auth/signup", json={"email": email, "password": "secret1"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def auth(client):
+    return signup(client, "owner@example.com")
+
+
+@pytest.fixture
+def trip(client, auth, cities):
+    """A trip of the ``auth`` user with two stops (Paris, then Tokyo)."""
+    trip = client.post(
+        "/api/trips",
+        json={"name": "Spring", "start_date": "2026-01-01", "end_date": "2026-01-05", "budget": 1000},
+        headers=auth,
+    ).json()
+    for city, start, end in ((cities[0], date(2026, 1, 1), date(2026, 1, 2)), (cities[1], date(2026, 1, 3), date(2026, 1, 5))):
+        client.post(
+            f"/api/trips/{trip['id']}/stops",
+            json={"city_id": city.id, "start_date": start.isoformat(), "end_date": end.isoformat(), "stay_cost": 100},
+            headers=auth,
+        )
+    return trip
@@ -0,0 +1,64 @@
+import pytest
+
+from app.models.attraction import Attraction
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture
+def attractions(db, cities):
+    paris = cities[0]
+    # Plenty of ties on both sort keys, plus unrated rows, so pages split inside a tie.
+    rows = [
+        Attraction(
+            city_id=paris.id,
+            name=f"Sight {i}",
+            cost=(i % 4) * 7.5,
+            rating=None if i % 5 == 0 else 3 + (i % 3) * 0.25,
+        )
+        for i in range(23)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def _pages(client, **params):
+    pages, cursor = [], None
+    while True:
+        response = client.get("/api/attractions", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("sort", ["rating", "cost"])
+def test_paging_returns_every_row_once_in_order(client, attractions, sort):
+    pages = _pages(client, sort=sort, limit=4)
+    assert [len(p) for p in pages] == [4] * 5 + [3]
+
+    rows = [a for page in pages for a in page]
+    assert sorted(a["id"] for a in rows) == sorted(a.id for a in attractions)
+    if sort == "rating":
+        keys = [(-1 if a["rating"] is None else a["rating"], a["id"]) for a in rows]
+        assert keys == sorted(keys, reverse=True)
+    else:
+        keys = [(a["cost"], a["id"]) for a in rows]
+        assert keys == sorted(keys)
+
+
+def test_last_page_has_no_cursor(client, attractions):
+    response = client.get("/api/attractions", params={"limit": 23})
+    assert len(response.json()) == 23
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_filters_apply_across_pages(client, attractions):
+    rows = [a for page in _pages(client, min_rating=3.25, limit=2) for a in page]
+    expected = [a.id for a in attractions if a.rating is not None and a.rating >= 3.25]
+    assert sorted(a["id"] for a in rows) == sorted(expected)
+
+
+def test_garbage_cursor_is_rejected(client, attractions):
+    assert client.get("/api/attractions", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,134 @@
+import pytest
+
+from app.models.activity import Activity
+from app.models.stop import Stop
+from app.services import batch_service
+from tests.conftest import signup
+
+
+def _stops(client, auth, trip_id) -> list[dict]:
+    return client.get(f"/api/trips/{trip_id}/stops", headers=auth).json()
+
+
+def _batch(client, auth, trip_id, payload):
+    return client.post(f"/api/trips/{trip_id}/batch", json=payload, headers=auth)
+
+
+def _snapshot(db, trip_id):
+    db.expire_all()
+    stops = db.query(Stop).filter(Stop.trip_id == trip_id).order_by(Stop.id).all()
+    activities = db.query(Activity).join(Stop).filter(Stop.trip_id == trip_id).order_by(Activity.id).all()
+    return [(s.id, s.start_date, float(s.stay_cost)) for s in stops], [(a.id, a.stop_id, a.name) for a in activities]
+
+
+def test_activities_attach_to_stops_created_by_ref(client, auth, trip, cities):
+    paris = _stops(client, auth, trip["id"])[0]
+    response = _batch(
+        client,
+        auth,
+        trip["id"],
+        {
+            "stops": {
+                "create": [
+                    {"ref": "a", "city_id": cities[0].id, "start_date": "2026-01-06", "end_date": "2026-01-07"},
+                    {"ref": "b", "city_id": cities[1].id, "start_date": "2026-01-08", "end_date": "2026-01-09"},
+                ]
+            },
+            "activities": {
+                "create": [
+                    {"stop_ref": "b", "name": "Temple"},
+                    {"stop_ref": "a", "name": "Louvre"},
+                    {"stop_id": paris["id"], "name": "Seine cruise"},
+                ]
+            },
+        },
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    stop_a, stop_b = body["stops"]
+    assert (stop_a["start_date"], stop_b["start_date"]) == ("2026-01-06", "2026-01-08")
+    assert [(a["name"], a["stop_id"]) for a in body["activities"]] == [
+        ("Temple", stop_b["id"]),
+        ("Louvre", stop_a["id"]),
+        ("Seine cruise", paris["id"]),
+    ]
+    # New stops go after the existing ones, in request order.
+    assert [s["id"] for s in _stops(client, auth, trip["id"])][-2:] == [stop_a["id"], stop_b["id"]]
+
+
+def test_unknown_stop_ref_is_rejected(client, auth, trip):
+    response = _batch(client, auth, trip["id"], {"activities": {"create": [{"stop_ref": "nope", "name": "x"}]}})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        lambda stop, activity: {"stops": {"delete": [stop]}},
+        lambda stop, activity: {"stops": {"update": [{"id": stop, "stay_cost": 1}]}},
+        lambda stop, activity: {"activities": {"create": [{"stop_id": stop, "name": "x"}]}},
+        lambda stop, activity: {"activities": {"update": [{"id": activity, "name": "x"}]}},
+        lambda stop, activity: {"activities": {"delete": [activity]}},
+    ],
+)
+def test_ids_from_another_users_trip_are_rejected(client, auth, trip, cities, db, payload):
+    other = signup(client, "other@example.com")
+    other_trip = client.post(
+        "/api/trips", json={"name": "Theirs", "start_date": "2026-02-01", "end_date": "2026-02-02"}, headers=other
+    ).json()
+    stop = client.post(
+        f"/api/trips/{other_trip['id']}/stops",
+        json={"city_id": cities[0].id, "start_date": "2026-02-01", "end_date": "2026-02-02"},
+        headers=other,
+    ).json()
+    activity = client.post(f"/api/stops/{stop['id']}/activities", json={"name": "Theirs"}, headers=other).json()
+    before = _snapshot(db, other_trip["id"])
+
+    response = _batch(client, auth, trip["id"], payload(stop["id"], activity["id"]))
+    assert response.status_code == 404
+    assert _snapshot(db, other_trip["id"]) == before
+    # Nor can the batch be sent to their trip directly.
+    assert _batch(client, auth, other_trip["id"], payload(stop["id"], activity["id"])).status_code == 404
+
+
+def test_ids_from_another_trip_of_the_same_user_are_rejected(client, auth, trip, cities, db):
+    second = client.post(
+        "/api/trips", json={"name": "Second", "start_date": "2026-02-01", "end_date": "2026-02-02"}, headers=auth
+    ).json()
+    foreign_stop = _stops(client, auth, trip["id"])[0]["id"]
+    before = _snapshot(db, trip["id"])
+
+    response = _batch(client, auth, second["id"], {"stops": {"delete": [foreign_stop]}})
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Stop not found: {foreign_stop}"
+    assert _snapshot(db, trip["id"]) == before
+
+
+def test_failed_batch_writes_nothing(client, auth, trip, cities, db, monkeypatch):
+    first, second = _stops(client, auth, trip["id"])
+    before = _snapshot(db, trip["id"])
+
+    # Fail after every write has been issued, just before the commit.
+    def fail(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(batch_service, "rebuild_budget_rollup", fail)
+    with pytest.raises(RuntimeError):
+        _batch(
+            client,
+            auth,
+            trip["id"],
+            {
+                "stops": {
+                    "create": [
+                        {"ref": "n", "city_id": cities[0].id, "start_date": "2026-01-06", "end_date": "2026-01-06"}
+                    ],
+                    "update": [{"id": first["id"], "stay_cost": 999}],
+                    "delete": [second["id"]],
+                },
+                "activities": {"create": [{"stop_ref": "n", "name": "Never"}]},
+            },
+        )
+
+    assert _snapshot(db, trip["id"]) == before
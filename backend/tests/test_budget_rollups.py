@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from app.models.trip_budget_rollup import TripBudgetRollup
+from app.services.budget_service import adjust_budget_rollup, check_budget_rollups
+
+
+def _rollup(db, trip_id):
+    db.expire_all()
+    return db.get(TripBudgetRollup, trip_id)
+
+
+def test_adjust_applies_deltas(client, db, trip):
+    before = _rollup(db, trip["id"])
+    assert before.stay == Decimal("200")
+
+    adjust_budget_rollup(db, trip["id"], stay=Decimal("-50"), other=Decimal("12.5"), meals=0)
+    db.commit()
+
+    after = _rollup(db, trip["id"])
+    assert (after.stay, after.other, after.meals) == (Decimal("150"), Decimal("12.5"), Decimal("0"))
+
+
+def test_adjust_rebuilds_missing_rollup(client, db, trip):
+    db.delete(_rollup(db, trip["id"]))
+    db.commit()
+
+    # The delta is ignored: the rebuild already sees every source row.
+    adjust_budget_rollup(db, trip["id"], stay=Decimal("999"))
+    db.commit()
+
+    assert _rollup(db, trip["id"]).stay == Decimal("200")
+
+
+def test_check_reports_and_fixes_drift(client, db, trip):
+    assert check_budget_rollups(db) == []
+
+    _rollup(db, trip["id"]).meals = Decimal("7")
+    db.commit()
+
+    drift = check_budget_rollups(db)
+    assert drift == [{"trip_id": trip["id"], "missing": False, "fields": {"meals": {"stored": 7.0, "actual": 0.0}}}]
+
+    assert check_budget_rollups(db, fix=True) == drift
+    assert check_budget_rollups(db) == []
+    assert _rollup(db, trip["id"]).meals == Decimal("0")
+
+
+def test_check_reports_missing_rollup(client, db, trip):
+    db.delete(_rollup(db, trip["id"]))
+    db.commit()
+
+    [entry] = check_budget_rollups(db, fix=True)
+    assert entry["trip_id"] == trip["id"] and entry["missing"]
+    assert _rollup(db, trip["id"]).stay == Decimal("200")
@@ -0,0 +1,75 @@
+import pytest
+
+from app.models.city import City
+from app.services.city_catalog import CityCatalog, CityEntry
+from app.services.city_search import CitySuggestIndex, suggest_cities_stmt
+
+CATALOG = [
+    # name, country, popularity
+    ("Paris", "France", 95),
+    ("Parma", "Italy", 40),
+    ("Porto", "Portugal", 60),
+    ("São Paulo", "Brazil", 70),
+    ("Saint-Paul", "Réunion", 10),
+    ("Nice", "France", 50),
+    ("Lyon", "France", 55),
+    ("Paramaribo", "Suriname", 5),
+]
+
+
+def _index() -> CitySuggestIndex:
+    entries = [CityEntry(i, name, country, None, None, pop, None) for i, (name, country, pop) in enumerate(CATALOG, 1)]
+    return CityCatalog(entries).suggest_index
+
+
+def _names(cities) -> list[str]:
+    return [c.name for c in cities]
+
+
+def test_city_name_prefix_ranks_by_popularity():
+    assert _names(_index().suggest("par")) == ["Paris", "Parma", "Paramaribo"]
+    # Precomputed short-prefix bucket: name prefixes first, then other words.
+    assert _names(_index().suggest("pa")) == ["Paris", "Parma", "Paramaribo", "São Paulo"]
+
+
+def test_name_prefixes_come_before_country_words_and_substrings():
+    # "Porto" starts with "port"; Portugal is only a country word.
+    assert _names(_index().suggest("port")) == ["Porto"]
+    # City names first, then cities whose country starts with "fra".
+    assert _names(_index().suggest("fran")) == ["Paris", "Lyon", "Nice"]
+    # No prefix match at all: substring matches in popularity order.
+    assert _names(_index().suggest("aul")) == ["São Paulo", "Saint-Paul"]
+
+
+@pytest.mark.parametrize("query", ["SAO PAULO", "são paulo", "  sao   paulo ", "Sao Pa"])
+def test_case_accents_and_spacing_are_ignored(query):
+    assert _names(_index().suggest(query)) == ["São Paulo"]
+
+
+def test_limit_is_applied_and_clamped():
+    index = _index()
+    assert _names(index.suggest("p", limit=2)) == ["Paris", "Porto"]
+    assert _names(index.suggest("par", limit=1)) == ["Paris"]
+    assert _names(index.suggest("p", limit=0)) == ["Paris"]
+    assert len(index.suggest("p", limit=500)) == 5
+
+
+def test_no_match_or_blank_query():
+    index = _index()
+    assert index.suggest("xyz") == []
+    assert index.suggest("   ") == []
+
+
+def test_sql_fallback(db):
+    db.add_all(City(name=name, country=country, popularity=pop) for name, country, pop in CATALOG)
+    db.commit()
+
+    def names(query, limit=10):
+        return [row.name for row in db.execute(suggest_cities_stmt(query, limit))]
+
+    assert names("PAR") == ["Paris", "Parma", "Paramaribo"]
+    assert names("fran") == ["Paris", "Lyon", "Nice"]
+    assert names("par", limit=1) == ["Paris"]
+    # LIKE wildcards in the query are matched literally.
+    assert names("%") == []
+    assert names("p_r") == []
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.community_post import CommunityPost
+from app.services import community_feed
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+T0 = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def test_cursor_round_trip():
+    values = [Decimal("4.10"), T0.isoformat(), 42]
+    decoded = decode_cursor(encode_cursor(*values), 3)
+    assert decoded == ["4.10", T0.isoformat(), 42]
+    assert "=" not in encode_cursor(*values)
+
+
+@pytest.mark.parametrize("cursor", ["%%%", encode_cursor(1), encode_cursor(1, 2, 3)])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, 2)
+    assert e.value.status_code == 400
+
+
+@pytest.fixture
+def posts(client, auth, db):
+    from app.models.user import User
+
+    author = db.query(User).one()
+    # Pairs of posts share a timestamp, so pages have to split ties by id.
+    rows = [
+        CommunityPost(user_id=author.id, content=f"post {i}", created_at=T0 + timedelta(minutes=i // 2))
+        for i in range(7)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def _ids(response) -> list[int]:
+    return [p["id"] for p in response.json()]
+
+
+def test_feed_pages_follow_next_cursor(client, posts):
+    seen, cursor = [], None
+    while True:
+        response = client.get("/api/community/posts", params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        seen += _ids(response)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    expected = [p.id for p in sorted(posts, key=lambda p: (p.created_at, p.id), reverse=True)]
+    assert seen == expected
+
+
+def test_single_page_has_no_cursor(client, posts):
+    response = client.get("/api/community/posts", params={"limit": 7})
+    assert len(response.json()) == 7
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_invalid_cursor_is_a_400(client, posts):
+    assert client.get("/api/community/posts", params={"cursor": encode_cursor("yesterday", 1)}).status_code == 400
+
+
+def test_new_post_replaces_cached_first_page(client, auth, posts):
+    before = _ids(client.get("/api/community/posts"))
+    assert community_feed.feed_snapshot_cache.get("first_page") is not None
+
+    created = client.post("/api/community/posts", json={"content": "fresh"}, headers=auth).json()
+
+    after = _ids(client.get("/api/community/posts"))
+    assert after == [created["id"], *before]
+
+    client.delete(f"/api/community/posts/{created['id']}", headers=auth)
+    assert _ids(client.get("/api/community/posts")) == before
+
+
+def test_snapshot_read_before_a_write_is_not_stored(db, posts, monkeypatch):
+    feed_stmt = community_feed._feed_stmt
+
+    def stmt_then_concurrent_write(*args, **kwargs):
+        # A post lands between reading the generation and storing the snapshot.
+        monkeypatch.setattr(community_feed, "_generation", community_feed._generation + 1)
+        return feed_stmt(*args, **kwargs)
+
+    monkeypatch.setattr(community_feed, "_feed_stmt", stmt_then_concurrent_write)
+    posts_page, _ = community_feed.list_feed(db, 10, None)
+
+    assert len(posts_page) == len(posts)
+    assert community_feed.feed_snapshot_cache.get("first_page") is None
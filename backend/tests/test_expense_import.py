@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models.expense import Expense
+from app.models.trip_budget_rollup import TripBudgetRollup
+
+CSV = """expense_date,category,amount,notes
+2026-01-01,food,12.50,lunch
+2026-01-02,transport,inf,
+2026-01-02,transport,nan,
+2026-01-03,stay,10000000000,
+2026-01-03,stay,-1e10,
+not-a-date,other,3,
+2026-01-04,other,9999999999.99,big but fits
+,other,,
+"""
+
+
+def _import(client, auth, trip_id, body: str, **params):
+    return client.post(
+        f"/api/expenses/trips/{trip_id}/import",
+        params=params,
+        files={"file": ("expenses.csv", body.encode(), "text/csv")},
+        headers=auth,
+    )
+
+
+def _expenses(db, trip_id) -> list[tuple[str, Decimal]]:
+    db.expire_all()
+    return [(e.category, e.amount) for e in db.query(Expense).filter(Expense.trip_id == trip_id).order_by(Expense.id)]
+
+
+def test_invalid_rows_are_reported_and_skipped(client, auth, trip, db):
+    response = _import(client, auth, trip["id"], CSV)
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    assert (body["imported"], body["failed"]) == (3, 5)
+    assert body["total_amount"] == pytest.approx(12.5 + 9999999999.99)
+    assert [e["line"] for e in body["errors"]] == [3, 4, 5, 6, 7]
+    assert all(err.startswith("amount:") for e in body["errors"][:4] for err in e["errors"])
+    assert body["errors"][4]["errors"][0].startswith("expense_date:")
+
+    assert _expenses(db, trip["id"]) == [
+        ("food", Decimal("12.50")),
+        ("other", Decimal("9999999999.99")),
+        ("other", Decimal("0")),
+    ]
+    assert db.get(TripBudgetRollup, trip["id"]).other == Decimal("10000000012.49")
+
+
+def test_atomic_import_saves_nothing_if_any_row_fails(client, auth, trip, db):
+    response = _import(client, auth, trip["id"], CSV, atomic="true")
+    assert response.status_code == 422
+    assert response.json()["imported"] == 0
+    assert response.json()["failed"] == 5
+    assert _expenses(db, trip["id"]) == []
+
+
+def test_atomic_import_of_good_rows(client, auth, trip, db):
+    body = "category,amount\nfood,1.25\nfood,-0.25\n"
+    response = _import(client, auth, trip["id"], body, atomic="true")
+    assert response.status_code == 200
+    assert response.json() == {"imported": 2, "failed": 0, "total_amount": 1.0, "errors": []}
+    assert _expenses(db, trip["id"]) == [("food", Decimal("1.25")), ("food", Decimal("-0.25"))]
+
+
+# No category column; a field past the csv module's size limit.
+@pytest.mark.parametrize("body", ["amount,notes\n1,x\n", 'category,amount\nfood,1\n"' + "x" * 200_000 + '"\n'])
+def test_unusable_file_is_a_400(client, auth, trip, db, body):
+    assert _import(client, auth, trip["id"], body).status_code == 400
+    assert _expenses(db, trip["id"]) == []
+
+
+def test_json_create_rejects_out_of_range_amounts(client, auth, trip):
+    url = f"/api/expenses/trips/{trip['id']}"
+    assert client.post(url, json={"category": "food", "amount": 1e10}, headers=auth).status_code == 422
+    assert client.post(url, json={"category": "food", "amount": 99.5}, headers=auth).status_code == 200
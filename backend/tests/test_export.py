@@ -0,0 +1,31 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.services.export_service import _csv_chunks, _csv_value
+
+
+@pytest.mark.parametrize("text", ["=SUM(A1:A2)", "+1", "-2+3", "@cmd", "\tx", "\rx"])
+def test_formula_like_text_is_escaped(text):
+    assert _csv_value(text) == "'" + text
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("Louvre", "Louvre"),
+        (Decimal("-12.50"), Decimal("-12.50")),
+        (-3, -3),
+        (date(2026, 1, 2), "2026-01-02"),
+        (datetime(2026, 1, 2, 10), "2026-01-02T10:00:00"),
+        (None, ""),
+    ],
+)
+def test_other_values_are_unchanged(value, expected):
+    assert _csv_value(value) == expected
+
+
+def test_csv_chunks_write_escaped_cells():
+    body = "".join(_csv_chunks(["name", "amount"], [[("=HYPERLINK(1)", Decimal("-1.50"))]]))
+    assert body == "name,amount\r\n'=HYPERLINK(1),-1.50\r\n"
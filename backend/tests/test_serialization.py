@@ -0,0 +1,147 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from pydantic import BaseModel
+
+from app.schemas.activity import ActivityResponse
+from app.schemas.expense import ExpenseResponse
+from app.schemas.stop import StopResponse
+from app.schemas.trip import TripResponse
+from app.services.city_catalog import CityCatalog, CityEntry
+from app.utils.response_utils import (
+    activity_fields,
+    expense_fields,
+    stop_fields,
+    to_float,
+    to_float_or_none,
+    trip_fields,
+)
+from app.utils.serialization import _default, dumps
+
+
+def test_decimal_is_encoded_as_a_number():
+    assert dumps({"amount": Decimal("12.50")}) == b'{"amount":12.5}'
+    assert dumps([Decimal("0"), Decimal("-3.25")]) == b"[0.0,-3.25]"
+
+
+def test_none_is_encoded_as_null():
+    assert dumps({"notes": None}) == b'{"notes":null}'
+
+
+def test_utc_datetime_is_encoded_with_z():
+    value = datetime(2026, 1, 1, 10, 30, tzinfo=timezone.utc)
+    assert dumps({"at": value}) == b'{"at":"2026-01-01T10:30:00Z"}'
+
+
+def test_utc_datetime_matches_pydantic():
+    class Model(BaseModel):
+        at: datetime
+
+    value = datetime(2026, 1, 1, 10, 30, tzinfo=timezone.utc)
+    assert dumps(Model(at=value)) == dumps(Model(at=value).model_dump(mode="json"))
+    assert orjson.loads(dumps({"at": value})) == Model(at=value).model_dump(mode="json")
+
+
+def test_other_offsets_are_kept():
+    value = datetime(2026, 1, 1, 10, 30, tzinfo=timezone(timedelta(hours=2)))
+    assert dumps({"at": value}) == b'{"at":"2026-01-01T10:30:00+02:00"}'
+
+
+def test_default_converts_decimal_and_models_only():
+    assert _default(Decimal("1.10")) == 1.1
+
+    class Model(BaseModel):
+        day: date
+
+    assert _default(Model(day=date(2026, 1, 2))) == {"day": "2026-01-02"}
+    with pytest.raises(TypeError, match="set"):
+        _default({1})
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(Decimal("12.50"), 12.5), (3, 3.0), ("4.5", 4.5), (None, 0.0), ("n/a", 0.0)],
+)
+def test_to_float(value, expected):
+    assert to_float(value) == expected
+
+
+def test_to_float_or_none_keeps_none():
+    assert to_float_or_none(None) is None
+    assert to_float_or_none(Decimal("0")) == 0.0
+
+
+def _stop():
+    return SimpleNamespace(
+        id=7,
+        trip_id=3,
+        city_id=1,
+        start_date=date(2026, 1, 1),
+        end_date=date(2026, 1, 2),
+        order_index=1024,
+        stay_cost=Decimal("100.00"),
+        transport_cost=None,
+        meals_cost=Decimal("12.35"),
+    )
+
+
+@pytest.mark.parametrize(
+    ("mapper", "model", "obj"),
+    [
+        (
+            trip_fields,
+            TripResponse,
+            SimpleNamespace(
+                id=3,
+                name="Spring",
+                start_date=date(2026, 1, 1),
+                end_date=date(2026, 1, 5),
+                description=None,
+                cover_photo_url=None,
+                budget=Decimal("1000.00"),
+            ),
+        ),
+        (
+            activity_fields,
+            ActivityResponse,
+            SimpleNamespace(
+                id=9,
+                stop_id=7,
+                name="Louvre",
+                type="Culture",
+                start_time=datetime(2026, 1, 1, 10, tzinfo=timezone.utc),
+                duration_minutes=90,
+                cost=Decimal("20.00"),
+                notes=None,
+            ),
+        ),
+        (
+            expense_fields,
+            ExpenseResponse,
+            SimpleNamespace(
+                id=4,
+                trip_id=3,
+                expense_date=None,
+                category="food",
+                amount=Decimal("12.50"),
+                notes="lunch",
+            ),
+        ),
+    ],
+)
+def test_mapper_matches_response_model(mapper, model, obj):
+    fields = mapper(obj)
+    assert set(fields) == set(model.model_fields)
+    assert orjson.loads(dumps(fields)) == model.model_validate(obj).model_dump(mode="json")
+
+
+def test_stop_fields_match_response_model():
+    catalog = CityCatalog([CityEntry(1, "Paris", "France", "Europe", 4, 90, None)])
+    fields = stop_fields(_stop(), catalog)
+
+    assert set(fields) == set(StopResponse.model_fields)
+    assert fields["city_name"] == "Paris" and fields["transport_cost"] == 0.0
+    assert orjson.loads(dumps(fields)) == StopResponse(**fields).model_dump(mode="json")
@@ -0,0 +1,109 @@
+from datetime import date
+
+import pytest
+
+from app.models.stop import Stop
+from app.services import stop_order
+from app.services.stop_order import MIN_GAP, ORDER_GAP, move_stop
+
+
+@pytest.fixture
+def stops(db, trip, cities):
+    """Three stops of ``trip`` keyed ORDER_GAP apart, in trip order."""
+    db.add(
+        Stop(
+            trip_id=trip["id"],
+            city_id=cities[0].id,
+            start_date=date(2026, 1, 5),
+            end_date=date(2026, 1, 5),
+            order_index=stop_order.next_order_key(db, trip["id"]),
+        )
+    )
+    db.commit()
+    return db.query(Stop).filter(Stop.trip_id == trip["id"]).order_by(*stop_order.stop_order_by()).all()
+
+
+def _order(db, trip_id) -> list[int]:
+    db.expire_all()
+    return [s.id for s in db.query(Stop).filter(Stop.trip_id == trip_id).order_by(*stop_order.stop_order_by())]
+
+
+def _set_keys(db, stops, keys):
+    for stop, key in zip(stops, keys):
+        stop.order_index = key
+    db.commit()
+
+
+def test_move_takes_the_midpoint_and_touches_only_the_moved_stop(db, trip, stops):
+    first, second, third = stops
+    assert [s.order_index for s in stops] == [ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP]
+
+    assert move_stop(db, third, first.id) is False
+    db.commit()
+
+    assert third.order_index == ORDER_GAP + ORDER_GAP // 2
+    assert (first.order_index, second.order_index) == (ORDER_GAP, 2 * ORDER_GAP)
+    assert _order(db, trip["id"]) == [first.id, third.id, second.id]
+
+
+def test_moves_to_either_end(db, trip, stops):
+    first, second, third = stops
+    assert move_stop(db, second, None) is False
+    assert second.order_index == 0
+    assert move_stop(db, first, third.id) is False
+    assert first.order_index == 4 * ORDER_GAP
+    db.commit()
+    assert _order(db, trip["id"]) == [second.id, third.id, first.id]
+
+
+def test_narrow_gap_asks_for_a_rebalance(db, trip, stops):
+    first, second, third = stops
+    _set_keys(db, stops, [0, 2 * MIN_GAP - 2, 4 * ORDER_GAP])
+
+    assert move_stop(db, third, first.id) is True
+    db.commit()
+    assert third.order_index == MIN_GAP - 1
+
+    # A gap of exactly MIN_GAP on both sides is still fine.
+    _set_keys(db, stops, [0, 4 * ORDER_GAP, 2 * MIN_GAP])
+    assert move_stop(db, second, first.id) is False
+
+
+def test_background_rebalance_respaces_keys_and_drops_public_views(db, trip, stops, monkeypatch):
+    first, second, third = stops
+    _set_keys(db, stops, [5, 6, 7])
+    invalidated = []
+    monkeypatch.setattr(stop_order, "invalidate_public_trip", invalidated.append)
+
+    stop_order.rebalance_stop_order_in_background(trip["id"])
+
+    db.expire_all()
+    assert [s.order_index for s in stops] == [ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP]
+    assert invalidated == [trip["id"]]
+
+
+def test_move_endpoint_schedules_the_rebalance(client, auth, db, trip, stops):
+    first, second, third = stops
+    _set_keys(db, stops, [0, 4, 100])
+
+    response = client.post(f"/api/stops/{third.id}/move", json={"after_id": first.id}, headers=auth)
+    assert response.status_code == 200
+    assert response.json()["order_index"] == 2
+
+    # Background tasks have run by the time the test client returns.
+    db.expire_all()
+    assert _order(db, trip["id"]) == [first.id, third.id, second.id]
+    assert sorted(s.order_index for s in stops) == [ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP]
+
+
+def test_tied_keys_keep_date_order_and_are_renumbered_before_a_move(db, trip, stops):
+    first, second, third = stops
+    _set_keys(db, stops, [7, 7, 7])
+    # Ties fall back to start date, then id.
+    assert _order(db, trip["id"]) == [first.id, second.id, third.id]
+
+    assert move_stop(db, third, first.id) is False
+    db.commit()
+
+    assert _order(db, trip["id"]) == [first.id, third.id, second.id]
+    assert len({s.order_index for s in stops}) == 3
@@ -0,0 +1,7 @@
+-- Migration: index for the /calendar endpoint (activities by stop within a date window).
+-- Safe to run multiple times.
+
+-- Also serves lookups by stop_id alone (listing, cascades), which makes the
+-- standalone stop_id index redundant.
+CREATE INDEX IF NOT EXISTS ix_activities_stop_start ON activities (stop_id, start_time);
+DROP INDEX IF EXISTS ix_activities_stop_id;
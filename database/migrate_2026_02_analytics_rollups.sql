@@ -0,0 +1,27 @@
+-- Migration: rollup tables behind the /admin/analytics endpoints.
+-- They are filled by scripts/rebuild_analytics_rollups.py (or the app's periodic
+-- refresh, see ANALYTICS_REFRESH_INTERVAL_SECONDS); run it once after this migration.
+-- Safe to run multiple times.
+
+CREATE TABLE IF NOT EXISTS analytics_city_visits (
+  city_id INTEGER PRIMARY KEY REFERENCES cities(id) ON DELETE CASCADE,
+  stop_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS analytics_activity_types (
+  type TEXT PRIMARY KEY,
+  activity_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS analytics_trips_per_month (
+  year INTEGER NOT NULL,
+  month INTEGER NOT NULL,
+  trip_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (year, month)
+);
+
+CREATE TABLE IF NOT EXISTS analytics_refreshes (
+  rollup TEXT PRIMARY KEY,
+  refreshed_at TIMESTAMPTZ NOT NULL,
+  duration_ms INTEGER NOT NULL DEFAULT 0
+);
@@ -0,0 +1,14 @@
+-- Migration: indexes for attraction search (filters, rating/cost sort, keyset pages).
+-- Safe to run multiple times.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Per-city pages in either sort order; these also cover lookups by city_id,
+-- which makes the standalone city_id index redundant.
+CREATE INDEX IF NOT EXISTS ix_attractions_city_rating
+  ON attractions (city_id, COALESCE(rating, -1) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_attractions_city_cost ON attractions (city_id, cost, id);
+DROP INDEX IF EXISTS ix_attractions_city_id;
+
+-- Substring search on attraction names.
+CREATE INDEX IF NOT EXISTS ix_attractions_name_trgm ON attractions USING gin (name gin_trgm_ops);
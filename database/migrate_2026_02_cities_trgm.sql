@@ -0,0 +1,8 @@
+-- Migration: trigram indexes for substring city search.
+-- Lets `name ILIKE '%q%'` / `country ILIKE '%q%'` use an index instead of a sequential scan.
+-- Safe to run multiple times.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_cities_name_trgm ON cities USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_cities_country_trgm ON cities USING gin (country gin_trgm_ops);
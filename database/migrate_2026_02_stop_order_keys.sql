@@ -0,0 +1,14 @@
+-- Migration: sparse stop order keys.
+-- Renumbers every trip's stops 1024 apart (keeping their current order) so a
+-- stop can be moved by rewriting only its own order_index, and adds the index
+-- used for ordered listing and appends. Safe to run multiple times.
+
+UPDATE stops
+SET order_index = ranked.position * 1024
+FROM (
+  SELECT id, ROW_NUMBER() OVER (PARTITION BY trip_id ORDER BY order_index, start_date, id) AS position
+  FROM stops
+) AS ranked
+WHERE stops.id = ranked.id;
+
+CREATE INDEX IF NOT EXISTS ix_stops_trip_order ON stops (trip_id, order_index);
@@ -0,0 +1,34 @@
+-- Migration: per-trip budget rollups maintained by the stop, activity and expense write paths.
+-- Safe to run multiple times; the backfill only adds rollups for trips that don't have one.
+
+CREATE TABLE IF NOT EXISTS trip_budget_rollups (
+  trip_id INTEGER PRIMARY KEY REFERENCES trips(id) ON DELETE CASCADE,
+  transport NUMERIC(14,2) NOT NULL DEFAULT 0,
+  stay NUMERIC(14,2) NOT NULL DEFAULT 0,
+  meals NUMERIC(14,2) NOT NULL DEFAULT 0,
+  activities NUMERIC(14,2) NOT NULL DEFAULT 0,
+  other NUMERIC(14,2) NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO trip_budget_rollups (trip_id, transport, stay, meals, activities, other)
+SELECT
+  t.id,
+  COALESCE(s.transport, 0),
+  COALESCE(s.stay, 0),
+  COALESCE(s.meals, 0),
+  COALESCE(a.activities, 0),
+  COALESCE(e.other, 0)
+FROM trips t
+LEFT JOIN (
+  SELECT trip_id, SUM(transport_cost) AS transport, SUM(stay_cost) AS stay, SUM(meals_cost) AS meals
+  FROM stops GROUP BY trip_id
+) s ON s.trip_id = t.id
+LEFT JOIN (
+  SELECT st.trip_id, SUM(ac.cost) AS activities
+  FROM activities ac JOIN stops st ON st.id = ac.stop_id GROUP BY st.trip_id
+) a ON a.trip_id = t.id
+LEFT JOIN (
+  SELECT trip_id, SUM(amount) AS other FROM expenses GROUP BY trip_id
+) e ON e.trip_id = t.id
+ON CONFLICT (trip_id) DO NOTHING;
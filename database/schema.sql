@@ -40,6 +40,11 @@ CREATE TABLE IF NOT EXISTS cities (
 
 CREATE UNIQUE INDEX IF NOT EXISTS ux_cities_name_country ON cities (name, country);
 
+-- Trigram indexes back substring city search (/cities, SQL fallback of /cities/suggest)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_cities_name_trgm ON cities USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_cities_country_trgm ON cities USING gin (country gin_trgm_ops);
+
 CREATE TABLE IF NOT EXISTS attractions (
   id SERIAL PRIMARY KEY,
   city_id INTEGER NOT NULL REFERENCES cities(id) ON DELETE CASCADE,
@@ -51,6 +56,11 @@ CREATE TABLE IF NOT EXISTS attractions (
   image_url TEXT
 );
 
+CREATE INDEX IF NOT EXISTS ix_attractions_city_rating
+  ON attractions (city_id, COALESCE(rating, -1) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_attractions_city_cost ON attractions (city_id, cost, id);
+CREATE INDEX IF NOT EXISTS ix_attractions_name_trgm ON attractions USING gin (name gin_trgm_ops);
+
 CREATE TABLE IF NOT EXISTS stops (
   id SERIAL PRIMARY KEY,
   trip_id INTEGER NOT NULL REFERENCES trips(id) ON DELETE CASCADE,
@@ -63,6 +73,8 @@ CREATE TABLE IF NOT EXISTS stops (
   meals_cost NUMERIC(12,2) NOT NULL DEFAULT 0
 );
 
+CREATE INDEX IF NOT EXISTS ix_stops_trip_order ON stops (trip_id, order_index);
+
 CREATE TABLE IF NOT EXISTS activities (
   id SERIAL PRIMARY KEY,
   stop_id INTEGER NOT NULL REFERENCES stops(id) ON DELETE CASCADE,
@@ -74,6 +86,8 @@ CREATE TABLE IF NOT EXISTS activities (
   notes TEXT
 );
 
+CREATE INDEX IF NOT EXISTS ix_activities_stop_start ON activities (stop_id, start_time);
+
 CREATE TABLE IF NOT EXISTS expenses (
   id SERIAL PRIMARY KEY,
   trip_id INTEGER NOT NULL REFERENCES trips(id) ON DELETE CASCADE,
@@ -101,3 +115,36 @@ CREATE TABLE IF NOT EXISTS shared_trips (
   is_public BOOLEAN NOT NULL DEFAULT TRUE,
   created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
+
+CREATE TABLE IF NOT EXISTS trip_budget_rollups (
+  trip_id INTEGER PRIMARY KEY REFERENCES trips(id) ON DELETE CASCADE,
+  transport NUMERIC(14,2) NOT NULL DEFAULT 0,
+  stay NUMERIC(14,2) NOT NULL DEFAULT 0,
+  meals NUMERIC(14,2) NOT NULL DEFAULT 0,
+  activities NUMERIC(14,2) NOT NULL DEFAULT 0,
+  other NUMERIC(14,2) NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS analytics_city_visits (
+  city_id INTEGER PRIMARY KEY REFERENCES cities(id) ON DELETE CASCADE,
+  stop_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS analytics_activity_types (
+  type TEXT PRIMARY KEY,
+  activity_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS analytics_trips_per_month (
+  year INTEGER NOT NULL,
+  month INTEGER NOT NULL,
+  trip_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (year, month)
+);
+
+CREATE TABLE IF NOT EXISTS analytics_refreshes (
+  rollup TEXT PRIMARY KEY,
+  refreshed_at TIMESTAMPTZ NOT NULL,
+  duration_ms INTEGER NOT NULL DEFAULT 0
+);
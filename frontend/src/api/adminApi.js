@@ -23,3 +23,9 @@ export async function adminTripsPerMonth(token) {
   const res = await client.get('/admin/analytics/trips-per-month');
   return res.data;
 }
+
+export async function adminAnalyticsFreshness(token) {
+  const client = createApiClient(token);
+  const res = await client.get('/admin/analytics/freshness');
+  return res.data;
+}
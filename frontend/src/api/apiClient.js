@@ -1,13 +1,29 @@
 import axios from 'axios';
 
+// Read-your-writes: after a write the API says (in Unix seconds) until when our
+// reads should skip its replicas; sending the value back keeps them on the primary.
+const PRIMARY_READS_HEADER = 'X-Primary-Reads-Until';
+let primaryReadsUntil = 0;
+
 export function createApiClient(token) {
   const client = axios.create({
     baseURL: 'http://localhost:8000/api',
     headers: token ? { Authorization: `Bearer ${token}` } : undefined,
   });
 
+  client.interceptors.request.use((config) => {
+    if (primaryReadsUntil > Date.now() / 1000) {
+      config.headers[PRIMARY_READS_HEADER] = String(primaryReadsUntil);
+    }
+    return config;
+  });
+
   client.interceptors.response.use(
-    (r) => r,
+    (r) => {
+      const until = Number(r.headers[PRIMARY_READS_HEADER.toLowerCase()]);
+      if (until > primaryReadsUntil) primaryReadsUntil = until;
+      return r;
+    },
     (err) => {
       const message = err?.response?.data?.detail || err.message || 'Request failed';
       return Promise.reject(new Error(message));
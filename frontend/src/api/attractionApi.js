@@ -1,8 +1,9 @@
 import { createApiClient } from './apiClient';
 
-export async function searchAttractions(token, query, cityId) {
+// filters: { type, min_cost, max_cost, min_rating, sort, limit, cursor }
+export async function searchAttractions(token, query, cityId, filters = {}) {
   const client = createApiClient(token);
-  const params = {};
+  const params = { ...filters };
   if (query) params.query = query;
   if (cityId) params.city_id = cityId;
   
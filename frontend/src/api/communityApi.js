@@ -1,8 +1,10 @@
 import { createApiClient } from './apiClient';
 
-export async function listCommunityPosts(limit = 50) {
+export async function listCommunityPosts(limit = 50, cursor = null) {
   const client = createApiClient();
-  const res = await client.get(`/community/posts?limit=${encodeURIComponent(limit)}`);
+  const params = { limit };
+  if (cursor) params.cursor = cursor;
+  const res = await client.get('/community/posts', { params });
   return res.data;
 }
 
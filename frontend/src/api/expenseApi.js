@@ -6,6 +6,22 @@ export async function listExpenses(token, tripId) {
   return res.data;
 }
 
+export async function getExpenseSummary(token, tripId) {
+  const client = createApiClient(token);
+  const res = await client.get(`/expenses/trips/${tripId}/summary`);
+  return res.data;
+}
+
+export async function getExpensesSummary(token, tripIds) {
+  const client = createApiClient(token);
+  // indexes: null sends trip_id=1&trip_id=2, the repeated form FastAPI reads as a list.
+  const res = await client.get('/expenses/summary', {
+    params: tripIds ? { trip_id: tripIds } : {},
+    paramsSerializer: { indexes: null },
+  });
+  return res.data;
+}
+
 export async function createExpense(token, tripId, payload) {
   const client = createApiClient(token);
   const res = await client.post(`/expenses/trips/${tripId}`, payload);
@@ -23,3 +39,17 @@ export async function deleteExpense(token, expenseId) {
   const res = await client.delete(`/expenses/${expenseId}`);
   return res.data;
 }
+
+export async function exportExpenses(token, tripId, format) {
+  const client = createApiClient(token);
+  const res = await client.get(`/expenses/trips/${tripId}/export`, { params: { format }, responseType: 'blob' });
+  return res.data;
+}
+
+export async function importExpenses(token, tripId, file, atomic = false) {
+  const client = createApiClient(token);
+  const form = new FormData();
+  form.append('file', file);
+  const res = await client.post(`/expenses/trips/${tripId}/import`, form, { params: { atomic } });
+  return res.data;
+}
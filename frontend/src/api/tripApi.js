@@ -18,6 +18,12 @@ export async function getTrip(token, tripId) {
   return res.data;
 }
 
+export async function getTripFull(token, tripId) {
+  const client = createApiClient(token);
+  const res = await client.get(`/trips/${tripId}/full`);
+  return res.data;
+}
+
 export async function deleteTrip(token, tripId) {
   const client = createApiClient(token);
   const res = await client.delete(`/trips/${tripId}`);
@@ -42,12 +48,26 @@ export async function updateStop(token, stopId, payload) {
   return res.data;
 }
 
+// Places the stop right after `afterId` (null = first).
+export async function moveStop(token, stopId, afterId) {
+  const client = createApiClient(token);
+  const res = await client.post(`/stops/${stopId}/move`, { after_id: afterId });
+  return res.data;
+}
+
 export async function deleteStop(token, stopId) {
   const client = createApiClient(token);
   const res = await client.delete(`/stops/${stopId}`);
   return res.data;
 }
 
+// batch: { stops: { create, update, delete }, activities: { create, update, delete } }
+export async function batchWrite(token, tripId, batch) {
+  const client = createApiClient(token);
+  const res = await client.post(`/trips/${tripId}/batch`, batch);
+  return res.data;
+}
+
 export async function listActivities(token, stopId) {
   const client = createApiClient(token);
   const res = await client.get(`/stops/${stopId}/activities`);
@@ -78,6 +98,18 @@ export async function getBudget(token, tripId, budgetLimit) {
   return res.data;
 }
 
+export async function getCalendar(token, start, end) {
+  const client = createApiClient(token);
+  const res = await client.get('/calendar', { params: { start, end } });
+  return res.data;
+}
+
+export async function exportTrip(token, tripId, format) {
+  const client = createApiClient(token);
+  const res = await client.get(`/trips/${tripId}/export`, { params: { format }, responseType: 'blob' });
+  return res.data;
+}
+
 export async function shareTrip(token, tripId) {
   const client = createApiClient(token);
   const res = await client.post(`/share/trips/${tripId}`);
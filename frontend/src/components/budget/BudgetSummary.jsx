@@ -1,7 +1,15 @@
 import React, { useState } from 'react';
-import { DollarSign, PieChart, AlertCircle, Plus, Trash2 } from 'lucide-react';
+import { DollarSign, PieChart, AlertCircle, Plus, Trash2, Upload } from 'lucide-react';
 
-export default function BudgetSummary({ trip, stops, activitiesByStop, expenses, onCreateExpense, onDeleteExpense }) {
+export default function BudgetSummary({
+  trip,
+  stops,
+  activitiesByStop,
+  expenses,
+  onCreateExpense,
+  onDeleteExpense,
+  onImportExpenses,
+}) {
   const [newExpense, setNewExpense] = useState({ description: '', amount: '', category: 'other' });
 
   const transportCost = stops.reduce((sum, s) => sum + Number(s.transport_cost || 0), 0);
@@ -15,6 +23,22 @@ export default function BudgetSummary({ trip, stops, activitiesByStop, expenses,
   const remaining = budgetLimit > 0 ? budgetLimit - totalCost : null;
   const isOverBudget = budgetLimit > 0 && totalCost > budgetLimit;
 
+  const handleImport = async (e) => {
+    const file = e.target.files[0];
+    e.target.value = '';
+    if (!file) return;
+    try {
+      const result = await onImportExpenses(file);
+      const skipped = result.failed
+        ? `, skipped ${result.failed} invalid row(s):\n` +
+          result.errors.map((err) => `line ${err.line}: ${err.errors.join('; ')}`).join('\n')
+        : '';
+      alert(`Imported ${result.imported} expense(s)${skipped}`);
+    } catch (err) {
+      alert(err.message);
+    }
+  };
+
   const handleAddExpense = (e) => {
     e.preventDefault();
     if (!newExpense.description || !newExpense.amount) return;
@@ -122,6 +146,16 @@ export default function BudgetSummary({ trip, stops, activitiesByStop, expenses,
         <div className="bg-white rounded-xl shadow-sm border border-gray-200 overflow-hidden">
           <div className="px-6 py-4 border-b border-gray-200 flex justify-between items-center">
             <h3 className="text-lg font-medium text-gray-900">Miscellaneous Expenses</h3>
+            {onImportExpenses && (
+              <label
+                className="inline-flex items-center text-sm text-primary hover:text-primary-dark cursor-pointer"
+                title="CSV with expense_date, category, amount and notes columns"
+              >
+                <Upload size={14} className="mr-1" />
+                Import CSV
+                <input type="file" accept=".csv,text/csv" className="hidden" onChange={handleImport} />
+              </label>
+            )}
           </div>
           <div className="p-6">
             <form onSubmit={handleAddExpense} className="flex gap-2 mb-6">
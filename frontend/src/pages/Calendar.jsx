@@ -2,7 +2,7 @@ import React, { useEffect, useMemo, useState } from 'react';
 import { ChevronLeft, ChevronRight, Calendar as CalendarIcon } from 'lucide-react';
 import { Link } from 'react-router-dom';
 
-import { listTrips } from '../api/tripApi';
+import { getCalendar } from '../api/tripApi';
 import { useAuth } from '../hooks/useAuth';
 
 function iso(date) {
@@ -23,20 +23,37 @@ function monthLabel(d) {
 
 export default function Calendar() {
   const { token } = useAuth();
-  const [trips, setTrips] = useState([]);
+  const [calendarDays, setCalendarDays] = useState({});
   const [error, setError] = useState(null);
   const [loading, setLoading] = useState(true);
 
   const [month, setMonth] = useState(() => startOfMonth(new Date()));
 
+  const days = useMemo(() => {
+    const first = startOfMonth(month);
+    const startDay = new Date(first);
+    // Sunday start
+    const dayOfWeek = startDay.getDay();
+    startDay.setDate(startDay.getDate() - dayOfWeek);
+
+    const grid = [];
+    for (let i = 0; i < 42; i += 1) {
+      const d = new Date(startDay);
+      d.setDate(startDay.getDate() + i);
+      grid.push(d);
+    }
+    return grid;
+  }, [month]);
+
   useEffect(() => {
     let mounted = true;
     async function load() {
       setError(null);
       setLoading(true);
       try {
-        const res = await listTrips(token);
-        if (mounted) setTrips(res);
+        // One request for the whole visible grid, including the spill-over days.
+        const res = await getCalendar(token, iso(days[0]), iso(days[days.length - 1]));
+        if (mounted) setCalendarDays(Object.fromEntries(res.days.map((day) => [day.date, day])));
       } catch (e) {
         if (mounted) setError(e.message);
       } finally {
@@ -47,30 +64,10 @@ export default function Calendar() {
     return () => {
       mounted = false;
     };
-  }, [token]);
-
-  const days = useMemo(() => {
-    const first = startOfMonth(month);
-    const startDay = new Date(first);
-    // Sunday start
-    const dayOfWeek = startDay.getDay();
-    startDay.setDate(startDay.getDate() - dayOfWeek);
-
-    const grid = [];
-    for (let i = 0; i < 42; i += 1) {
-      const d = new Date(startDay);
-      d.setDate(startDay.getDate() + i);
-      grid.push(d);
-    }
-    return grid;
-  }, [month]);
+  }, [token, days]);
 
-  function tripsForDate(d) {
-    const key = iso(d);
-    return trips.filter((t) => {
-      if (!t.start_date || !t.end_date) return false;
-      return t.start_date <= key && key <= t.end_date;
-    });
+  function dayInfo(d) {
+    return calendarDays[iso(d)];
   }
 
   return (
@@ -124,7 +121,9 @@ export default function Calendar() {
           {days.map((d, idx) => {
             const inMonth = d.getMonth() === month.getMonth();
             const isToday = iso(d) === iso(new Date());
-            const dayTrips = tripsForDate(d);
+            const info = dayInfo(d);
+            const dayTrips = info ? info.trips : [];
+            const dayActivities = info ? info.activities : [];
             
             return (
               <div 
@@ -143,8 +142,6 @@ export default function Calendar() {
                 
                 <div className="mt-2 space-y-1">
                   {dayTrips.map((t) => {
-                    const isStart = t.start_date === iso(d);
-                    const isEnd = t.end_date === iso(d);
                     // Simple color hashing based on trip ID
                     const colors = [
                       'bg-blue-100 text-blue-800 border-blue-200',
@@ -153,12 +150,12 @@ export default function Calendar() {
                       'bg-yellow-100 text-yellow-800 border-yellow-200',
                       'bg-pink-100 text-pink-800 border-pink-200',
                     ];
-                    const colorClass = colors[t.id % colors.length];
+                    const colorClass = colors[t.trip_id % colors.length];
 
                     return (
                       <Link
-                        key={t.id}
-                        to={`/trips/${t.id}`}
+                        key={t.trip_id}
+                        to={`/trips/${t.trip_id}`}
                         className={`block text-xs px-2 py-1 rounded border truncate transition-transform hover:scale-105 ${colorClass}`}
                         title={`${t.name} (${t.start_date} - ${t.end_date})`}
                       >
@@ -166,6 +163,17 @@ export default function Calendar() {
                       </Link>
                     );
                   })}
+                  {dayActivities.length > 0 && (
+                    <div
+                      className="text-xs text-gray-600 truncate"
+                      title={dayActivities.map((a) => a.name).join(', ')}
+                    >
+                      {dayActivities.length} {dayActivities.length === 1 ? 'activity' : 'activities'}
+                    </div>
+                  )}
+                  {info && info.spend.total > 0 && (
+                    <div className="text-xs text-gray-500">Spent {info.spend.total.toFixed(2)}</div>
+                  )}
                 </div>
               </div>
             );
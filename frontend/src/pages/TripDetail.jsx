@@ -1,20 +1,20 @@
 import React, { useEffect, useMemo, useState } from 'react';
 import { Link, useNavigate, useParams } from 'react-router-dom';
-import { ArrowLeft, Plus, Calendar, MapPin, Share2, Copy, Check, MoreVertical, Trash2, Edit2, ArrowUp, ArrowDown } from 'lucide-react';
+import { ArrowLeft, Plus, Calendar, MapPin, Share2, Copy, Check, MoreVertical, Trash2, Edit2, ArrowUp, ArrowDown, Download } from 'lucide-react';
 
 import {
   createActivity,
   createStop,
   deleteActivity,
   deleteStop,
-  getTrip,
-  listActivities,
-  listStops,
+  exportTrip,
+  getTripFull,
+  moveStop as moveStopApi,
   shareTrip,
   updateActivity,
   updateStop,
 } from '../api/tripApi';
-import { createExpense, deleteExpense, listExpenses } from '../api/expenseApi';
+import { createExpense, deleteExpense, exportExpenses, importExpenses } from '../api/expenseApi';
 import { useAuth } from '../hooks/useAuth';
 
 import TripTabs from '../components/trip/TripTabs';
@@ -53,20 +53,15 @@ export default function TripDetail() {
     setLoading(true);
     setError(null);
     try {
-      const t = await getTrip(token, tripId);
-      const s = await listStops(token, tripId);
-      const e = await listExpenses(token, tripId);
-      setTrip(t);
-      setStops(s);
-      setExpenses(e);
+      const full = await getTripFull(token, tripId);
+      setTrip(full.trip);
+      setStops(full.stops);
+      setExpenses(full.expenses);
 
       const acts = {};
-      await Promise.all(
-        s.map(async (stop) => {
-          const a = await listActivities(token, stop.id);
-          acts[stop.id] = a;
-        })
-      );
+      full.stops.forEach((stop) => {
+        acts[stop.id] = stop.activities;
+      });
       setActivitiesByStop(acts);
     } catch (e) {
       setError(e.message);
@@ -134,14 +129,11 @@ export default function TripDetail() {
     const otherIdx = direction === 'up' ? idx - 1 : idx + 1;
     if (otherIdx < 0 || otherIdx >= sortedStops.length) return;
 
-    const a = sortedStops[idx];
-    const b = sortedStops[otherIdx];
+    // Moving up lands after the stop two places above; moving down, after the next one.
+    const after = direction === 'up' ? sortedStops[idx - 2] : sortedStops[otherIdx];
 
     try {
-      await Promise.all([
-        updateStop(token, a.id, { order_index: b.order_index }),
-        updateStop(token, b.id, { order_index: a.order_index }),
-      ]);
+      await moveStopApi(token, stopId, after ? after.id : null);
       loadAll();
     } catch (e) {
       alert(e.message);
@@ -182,6 +174,23 @@ export default function TripDetail() {
     }
   }
 
+  async function onExport(choice) {
+    if (!choice) return;
+    const [what, format] = choice.split(':');
+    try {
+      const blob =
+        what === 'expenses' ? await exportExpenses(token, tripId, format) : await exportTrip(token, tripId, format);
+      const url = URL.createObjectURL(blob);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = what === 'expenses' ? `trip-${tripId}-expenses.${format}` : `trip-${tripId}.${format}`;
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch (e) {
+      alert(e.message);
+    }
+  }
+
   function copyShareLink() {
     if (!shareInfo) return;
     const url = `${window.location.origin}/public/${shareInfo.share_id}`;
@@ -226,6 +235,20 @@ export default function TripDetail() {
               <Share2 size={16} className="mr-2" />
               Share
             </button>
+            <div className="relative inline-flex items-center">
+              <Download size={16} className="absolute left-3 text-gray-500 pointer-events-none" />
+              <select
+                value=""
+                onChange={(e) => onExport(e.target.value)}
+                className="pl-9 pr-4 py-2 border border-gray-300 shadow-sm text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-primary"
+              >
+                <option value="">Export</option>
+                <option value="trip:ics">Calendar (.ics)</option>
+                <option value="trip:csv">Itinerary (CSV)</option>
+                <option value="trip:ndjson">Itinerary (NDJSON)</option>
+                <option value="expenses:csv">Expenses (CSV)</option>
+              </select>
+            </div>
             <button
               onClick={openCreateStopFlow}
               className="inline-flex items-center px-4 py-2 border border-transparent text-sm font-medium rounded-md shadow-sm text-white bg-primary hover:bg-primary-dark focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-primary"
@@ -264,7 +287,7 @@ export default function TripDetail() {
                   <div className="px-6 py-4 bg-gray-50 border-b border-gray-200 flex justify-between items-center">
                     <div className="flex items-center">
                       <div className="h-8 w-8 rounded-full bg-primary/10 flex items-center justify-center text-primary font-bold mr-3">
-                        {stop.order_index + 1}
+                        {idx + 1}
                       </div>
                       <div>
                         <h3 className="text-lg font-bold text-gray-900">
@@ -377,6 +400,11 @@ export default function TripDetail() {
               await deleteExpense(token, id);
               loadAll();
             }}
+            onImportExpenses={async (file) => {
+              const result = await importExpenses(token, tripId, file);
+              loadAll();
+              return result;
+            }}
           />
         )}
 